@@ -1,29 +1,15 @@
 from flask import Flask, request
 from .routes import register_blueprints
+from .commands import register_commands
 from .config import Config
-from flasgger import Swagger
+from .docs import init_docs
+from .metrics import init_metrics
+from .profiling import init_profiling
+from .slow_queries import init_slow_query_log
 from flask_cors import CORS
 
-swagger_template = {
-    "swagger": "2.0",
-    "info": {
-        "title": "LineLink API",
-        "description": "API documentation for LineLink",
-        "version": "1.0.0",
-    },
-    "securityDefinitions": {
-        "Bearer": {
-            "type": "apiKey",
-            "name": "Authorization",
-            "in": "header",
-            "description": "JWT Authorization header using the Bearer scheme. Example: **Bearer <token>**",
-        }
-    },
-    "security": [{"Bearer": []}],
-}
-
-
-def create_app():
+
+def create_app(api_docs=None):
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -39,11 +25,17 @@ def create_app():
         def protected_resource():
             return "Unauthorized", 401
 
-    Swagger(app, template=swagger_template)
+    init_docs(app, api_docs or app.config["API_DOCS"])
+    if app.config["METRICS_ENABLED"]:
+        init_metrics(app)
+    if app.config["PROFILE_ACCOUNT_TYPES"]:
+        init_profiling(app)
+    if app.config["SLOW_QUERY_MS"] > 0:
+        init_slow_query_log(app)
 
     CORS(
         app,
-        origins=["http://localhost:3000", "https://linelink-frontend.onrender.com"],
+        origins=Config.CORS_ORIGINS,
         supports_credentials=True,
     )
 
@@ -53,5 +45,6 @@ def create_app():
             return "", 200
 
     register_blueprints(app)
+    register_commands(app)
 
     return app
@@ -0,0 +1,38 @@
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+from app import create_app
+from app.config import Config
+from .db import create_pool
+from .routes import routes
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # One pool per app and event loop; a closed pool cannot be reopened.
+    app.state.pool = create_pool()
+    await app.state.pool.open(wait=True)
+    try:
+        yield
+    finally:
+        await app.state.pool.close()
+
+
+def create_asgi_app():
+    flask_app = WSGIMiddleware(create_app(), workers=Config.ASGI_WSGI_THREADS)
+    return Starlette(
+        routes=routes + [Mount("/", app=flask_app)],
+        middleware=[
+            Middleware(
+                CORSMiddleware,
+                allow_origins=Config.CORS_ORIGINS,
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
+        ],
+        lifespan=lifespan,
+    )
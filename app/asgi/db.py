@@ -0,0 +1,21 @@
+from psycopg_pool import AsyncConnectionPool
+from app.config import Config
+
+
+def create_pool():
+    # psycopg 3 takes the same %s / %(name)s placeholders as psycopg2, so the
+    # SQL constants in app/models run unchanged on this pool.
+    return AsyncConnectionPool(
+        Config.DATABASE_URL,
+        min_size=Config.ASYNC_DB_POOL_MIN,
+        max_size=Config.ASYNC_DB_POOL_MAX,
+        timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+        open=False,
+    )
+
+
+async def fetch_all(pool, sql, params=None):
+    async with pool.connection() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return cursor.description, await cursor.fetchall()
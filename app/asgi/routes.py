@@ -0,0 +1,110 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from werkzeug.http import http_date
+from app.models.parts_model import (
+    GET_ALL_PRODUCTS,
+    GET_ALL_NEEDED_PARTS,
+    build_products,
+    build_needed_parts,
+)
+from app.models.work_order_model import (
+    GET_ALL_WORK_ORDERS_SUMMARY,
+    GET_WORK_ORDER_BY_ID,
+    GET_ARCHIVED_WORK_ORDER,
+    build_units,
+    build_work_order_summaries,
+)
+from .db import fetch_all
+
+
+def _default(o):
+    # Same conversions as Flask's JSON provider, so both serving modes
+    # return identical bodies.
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FlaskJSONResponse(JSONResponse):
+    def render(self, content):
+        body = json.dumps(
+            content, default=_default, sort_keys=True, separators=(",", ":")
+        )
+        return f"{body}\n".encode()
+
+
+def error_response(e):
+    return FlaskJSONResponse({"error": str(e)}, status_code=500)
+
+
+async def list_work_orders(request):
+    try:
+        _, rows = await fetch_all(request.app.state.pool, GET_ALL_WORK_ORDERS_SUMMARY)
+    except Exception as e:
+        return error_response(e)
+    return FlaskJSONResponse({"work_orders": build_work_order_summaries(rows)})
+
+
+async def get_work_order(request):
+    id_part = request.path_params["work_order_id"][2:]
+    if not id_part or not id_part.isdigit():
+        return FlaskJSONResponse(
+            {"error": "Invalid work order ID format"}, status_code=400
+        )
+
+    try:
+        async with request.app.state.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(GET_WORK_ORDER_BY_ID, (int(id_part),))
+                results = await cursor.fetchall()
+                if not results:
+                    await cursor.execute(GET_ARCHIVED_WORK_ORDER, (int(id_part),))
+                    archived = await cursor.fetchone()
+    except Exception as e:
+        return error_response(e)
+
+    if not results:
+        if not archived:
+            return FlaskJSONResponse({"error": "Work order not found"}, status_code=404)
+        return FlaskJSONResponse(archived[0])
+
+    return FlaskJSONResponse(
+        {"units": build_units(results), "is_completed": results[0][-1]}
+    )
+
+
+async def list_products(request):
+    try:
+        _, rows = await fetch_all(request.app.state.pool, GET_ALL_PRODUCTS)
+    except Exception as e:
+        return error_response(e)
+    return FlaskJSONResponse(build_products(rows))
+
+
+async def list_needed_parts(request):
+    try:
+        description, rows = await fetch_all(
+            request.app.state.pool, GET_ALL_NEEDED_PARTS
+        )
+    except Exception as e:
+        return error_response(e)
+    return FlaskJSONResponse(build_needed_parts(description, rows))
+
+
+# Read endpoints that station tablets poll. Everything else is served by the
+# Flask app mounted behind these routes.
+routes = [
+    Route("/api/workorders/", list_work_orders),
+    Route("/api/workorders/{work_order_id}", get_work_order),
+    Route("/api/parts/products", list_products),
+    Route("/api/parts/needed_parts", list_needed_parts),
+]
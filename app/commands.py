@@ -0,0 +1,284 @@
+import time
+import click
+from flask.cli import AppGroup
+from app.config import Config
+from app.jobs import JOB_HANDLERS
+from app.docs import build_api_spec, write_api_spec
+from app.models.generator_model import generate_data
+from app.models.job_model import run_next_job
+from app.models.idempotency_model import purge_expired_idempotency_keys
+from app.models.migration_model import (
+    MigrationError,
+    apply_migrations,
+    migration_status,
+)
+from app.models.ledger_model import (
+    take_ledger_snapshot,
+    verify_ledger_snapshots,
+    rebuild_ledger_snapshots,
+)
+from app.models.work_order_model import archive_completed_work_orders
+from app.models.supply_log_model import (
+    create_supply_log_partitions,
+    archive_supply_log_partitions,
+)
+
+idempotency_cli = AppGroup("idempotency", help="Manage stored Idempotency-Keys.")
+
+
+@idempotency_cli.command("purge")
+def purge_idempotency_keys():
+    """Delete expired Idempotency-Key records."""
+    deleted = purge_expired_idempotency_keys()
+    click.echo(f"Deleted {deleted} expired idempotency keys")
+
+
+supply_log_cli = AppGroup("supply-log", help="Maintain PartSupplyLog partitions.")
+
+
+@supply_log_cli.command("create-partitions")
+@click.option(
+    "--months-ahead",
+    default=Config.SUPPLY_LOG_MONTHS_AHEAD,
+    show_default=True,
+    help="Create monthly partitions up to this many months from now.",
+)
+def create_partitions(months_ahead):
+    """Create any missing monthly PartSupplyLog partitions. Run daily."""
+    created = create_supply_log_partitions(months_ahead)
+    click.echo(f"Created {created} PartSupplyLog partitions")
+
+
+@supply_log_cli.command("archive")
+@click.option(
+    "--retain-months",
+    default=Config.SUPPLY_LOG_RETAIN_MONTHS,
+    show_default=True,
+    help="Keep this many full months attached; older months are detached.",
+)
+def archive_partitions(retain_months):
+    """Detach old PartSupplyLog months into the archive schema."""
+    archived = archive_supply_log_partitions(retain_months)
+    for name in archived:
+        click.echo(f"Archived {name} to archive.{name}")
+    click.echo(f"Archived {len(archived)} PartSupplyLog partitions")
+
+
+ledger_cli = AppGroup("ledger", help="Maintain supply ledger snapshots.")
+
+
+@ledger_cli.command("snapshot")
+@click.option(
+    "--lag-seconds",
+    default=Config.LEDGER_SNAPSHOT_LAG_SECONDS,
+    show_default=True,
+    help="Leave this much recent log unsnapshotted for in-flight inserts.",
+)
+def snapshot_ledger(lag_seconds):
+    """Snapshot supply totals for every key supplied since the last run."""
+    cutoff, written = take_ledger_snapshot(lag_seconds)
+    click.echo(f"Snapshot at {cutoff.isoformat()}: {written} keys updated")
+
+
+@ledger_cli.command("verify")
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    default=None,
+    help="Only check windows after this time (e.g. the archive horizon).",
+)
+def verify_ledger(since):
+    """Check snapshots against the raw PartSupplyLog."""
+    mismatches, missed = verify_ledger_snapshots(since)
+    for work_order, station, part, snapshot_at, expected, actual in mismatches:
+        click.echo(
+            f"MISMATCH {work_order} station {station} part {part} at "
+            f"{snapshot_at.isoformat()}: snapshot delta {expected}, log {actual}"
+        )
+    for work_order, station, part, supplied_at, quantity in missed:
+        click.echo(
+            f"MISSED {work_order} station {station} part {part}: {quantity} "
+            f"supplied up to {supplied_at.isoformat()} is not in any snapshot"
+        )
+    if mismatches or missed:
+        raise SystemExit(1)
+    click.echo("Ledger snapshots match PartSupplyLog")
+
+
+@ledger_cli.command("rebuild")
+@click.option(
+    "--lag-seconds",
+    default=Config.LEDGER_SNAPSHOT_LAG_SECONDS,
+    show_default=True,
+)
+def rebuild_ledger(lag_seconds):
+    """Replace all snapshots with one snapshot recomputed from the raw log."""
+    cutoff, written = rebuild_ledger_snapshots(lag_seconds)
+    click.echo(f"Rebuilt ledger at {cutoff.isoformat()}: {written} keys")
+
+
+work_orders_cli = AppGroup("workorders", help="Maintain work orders.")
+
+
+@work_orders_cli.command("archive")
+@click.option(
+    "--older-than-days",
+    default=Config.WORK_ORDER_ARCHIVE_AFTER_DAYS,
+    show_default=True,
+    help="Archive orders completed at least this many days ago.",
+)
+@click.option("--limit", default=100, show_default=True, help="Orders per run.")
+def archive_work_orders(older_than_days, limit):
+    """Move completed work orders out of the hot tables."""
+    archived = archive_completed_work_orders(older_than_days, limit)
+    for work_order_id in archived:
+        click.echo(f"Archived WO{work_order_id:07d}")
+    click.echo(f"Archived {len(archived)} work orders")
+
+
+docs_cli = AppGroup("docs", help="Build the static API spec.")
+
+
+@docs_cli.command("build")
+@click.option(
+    "--output",
+    default=Config.API_SPEC_PATH,
+    show_default=True,
+    help="Where to write the spec served when API_DOCS=static.",
+)
+def build_docs(output):
+    """Render the Swagger spec from the route docstrings once."""
+    spec = build_api_spec()
+    write_api_spec(spec, output)
+    click.echo(f"Wrote {len(spec['paths'])} paths to {output}")
+
+
+data_cli = AppGroup("data", help="Generate synthetic data for benchmarks.")
+
+
+@data_cli.command("generate")
+@click.option(
+    "--scale",
+    default=1.0,
+    show_default=True,
+    help="100 work orders and 10,000 supply log rows per unit of scale.",
+)
+@click.option("--seed", default=42, show_default=True)
+@click.option("--units", default=50, show_default=True, help="Units per work order.")
+@click.option("--stations", default=13, show_default=True)
+@click.option("--users", default=50, show_default=True)
+@click.option(
+    "--months",
+    default=6,
+    show_default=True,
+    help="Spread of creation and supply dates into the past.",
+)
+@click.option(
+    "--password",
+    default=Config.GENERATOR_PASSWORD,
+    show_default=True,
+    help="Password of the generated loadtest.<n>@example.com users.",
+)
+def generate(scale, seed, units, stations, users, months, password):
+    """Add synthetic work orders to a database loaded from database.sql.
+
+    Takes exclusive locks on the work order tables; not for live databases.
+    """
+    for step, rows, seconds in generate_data(
+        scale, seed, units, stations, users, months, password
+    ):
+        click.echo(f"{step:<18} {rows:>10} rows {seconds:8.2f}s")
+
+
+db_cli = AppGroup("db", help="Apply versioned schema migrations.")
+
+
+@db_cli.command("migrate")
+@click.option(
+    "--lock-timeout-ms",
+    default=Config.MIGRATION_LOCK_TIMEOUT_MS,
+    show_default=True,
+    help="Give up on a lock after this long instead of blocking queries.",
+)
+@click.option(
+    "--retries",
+    default=Config.MIGRATION_RETRIES,
+    show_default=True,
+    help="Attempts after a lock timeout, per migration.",
+)
+@click.option("--retry-wait", default=5.0, show_default=True, help="Seconds.")
+def migrate(lock_timeout_ms, retries, retry_wait):
+    """Apply pending migrations from app/migrations in version order."""
+    applied = 0
+    try:
+        for version, name, seconds in apply_migrations(
+            lock_timeout_ms, retries, retry_wait
+        ):
+            click.echo(f"Applied {version:04d}_{name} in {seconds:.2f}s")
+            applied += 1
+    except MigrationError as e:
+        click.echo(f"FAILED {e}")
+        raise SystemExit(1)
+    click.echo(f"Applied {applied} migrations")
+
+
+@db_cli.command("status")
+def status():
+    """List migrations and when each was applied."""
+    pending = 0
+    for version, name, applied_at in migration_status():
+        state = (
+            applied_at.isoformat(sep=" ", timespec="seconds")
+            if applied_at
+            else "pending"
+        )
+        pending += applied_at is None
+        click.echo(f"{version:04d}_{name:<40} {state}")
+    click.echo(f"{pending} pending")
+
+
+jobs_cli = AppGroup("jobs", help="Run queued background jobs.")
+
+
+@jobs_cli.command("work")
+@click.option(
+    "--lease-seconds",
+    default=Config.JOB_LEASE_SECONDS,
+    show_default=True,
+    help="Another worker may take over a job running longer than this.",
+)
+@click.option(
+    "--retry-seconds",
+    default=Config.JOB_RETRY_SECONDS,
+    show_default=True,
+    help="Delay before the first retry; doubles on each attempt.",
+)
+@click.option(
+    "--poll-seconds",
+    default=Config.JOB_POLL_SECONDS,
+    show_default=True,
+    help="Sleep between polls of an empty queue.",
+)
+@click.option("--once", is_flag=True, help="Exit when the queue is empty.")
+def work_jobs(lease_seconds, retry_seconds, poll_seconds, once):
+    """Run jobs from the Jobs table. Start as many workers as needed."""
+    while True:
+        ran = run_next_job(JOB_HANDLERS, lease_seconds, retry_seconds)
+        if ran is None:
+            if once:
+                break
+            time.sleep(poll_seconds)
+            continue
+        job_id, kind, status = ran
+        click.echo(f"Job {job_id} ({kind}): {status}")
+
+
+def register_commands(app):
+    app.cli.add_command(idempotency_cli)
+    app.cli.add_command(supply_log_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(work_orders_cli)
+    app.cli.add_command(docs_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(jobs_cli)
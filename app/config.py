@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,8 +10,79 @@ class Config:
     DEBUG = os.getenv("FLASK_DEBUG", "false").lower() == "true"
     TESTING = os.getenv("FLASK_TESTING", "false").lower() == "true"
     DATABASE_URL = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    ASYNC_DB_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", "1"))
+    ASYNC_DB_POOL_MAX = int(os.getenv("ASYNC_DB_POOL_MAX", "20"))
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+    CORS_ORIGINS = ["http://localhost:3000", "https://linelink-frontend.onrender.com"]
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "super-secret-key")
-    GOOGLE_DISCOVERY_URL = os.getenv("GOOGLE_DISCOVERY_URL")
+    GOOGLE_DISCOVERY_URL = os.getenv(
+        "GOOGLE_DISCOVERY_URL",
+        "https://accounts.google.com/.well-known/openid-configuration",
+    )
+    OIDC_DISCOVERY_TTL_SECONDS = int(os.getenv("OIDC_DISCOVERY_TTL_SECONDS", "3600"))
+    OIDC_DISCOVERY_RETRY_SECONDS = int(os.getenv("OIDC_DISCOVERY_RETRY_SECONDS", "60"))
+    OIDC_DISCOVERY_CACHE_FILE = os.getenv(
+        "OIDC_DISCOVERY_CACHE_FILE",
+        os.path.join(tempfile.gettempdir(), "linelink-openid-configuration.json"),
+    )
+    OAUTH_CONNECT_TIMEOUT_SECONDS = float(
+        os.getenv("OAUTH_CONNECT_TIMEOUT_SECONDS", "3.05")
+    )
+    OAUTH_READ_TIMEOUT_SECONDS = float(os.getenv("OAUTH_READ_TIMEOUT_SECONDS", "5"))
+    OAUTH_MAX_RETRIES = int(os.getenv("OAUTH_MAX_RETRIES", "2"))
+    OAUTH_POOL_SIZE = int(os.getenv("OAUTH_POOL_SIZE", "10"))
+    OAUTH_BREAKER_FAILURES = int(os.getenv("OAUTH_BREAKER_FAILURES", "5"))
+    OAUTH_BREAKER_RESET_SECONDS = int(os.getenv("OAUTH_BREAKER_RESET_SECONDS", "30"))
     FRONTEND_URL = os.getenv("FRONTEND_URL")
+    PICK_LEASE_SECONDS = int(os.getenv("PICK_LEASE_SECONDS", "300"))
+    PICK_LEASE_MAX_SECONDS = int(os.getenv("PICK_LEASE_MAX_SECONDS", "3600"))
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    # How long a request may hold its key before a retry takes it over; keep
+    # it above the gunicorn timeout so a slow request is not run twice.
+    IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+    SUPPLY_LOG_MONTHS_AHEAD = int(os.getenv("SUPPLY_LOG_MONTHS_AHEAD", "3"))
+    SUPPLY_LOG_RETAIN_MONTHS = int(os.getenv("SUPPLY_LOG_RETAIN_MONTHS", "12"))
+    DISPATCH_HISTORY_DEFAULT_DAYS = int(
+        os.getenv("DISPATCH_HISTORY_DEFAULT_DAYS", "30")
+    )
+    LEDGER_SNAPSHOT_LAG_SECONDS = int(os.getenv("LEDGER_SNAPSHOT_LAG_SECONDS", "300"))
+    WORK_ORDER_ARCHIVE_AFTER_DAYS = int(
+        os.getenv("WORK_ORDER_ARCHIVE_AFTER_DAYS", "30")
+    )
+    GENERATOR_PASSWORD = os.getenv("GENERATOR_PASSWORD", "loadtest-password")
+    MIGRATION_LOCK_TIMEOUT_MS = int(os.getenv("MIGRATION_LOCK_TIMEOUT_MS", "5000"))
+    MIGRATION_RETRIES = int(os.getenv("MIGRATION_RETRIES", "5"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_RETRY_SECONDS = int(os.getenv("JOB_RETRY_SECONDS", "10"))
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    # Work orders at least this large are answered 202 and created by a job,
+    # so a `flask jobs work` process must be running; 0 = always inline (201)
+    WORK_ORDER_ASYNC_QUANTITY = int(os.getenv("WORK_ORDER_ASYNC_QUANTITY", "0"))
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+    JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "0"))  # 0 = one per CPU
+    # Sign-ins hashing or waiting per worker; 0 = one less than DB_POOL_SIZE
+    BCRYPT_MAX_IN_FLIGHT = int(os.getenv("BCRYPT_MAX_IN_FLIGHT", "0"))
+    API_DOCS = os.getenv("API_DOCS", "dynamic")
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))  # 0 = off
+    SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0"))
+    SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+    SLOW_QUERY_LOG_PARAMS = (
+        os.getenv("SLOW_QUERY_LOG_PARAMS", "false").lower() == "true"
+    )
+    PROFILE_ACCOUNT_TYPES = [
+        t for t in os.getenv("PROFILE_ACCOUNT_TYPES", "admin").split(",") if t
+    ]
+    API_SPEC_PATH = os.getenv(
+        "API_SPEC_PATH", os.path.join(os.path.dirname(__file__), "apispec.json")
+    )
+    API_SPEC_MAX_AGE = int(os.getenv("API_SPEC_MAX_AGE", "3600"))
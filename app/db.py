@@ -1,10 +1,249 @@
+import importlib
 import os
+import pkgutil
+import re
+import threading
+import time
 import psycopg2
-from dotenv import load_dotenv
+from psycopg2 import extensions
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from app.config import Config
 
-# Load environment variables
-load_dotenv()
 
-# Set up connection
-database_url = os.getenv("DATABASE_URL")
-connection = psycopg2.connect(database_url)
+class PoolTimeoutError(PoolError):
+    pass
+
+
+# SQL text -> the model constant that holds it, so timings can be reported
+# per statement ("GET_WORK_ORDER_BY_ID") rather than per raw query.
+_query_names = {}
+# execute_values() sends bytes built from the text before `VALUES %s`.
+_batch_prefixes = []
+_BATCH_VALUES = re.compile(r"VALUES\s+%s")
+
+# Called as observer(name, seconds, cursor, error) after every statement,
+# and as observer(seconds, cursor) after every fetch.
+query_observers = []
+fetch_observers = []
+
+
+def register_queries(module):
+    for name, value in vars(module).items():
+        if not (name.isupper() and isinstance(value, str)):
+            continue
+        _query_names.setdefault(value, name)
+        if _BATCH_VALUES.search(value):
+            prefix = value.split("%s", 1)[0].replace("%%", "%").encode("utf-8")
+            _batch_prefixes.append((prefix, name))
+
+
+def register_model_queries():
+    import app.models
+
+    for module_info in pkgutil.iter_modules(app.models.__path__):
+        register_queries(importlib.import_module(f"app.models.{module_info.name}"))
+
+
+def query_name(query):
+    if isinstance(query, str):
+        return _query_names.get(query, "other")
+    if isinstance(query, bytes):
+        for prefix, name in _batch_prefixes:
+            if query.startswith(prefix):
+                return name
+    return "other"
+
+
+class TimedCursor(extensions.cursor):
+    params = None
+
+    def execute(self, query, vars=None):
+        self.params = vars
+        started = time.perf_counter()
+        error = None
+        try:
+            return super().execute(query, vars)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            name = query_name(query)
+            for observer in query_observers:
+                observer(name, elapsed, self, error)
+
+    # execute() leaves the rows in libpq; fetching is where they become
+    # Python objects, so it is timed separately.
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._fetched(started)
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(*args, **kwargs)
+        finally:
+            self._fetched(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._fetched(started)
+
+    def _fetched(self, started):
+        elapsed = time.perf_counter() - started
+        for observer in fetch_observers:
+            observer(elapsed, self)
+
+
+class PooledConnection:
+    """Stands in for the single psycopg2 connection the models share.
+
+    ``with connection:`` checks a real connection out of a per-process pool
+    for the current thread (or greenlet) and returns it when the outermost
+    block exits, so the models' ``with connection: with connection.cursor()``
+    blocks keep their one-transaction-per-block behaviour without threads
+    sharing a session. Nothing connects until the first query, so a preloaded
+    gunicorn master never holds a socket its workers would inherit.
+    """
+
+    def __init__(self, dsn, maxconn, timeout):
+        self.dsn = dsn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._abandoned = []
+        self.reset()
+
+    def reset(self):
+        # Called after fork (and after gevent patches threading) so locks,
+        # thread-locals and the pool belong to the current worker. A pool
+        # inherited from a parent is kept referenced but never closed:
+        # closing it would end the parent's sessions on the shared sockets.
+        pool = getattr(self, "_pool", None)
+        if pool is not None and self._pid != os.getpid():
+            self._abandoned.append(pool)
+        elif pool is not None:
+            pool.closeall()
+
+        self._pid = os.getpid()
+        self._pool = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+
+    def _get_pool(self):
+        if self._pid != os.getpid():
+            self.reset()
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    pool = ThreadedConnectionPool(0, self.maxconn, self.dsn)
+                    # psycopg2 only keeps `minconn` idle connections and
+                    # closes the rest on putconn. Start empty so nothing
+                    # connects up front, then keep every returned connection.
+                    pool.minconn = self.maxconn
+                    self._pool = pool
+        return self._pool
+
+    def _checkout(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        pool = self._get_pool()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No database connection free after {self.timeout}s")
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._local.conn = conn
+        self._local.depth = 0
+        return conn
+
+    def _checkin(self):
+        conn = self._local.conn
+        self._local.conn = None
+        try:
+            broken = (
+                conn.closed
+                or conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+            )
+            self._pool.putconn(conn, close=bool(broken))
+        finally:
+            self._slots.release()
+
+    def __enter__(self):
+        conn = self._checkout()
+        self._local.depth += 1
+        try:
+            return conn.__enter__()
+        except Exception:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self._checkin()
+            raise
+
+    def __exit__(self, *exc):
+        # Leaving the block commits (or rolls back): one more round trip,
+        # reported to the observers like a statement.
+        started = time.perf_counter()
+        try:
+            return self._local.conn.__exit__(*exc)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self._checkin()
+            name = "ROLLBACK" if exc[0] is not None else "COMMIT"
+            for observer in query_observers:
+                observer(name, elapsed, None, None)
+
+    def cursor(self, *args, **kwargs):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            raise RuntimeError(
+                "connection.cursor() must be used inside `with connection:`"
+            )
+        kwargs.setdefault("cursor_factory", TimedCursor)
+        return conn.cursor(*args, **kwargs)
+
+    def stats(self):
+        pool = self._pool
+        in_use = len(pool._used) if pool is not None else 0
+        idle = len(pool._pool) if pool is not None else 0
+        return {"maxconn": self.maxconn, "in_use": in_use, "idle": idle}
+
+
+def use_gevent_wait_callback():
+    """Make psycopg2 yield to the gevent hub instead of blocking the worker."""
+    from gevent.socket import wait_read, wait_write
+
+    def wait(conn, timeout=None):
+        while True:
+            state = conn.poll()
+            if state == extensions.POLL_OK:
+                return
+            if state == extensions.POLL_READ:
+                wait_read(conn.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(conn.fileno(), timeout=timeout)
+            else:
+                raise psycopg2.OperationalError(f"Bad result from poll: {state}")
+
+    extensions.set_wait_callback(wait)
+
+
+connection = PooledConnection(
+    Config.DATABASE_URL, Config.DB_POOL_SIZE, Config.DB_POOL_TIMEOUT_SECONDS
+)
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+from importlib.util import find_spec
+from flask import Blueprint, Response, request, send_from_directory
+
+swagger_template = {
+    "swagger": "2.0",
+    "info": {
+        "title": "LineLink API",
+        "description": "API documentation for LineLink",
+        "version": "1.0.0",
+    },
+    "securityDefinitions": {
+        "Bearer": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": "JWT Authorization header using the Bearer scheme. Example: **Bearer <token>**",
+        }
+    },
+    "security": [{"Bearer": []}],
+}
+
+SWAGGER_UI_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <title>LineLink API</title>
+  <link rel="stylesheet" href="/flasgger_static/swagger-ui.css">
+</head>
+<body>
+  <div id="swagger-ui"></div>
+  <script src="/flasgger_static/swagger-ui-bundle.js"></script>
+  <script>
+    SwaggerUIBundle({url: "/apispec_1.json", dom_id: "#swagger-ui"});
+  </script>
+</body>
+</html>
+"""
+
+
+def init_docs(app, mode):
+    # dynamic: flasgger parses the route docstrings in every worker.
+    # static: serve the spec written by `flask docs build`; flasgger is not
+    # imported. off: no docs routes at all.
+    if mode == "dynamic":
+        from flasgger import Swagger
+
+        Swagger(app, template=swagger_template)
+    elif mode == "static":
+        app.register_blueprint(
+            static_docs_blueprint(
+                app.config["API_SPEC_PATH"], app.config["API_SPEC_MAX_AGE"]
+            )
+        )
+    elif mode != "off":
+        raise ValueError(f"Unknown API_DOCS mode: {mode}")
+
+
+def build_api_spec():
+    from flasgger import Swagger
+    from app import create_app
+
+    app = create_app(api_docs="off")
+    swagger = Swagger(app, template=swagger_template)
+    with app.app_context():
+        return swagger.get_apispecs()
+
+
+def write_api_spec(spec, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def static_docs_blueprint(spec_path, max_age):
+    try:
+        with open(spec_path, "rb") as f:
+            spec = f.read()
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"API_DOCS=static but {spec_path} does not exist; "
+            "run `flask docs build` first"
+        ) from None
+
+    etag = hashlib.sha256(spec).hexdigest()[:32]
+    blueprint = Blueprint("apidocs", __name__)
+
+    @blueprint.get("/apispec_1.json")
+    def apispec():
+        response = Response(spec, mimetype="application/json")
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response.make_conditional(request)
+
+    # The UI assets ship inside the flasgger package; serve them from disk
+    # without importing it.
+    flasgger_spec = find_spec("flasgger")
+    if flasgger_spec is not None:
+        ui_static = os.path.join(
+            flasgger_spec.submodule_search_locations[0], "ui3", "static"
+        )
+
+        @blueprint.get("/apidocs/")
+        def apidocs():
+            return Response(SWAGGER_UI_PAGE, mimetype="text/html")
+
+        @blueprint.get("/flasgger_static/<path:filename>")
+        def ui_asset(filename):
+            return send_from_directory(ui_static, filename, max_age=max_age)
+
+    return blueprint
@@ -0,0 +1,7 @@
+from app.models.work_order_model import create_work_order_job
+
+# Job kind -> handler(cursor, payload) returning the job's JSON result. See
+# run_next_job in app/models/job_model.py.
+JOB_HANDLERS = {
+    "create_work_order": create_work_order_job,
+}
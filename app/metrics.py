@@ -0,0 +1,173 @@
+import os
+import time
+from flask import Blueprint, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.db import connection, query_observers, register_model_queries
+from app.models.user_model import user_cache_stats
+from app.utils.hashing import hashing_stats
+from app.utils.jwt_helper import token_cache_stats
+
+# Histograms and counters live in this registry, or in the
+# PROMETHEUS_MULTIPROC_DIR files when gunicorn runs several workers.
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "linelink_http_request_duration_seconds",
+    "Request latency by route, method and status.",
+    ["endpoint", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    registry=registry,
+)
+QUERY_LATENCY = Histogram(
+    "linelink_db_query_duration_seconds",
+    "Statement latency by model SQL constant.",
+    ["query"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    registry=registry,
+)
+QUERY_ERRORS = Counter(
+    "linelink_db_query_errors",
+    "Statements that raised, by model SQL constant.",
+    ["query"],
+    registry=registry,
+)
+
+# labels() takes the metric's lock on every call; resolved children are kept
+# here so the hot path only does a dict lookup (a racing duplicate insert
+# resolves to the same child).
+_children = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def observe_query(name, seconds, cursor, error):
+    _child(QUERY_LATENCY, name).observe(seconds)
+    if error is not None:
+        _child(QUERY_ERRORS, name).inc()
+
+
+class RuntimeCollector:
+    """Pool, cache and hashing figures, read from their stats() at scrape time.
+
+    These are per process, so they carry the worker's pid; with several
+    gunicorn workers a scrape reports the worker that served it.
+    """
+
+    def collect(self):
+        pid = str(os.getpid())
+
+        pool = connection.stats()
+        connections = GaugeMetricFamily(
+            "linelink_db_pool_connections",
+            "Pooled database connections by state.",
+            labels=["pid", "state"],
+        )
+        for state in ("in_use", "idle"):
+            connections.add_metric([pid, state], pool[state])
+        yield connections
+        limit = GaugeMetricFamily(
+            "linelink_db_pool_max_connections", "Pool size limit.", labels=["pid"]
+        )
+        limit.add_metric([pid], pool["maxconn"])
+        yield limit
+
+        caches = {"jwt": token_cache_stats(), "users": user_cache_stats()}
+        lookups = CounterMetricFamily(
+            "linelink_cache_lookups",
+            "Cache lookups by result.",
+            labels=["pid", "cache", "result"],
+        )
+        hit_ratio = GaugeMetricFamily(
+            "linelink_cache_hit_ratio",
+            "Hits over lookups since the worker started.",
+            labels=["pid", "cache"],
+        )
+        size = GaugeMetricFamily(
+            "linelink_cache_entries", "Entries held.", labels=["pid", "cache"]
+        )
+        for name, stats in caches.items():
+            lookups.add_metric([pid, name, "hit"], stats["hits"])
+            lookups.add_metric([pid, name, "miss"], stats["misses"])
+            hit_ratio.add_metric([pid, name], stats["hit_rate"])
+            size.add_metric([pid, name], stats["size"])
+        yield lookups
+        yield hit_ratio
+        yield size
+
+        hashing = hashing_stats()
+        jobs = GaugeMetricFamily(
+            "linelink_hashing_jobs",
+            "bcrypt jobs waiting or running.",
+            labels=["pid", "state"],
+        )
+        for state in ("queued", "active"):
+            jobs.add_metric([pid, state], hashing[state])
+        yield jobs
+        done = CounterMetricFamily(
+            "linelink_hashing_jobs_finished",
+            "bcrypt jobs completed or rejected because the queue was full.",
+            labels=["pid", "result"],
+        )
+        for result in ("completed", "rejected"):
+            done.add_metric([pid, result], hashing[result])
+        yield done
+
+
+registry.register(RuntimeCollector())
+
+
+def _scrape_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return registry
+    # Sum the histograms every worker has written, then add this worker's
+    # runtime figures.
+    merged = CollectorRegistry()
+    multiprocess.MultiProcessCollector(merged)
+    merged.register(RuntimeCollector())
+    return merged
+
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.get("/metrics")
+def metrics():
+    return Response(
+        generate_latest(_scrape_registry()), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+def init_metrics(app):
+    register_model_queries()
+    if observe_query not in query_observers:
+        query_observers.append(observe_query)
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            rule = request.url_rule.rule if request.url_rule else "unmatched"
+            _child(
+                REQUEST_LATENCY, rule, request.method, str(response.status_code)
+            ).observe(time.perf_counter() - started)
+        return response
+
+    app.register_blueprint(metrics_bp)
@@ -0,0 +1,15 @@
+"""Index WorkOrderParts by part_number.
+
+The primary key leads with work_order_id, so lookups and ON DELETE CASCADE
+from Parts scanned the whole table.
+"""
+
+from app.models.migration_model import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(cursor):
+    create_index_concurrently(
+        cursor, "idx_work_order_parts_part_number", "WorkOrderParts", "part_number"
+    )
@@ -0,0 +1,18 @@
+"""Index PartSupplyLog by (work_order_id, station_number, part_number).
+
+Ledger verification, dispatch history filters and ON DELETE CASCADE from
+WorkOrders look rows up by key; supplied_at last serves their time ranges.
+"""
+
+from app.models.migration_model import create_partitioned_index
+
+TRANSACTIONAL = False
+
+
+def upgrade(cursor):
+    create_partitioned_index(
+        cursor,
+        "idx_part_supply_log_key",
+        "PartSupplyLog",
+        "work_order_id, station_number, part_number, supplied_at",
+    )
@@ -0,0 +1,28 @@
+"""Background job queue, worked by `flask jobs work`."""
+
+CREATE_JOBS = """
+CREATE TABLE IF NOT EXISTS Jobs (
+  job_id SERIAL PRIMARY KEY,
+  kind TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+  attempts INT NOT NULL DEFAULT 0,
+  max_attempts INT NOT NULL CHECK (max_attempts > 0),
+  run_after TIMESTAMP NOT NULL DEFAULT now(),
+  lease_expires_at TIMESTAMP,
+  result JSONB,
+  error TEXT,
+  created_by INT, -- user_id from the token; only used to scope status reads
+  created_at TIMESTAMP NOT NULL DEFAULT now(),
+  finished_at TIMESTAMP
+);
+-- Workers only scan runnable jobs and expired leases
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON Jobs (run_after, job_id)
+WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_running ON Jobs (lease_expires_at)
+WHERE status = 'running';
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(CREATE_JOBS)
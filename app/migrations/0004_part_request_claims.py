@@ -0,0 +1,36 @@
+"""Warehouse pick queue columns on PartRequests.
+
+A picker claims pending requests for a lease and completes them into
+PartSupplyLog; supply_id links the dispatch (no FK, the log is partitioned).
+"""
+
+from app.models.migration_model import create_index_concurrently
+
+TRANSACTIONAL = False
+
+ADD_CLAIM_COLUMNS = """
+ALTER TABLE PartRequests
+  ADD COLUMN IF NOT EXISTS claimed_by INT REFERENCES Users(user_id),
+  ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS supply_id INT,
+  ADD COLUMN IF NOT EXISTS fulfilled_at TIMESTAMP;
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(ADD_CLAIM_COLUMNS)
+    create_index_concurrently(
+        cursor,
+        "idx_part_requests_pending",
+        "PartRequests",
+        "request_date, request_id",
+        where="status = 'pending'",
+    )
+    create_index_concurrently(
+        cursor,
+        "idx_part_requests_leased",
+        "PartRequests",
+        "lease_expires_at",
+        where="status = 'picking'",
+    )
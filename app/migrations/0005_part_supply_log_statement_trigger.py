@@ -0,0 +1,40 @@
+"""Update StationWorkOrderParts once per PartSupplyLog INSERT statement.
+
+The row-level trigger ran one UPDATE per inserted row, so bulk dispatches
+updated the same StationWorkOrderParts rows over and over.
+"""
+
+UPDATE_SUPPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION update_station_work_order_parts_supply() RETURNS TRIGGER AS $$ BEGIN
+UPDATE StationWorkOrderParts swop
+SET quantity_supplied = swop.quantity_supplied + supplied.quantity_supplied
+FROM (
+    SELECT work_order_id,
+      station_number,
+      part_number,
+      SUM(quantity_supplied) AS quantity_supplied
+    FROM new_supply
+    GROUP BY work_order_id,
+      station_number,
+      part_number
+  ) supplied
+WHERE swop.work_order_id = supplied.work_order_id
+  AND swop.station_number = supplied.station_number
+  AND swop.part_number = supplied.part_number;
+RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Both in one transaction, so no INSERT lands between the drop and the create.
+REPLACE_SUPPLY_TRIGGER = """
+DROP TRIGGER IF EXISTS trg_update_station_work_order_parts_supply ON PartSupplyLog;
+CREATE TRIGGER trg_update_station_work_order_parts_supply
+AFTER
+INSERT ON PartSupplyLog REFERENCING NEW TABLE AS new_supply FOR EACH STATEMENT EXECUTE FUNCTION update_station_work_order_parts_supply();
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(UPDATE_SUPPLY_FUNCTION)
+    cursor.execute(REPLACE_SUPPLY_TRIGGER)
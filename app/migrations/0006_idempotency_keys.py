@@ -0,0 +1,16 @@
+"""Idempotency-Key store for the dispatch, part-request and work-order POSTs."""
+
+CREATE_IDEMPOTENCY_KEYS = """
+CREATE TABLE IF NOT EXISTS IdempotencyKeys (
+  key_hash BYTEA PRIMARY KEY,
+  request_hash BYTEA NOT NULL,
+  status_code SMALLINT, -- NULL while the original request is still running
+  response_body TEXT,
+  expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON IdempotencyKeys (expires_at);
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(CREATE_IDEMPOTENCY_KEYS)
@@ -0,0 +1,20 @@
+"""Archive completed work orders out of the hot per-unit/per-station tables.
+
+Orders completed before completed_at existed are archived by created_at.
+"""
+
+CREATE_ARCHIVED_WORK_ORDERS = """
+ALTER TABLE WorkOrders
+ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP;
+CREATE TABLE IF NOT EXISTS ArchivedWorkOrders (
+  work_order_id INT PRIMARY KEY REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  total_quantity_needed NUMERIC,
+  total_quantity_supplied NUMERIC,
+  snapshot JSONB NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(CREATE_ARCHIVED_WORK_ORDERS)
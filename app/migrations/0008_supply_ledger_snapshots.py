@@ -0,0 +1,22 @@
+"""Supply ledger: cumulative PartSupplyLog totals per key as of snapshot_at."""
+
+CREATE_SUPPLY_LEDGER_SNAPSHOTS = """
+CREATE TABLE IF NOT EXISTS SupplyLedgerSnapshots (
+  work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
+  part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
+  snapshot_at TIMESTAMP NOT NULL,
+  quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied >= 0),
+  PRIMARY KEY (
+    work_order_id,
+    station_number,
+    part_number,
+    snapshot_at
+  )
+);
+CREATE INDEX IF NOT EXISTS idx_supply_ledger_snapshots_snapshot_at ON SupplyLedgerSnapshots (snapshot_at);
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(CREATE_SUPPLY_LEDGER_SNAPSHOTS)
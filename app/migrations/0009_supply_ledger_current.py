@@ -0,0 +1,39 @@
+"""Keep the newest ledger snapshot per key in SupplyLedgerCurrent.
+
+Balance reads used to pick each key's latest row out of the whole snapshot
+history. Already part of database.sql, so this is a no-op on new databases.
+"""
+
+CREATE_SUPPLY_LEDGER_CURRENT = """
+CREATE TABLE IF NOT EXISTS SupplyLedgerCurrent (
+  work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
+  part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
+  snapshot_at TIMESTAMP NOT NULL,
+  quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied >= 0),
+  PRIMARY KEY (work_order_id, station_number, part_number)
+);
+"""
+
+# Snapshot runs take this lock too, so none can land between the backfill
+# and the commit.
+LOCK_LEDGER = """
+SELECT pg_advisory_xact_lock(hashtext('SupplyLedgerSnapshots'));
+"""
+
+BACKFILL_SUPPLY_LEDGER_CURRENT = """
+INSERT INTO SupplyLedgerCurrent (
+    work_order_id, station_number, part_number, snapshot_at, quantity_supplied
+)
+SELECT DISTINCT ON (work_order_id, station_number, part_number)
+    work_order_id, station_number, part_number, snapshot_at, quantity_supplied
+FROM SupplyLedgerSnapshots
+ORDER BY work_order_id, station_number, part_number, snapshot_at DESC
+ON CONFLICT DO NOTHING;
+"""
+
+
+def upgrade(cursor):
+    cursor.execute(CREATE_SUPPLY_LEDGER_CURRENT)
+    cursor.execute(LOCK_LEDGER)
+    cursor.execute(BACKFILL_SUPPLY_LEDGER_CURRENT)
@@ -0,0 +1,15 @@
+"""Index PartSupplyLog by supplied_at.
+
+Ledger snapshots and balance reads sum only the log rows after the last
+snapshot run; without this they scan the whole current month's partition.
+"""
+
+from app.models.migration_model import create_partitioned_index
+
+TRANSACTIONAL = False
+
+
+def upgrade(cursor):
+    create_partitioned_index(
+        cursor, "idx_part_supply_log_supplied_at", "PartSupplyLog", "supplied_at"
+    )
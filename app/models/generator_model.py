@@ -0,0 +1,309 @@
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+from psycopg2 import sql
+from app.db import connection
+from app.utils.hashing import hash_password
+
+WORK_ORDERS_PER_SCALE = 100
+SUPPLY_ROWS_PER_SCALE = 10000
+PRODUCT_COUNT = 4
+PARTS_PER_STATION = 2
+ACCOUNT_TYPES = ("production_employee", "warehouse_employee", "manager")
+
+# Leaf tables filled per unit or per dispatch. Their keys are dropped for the
+# load and rebuilt afterwards: one index build and one validation query per
+# constraint instead of a B-tree insert and FK trigger per row.
+BULK_TABLES = [
+    "WorkOrderParts",
+    "StationWorkOrderParts",
+    "WorkOrderStationStatus",
+    "UnitStationStatus",
+    "PartSupplyLog",
+]
+
+GET_BULK_CONSTRAINTS = """
+SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+FROM pg_constraint
+WHERE conrelid = ANY(%s::regclass[])
+  AND contype IN ('p', 'f')
+  AND conparentid = 0
+ORDER BY contype DESC, conname;
+"""
+
+CREATE_CATALOG_STAGING = """
+CREATE TEMP TABLE gen_stations ON COMMIT DROP AS
+SELECT station_number, description FROM Stations WITH NO DATA;
+CREATE TEMP TABLE gen_parts ON COMMIT DROP AS
+SELECT part_number, description FROM Parts WITH NO DATA;
+CREATE TEMP TABLE gen_station_parts ON COMMIT DROP AS
+SELECT station_number, part_number, quantity_required FROM StationParts WITH NO DATA;
+CREATE TEMP TABLE gen_products ON COMMIT DROP AS
+SELECT product_number, description FROM Products WITH NO DATA;
+CREATE TEMP TABLE gen_bom ON COMMIT DROP AS
+SELECT product_number, part_number, quantity FROM BOM WITH NO DATA;
+CREATE TEMP TABLE gen_users ON COMMIT DROP AS
+SELECT email, password_hash, account_type, first_name, last_name, company
+FROM Users WITH NO DATA;
+"""
+
+# Re-running against the same database reuses the catalog and users.
+MERGE_CATALOG = """
+INSERT INTO Stations SELECT * FROM gen_stations ON CONFLICT DO NOTHING;
+INSERT INTO Parts SELECT * FROM gen_parts ON CONFLICT DO NOTHING;
+INSERT INTO StationParts SELECT * FROM gen_station_parts ON CONFLICT DO NOTHING;
+INSERT INTO Products SELECT * FROM gen_products ON CONFLICT DO NOTHING;
+INSERT INTO BOM SELECT * FROM gen_bom ON CONFLICT DO NOTHING;
+INSERT INTO Users (email, password_hash, account_type, first_name, last_name, company)
+SELECT * FROM gen_users ON CONFLICT (email) DO NOTHING;
+"""
+
+LOCK_WORK_ORDERS = """
+LOCK TABLE WorkOrders IN EXCLUSIVE MODE;
+SELECT COALESCE(MAX(work_order_id), 0) FROM WorkOrders;
+"""
+
+SET_WORK_ORDER_SEQUENCE = """
+SELECT setval(pg_get_serial_sequence('workorders', 'work_order_id'), %s);
+"""
+
+SET_SEED = """
+SELECT setseed(%s);
+"""
+
+INSERT_GENERATED_WORK_ORDER_PARTS = """
+INSERT INTO WorkOrderParts (work_order_id, part_number, quantity_needed)
+SELECT wo.work_order_id, b.part_number, b.quantity * wo.quantity_to_produce
+FROM WorkOrders wo
+JOIN BOM b ON b.product_number = wo.product_number
+WHERE wo.work_order_id BETWEEN %(first)s AND %(last)s;
+"""
+
+INSERT_GENERATED_STATION_WORK_ORDER_PARTS = """
+INSERT INTO StationWorkOrderParts (
+    work_order_id, station_number, part_number, quantity_needed
+)
+SELECT wo.work_order_id, sp.station_number, b.part_number,
+  b.quantity * wo.quantity_to_produce
+FROM WorkOrders wo
+JOIN BOM b ON b.product_number = wo.product_number
+JOIN StationParts sp ON sp.part_number = b.part_number
+WHERE wo.work_order_id BETWEEN %(first)s AND %(last)s;
+"""
+
+# Every station, as INSERT_NEW_WORK_ORDER creates them
+INSERT_GENERATED_STATION_STATUS = """
+INSERT INTO WorkOrderStationStatus (work_order_id, station_number)
+SELECT wo.work_order_id, s.station_number
+FROM WorkOrders wo
+CROSS JOIN Stations s
+WHERE wo.work_order_id BETWEEN %(first)s AND %(last)s;
+"""
+
+# One row per unit at every station; mostly not started or completed, with
+# some in progress or stopped.
+INSERT_GENERATED_UNIT_STATUS = """
+INSERT INTO UnitStationStatus (work_order_id, unit_number, station_number, status)
+SELECT s.work_order_id, u.unit_number, s.station_number,
+  (ARRAY['not_started', 'not_started', 'in_progress', 'completed', 'completed',
+    'alert', 'hold']::station_status[])[1 + floor(random() * 7)::int]
+FROM WorkOrderStationStatus s
+JOIN WorkOrders wo ON wo.work_order_id = s.work_order_id
+CROSS JOIN LATERAL generate_series(1, wo.quantity_to_produce) AS u(unit_number)
+WHERE s.work_order_id BETWEEN %(first)s AND %(last)s;
+"""
+
+CREATE_SUPPLY_LOG_PARTITIONS_SINCE = """
+SELECT create_part_supply_log_partitions(
+    3, (now() - make_interval(months => %(months)s))::date
+);
+"""
+
+# random() in the inner select list runs once per generated row; the chosen
+# station line is then a plain equi-join on its row number.
+INSERT_GENERATED_SUPPLY_LOG = """
+WITH targets AS MATERIALIZED (
+    SELECT row_number() OVER (
+        ORDER BY work_order_id, station_number, part_number
+    ) AS n, work_order_id, station_number, part_number
+    FROM StationWorkOrderParts
+    WHERE work_order_id BETWEEN %(first)s AND %(last)s
+)
+INSERT INTO PartSupplyLog (
+    work_order_id, station_number, part_number, quantity_supplied, supplied_at
+)
+SELECT t.work_order_id, t.station_number, t.part_number, pick.quantity,
+  pick.supplied_at
+FROM (
+    SELECT 1 + floor(random() * (SELECT count(*) FROM targets))::bigint AS n,
+      1 + floor(random() * 10)::int AS quantity,
+      %(today)s - random() * make_interval(months => %(months)s) AS supplied_at
+    FROM generate_series(1, %(supply_rows)s)
+) pick
+JOIN targets t ON t.n = pick.n;
+"""
+
+ANALYZE_GENERATED = """
+ANALYZE;
+"""
+
+
+def catalog_rows(rng, stations, users, password_hash):
+    """Rows for the gen_* staging tables, keyed by table."""
+    part_count = stations * PARTS_PER_STATION
+    parts = [f"300-{n:05d}" for n in range(1, part_count + 1)]
+    rows = {
+        "gen_stations": [
+            (str(n), f"Generated station {n}") for n in range(1, stations + 1)
+        ],
+        "gen_parts": [(part, f"Generated part {part}") for part in parts],
+        "gen_station_parts": [
+            (str(n % stations + 1), part, rng.randint(1, 4))
+            for n, part in enumerate(parts)
+        ],
+        "gen_products": [],
+        "gen_bom": [],
+        "gen_users": [
+            (
+                f"loadtest.{n}@example.com",
+                password_hash,
+                ACCOUNT_TYPES[n % len(ACCOUNT_TYPES)],
+                "Load",
+                f"Test {n}",
+                "LineLink",
+            )
+            for n in range(1, users + 1)
+        ],
+    }
+    for n in range(1, PRODUCT_COUNT + 1):
+        product = f"110-{n:05d}"
+        rows["gen_products"].append((product, f"Generated product {n}"))
+        # Each product uses about three quarters of the parts.
+        for part in parts:
+            if rng.random() < 0.75:
+                rows["gen_bom"].append((product, part, rng.randint(1, 4)))
+    return rows
+
+
+def work_order_rows(rng, first_id, count, units, months, now):
+    products = [f"110-{n:05d}" for n in range(1, PRODUCT_COUNT + 1)]
+    span = timedelta(days=30 * months).total_seconds()
+    return [
+        (
+            work_order_id,
+            rng.choice(products),
+            units,
+            now - timedelta(seconds=rng.random() * span),
+        )
+        for work_order_id in range(first_id, first_id + count)
+    ]
+
+
+def _copy(cursor, table, rows, columns=None):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(str(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    statement = sql.SQL("COPY {} FROM STDIN").format(sql.Identifier(table))
+    if columns:
+        statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+    cursor.copy_expert(statement, buffer)
+    return len(rows)
+
+
+def generate_data(scale, seed, units, stations, users, months, password):
+    """Fill a database loaded from database.sql with synthetic work orders.
+
+    Catalog and work orders are drawn in Python from ``seed`` and streamed in
+    with COPY; the per-unit matrix and the supply log fan out server-side
+    with generate_series under setseed(). Yields ``(step, rows, seconds)``.
+    """
+    rng = random.Random(seed)
+    work_orders = max(1, round(WORK_ORDERS_PER_SCALE * scale))
+    supply_rows = round(SUPPLY_ROWS_PER_SCALE * scale)
+    # Hashed once: generated users share the password, and sign-ins against
+    # them still pay the configured bcrypt cost.
+    password_hash = hash_password(password)
+    catalog = catalog_rows(rng, stations, users, password_hash)
+    # Dates count back from midnight, so runs on the same day match exactly.
+    today = datetime.combine(date.today(), datetime.min.time())
+
+    with connection:
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            cursor.execute(CREATE_CATALOG_STAGING)
+            for table, rows in catalog.items():
+                _copy(cursor, table, rows)
+            cursor.execute(MERGE_CATALOG)
+            yield "catalog", sum(map(len, catalog.values())), _since(started)
+
+            started = time.perf_counter()
+            cursor.execute(LOCK_WORK_ORDERS)
+            first = cursor.fetchone()[0] + 1
+            rows = work_order_rows(rng, first, work_orders, units, months, today)
+            _copy(
+                cursor,
+                "workorders",
+                rows,
+                [
+                    "work_order_id",
+                    "product_number",
+                    "quantity_to_produce",
+                    "created_at",
+                ],
+            )
+            last = first + work_orders - 1
+            cursor.execute(SET_WORK_ORDER_SEQUENCE, (last,))
+            yield "work orders", work_orders, _since(started)
+
+            cursor.execute(GET_BULK_CONSTRAINTS, (BULK_TABLES,))
+            constraints = cursor.fetchall()
+            for table, name, _ in constraints:
+                cursor.execute(
+                    sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                        sql.SQL(table), sql.Identifier(name)
+                    )
+                )
+
+            params = {
+                "first": first,
+                "last": last,
+                "months": months,
+                "supply_rows": supply_rows,
+                "today": today,
+            }
+            cursor.execute(SET_SEED, (rng.uniform(-1, 1),))
+            cursor.execute(CREATE_SUPPLY_LOG_PARTITIONS_SINCE, params)
+            for step, statement in (
+                ("work order parts", INSERT_GENERATED_WORK_ORDER_PARTS),
+                ("station parts", INSERT_GENERATED_STATION_WORK_ORDER_PARTS),
+                ("station status", INSERT_GENERATED_STATION_STATUS),
+                ("unit status", INSERT_GENERATED_UNIT_STATUS),
+                ("supply log", INSERT_GENERATED_SUPPLY_LOG),
+            ):
+                started = time.perf_counter()
+                cursor.execute(statement, params)
+                yield step, cursor.rowcount, _since(started)
+
+            started = time.perf_counter()
+            # Primary keys sort first, so each is in place before the foreign
+            # keys on its table are validated.
+            for table, name, definition in constraints:
+                cursor.execute(
+                    sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(
+                        sql.SQL(table), sql.Identifier(name), sql.SQL(definition)
+                    )
+                )
+            yield "constraints", len(constraints), _since(started)
+
+            started = time.perf_counter()
+            cursor.execute(ANALYZE_GENERATED)
+            yield "analyze", 0, _since(started)
+
+
+def _since(started):
+    return time.perf_counter() - started
@@ -0,0 +1,81 @@
+from app.db import connection
+
+# Reserves the key in one round trip. A new (or expired) key is claimed and
+# returned with reserved = TRUE; otherwise the stored row is returned as-is.
+# While the request runs, expires_at is a short lease: if the worker dies
+# before saving a response, a retry takes the key over once the lease passes.
+RESERVE_IDEMPOTENCY_KEY = """
+WITH reserved AS (
+    INSERT INTO IdempotencyKeys (key_hash, request_hash, expires_at)
+    VALUES (%(key_hash)s, %(request_hash)s, NOW() + make_interval(secs => %(lease)s))
+    ON CONFLICT (key_hash) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash,
+        status_code = NULL,
+        response_body = NULL,
+        expires_at = EXCLUDED.expires_at
+    WHERE IdempotencyKeys.expires_at < NOW()
+    RETURNING key_hash
+)
+SELECT TRUE, NULL::BYTEA, NULL::SMALLINT, NULL::TEXT FROM reserved
+UNION ALL
+SELECT FALSE, request_hash, status_code, response_body
+FROM IdempotencyKeys
+WHERE key_hash = %(key_hash)s
+  AND NOT EXISTS (SELECT 1 FROM reserved);
+"""
+
+
+def reserve_idempotency_key(key_hash, request_hash, lease_seconds):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RESERVE_IDEMPOTENCY_KEY,
+                {
+                    "key_hash": key_hash,
+                    "request_hash": request_hash,
+                    "lease": lease_seconds,
+                },
+            )
+            return cursor.fetchone()
+
+
+# The stored response is kept for the full TTL from when it was saved.
+SAVE_IDEMPOTENT_RESPONSE = """
+UPDATE IdempotencyKeys
+SET status_code = %s,
+    response_body = %s,
+    expires_at = NOW() + make_interval(secs => %s)
+WHERE key_hash = %s AND status_code IS NULL;
+"""
+
+
+def save_idempotent_response(key_hash, status_code, response_body, ttl_seconds):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SAVE_IDEMPOTENT_RESPONSE,
+                (status_code, response_body, ttl_seconds, key_hash),
+            )
+
+
+DELETE_IDEMPOTENCY_KEY = """
+DELETE FROM IdempotencyKeys WHERE key_hash = %s;
+"""
+
+
+def release_idempotency_key(key_hash):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(DELETE_IDEMPOTENCY_KEY, (key_hash,))
+
+
+PURGE_EXPIRED_IDEMPOTENCY_KEYS = """
+DELETE FROM IdempotencyKeys WHERE expires_at < NOW();
+"""
+
+
+def purge_expired_idempotency_keys():
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(PURGE_EXPIRED_IDEMPOTENCY_KEYS)
+            return cursor.rowcount
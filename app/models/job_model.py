@@ -0,0 +1,172 @@
+from app.config import Config
+from app.db import connection
+from flask import jsonify
+from psycopg2.extras import Json
+
+ENQUEUE_JOB = """
+INSERT INTO Jobs (kind, payload, max_attempts, created_by)
+VALUES (%s, %s, %s, %s)
+RETURNING job_id;
+"""
+
+
+def enqueue_job(cursor, kind, payload, created_by=None):
+    """Queue a job in the caller's transaction; it only runs if that commits."""
+    cursor.execute(
+        ENQUEUE_JOB, (kind, Json(payload), Config.JOB_MAX_ATTEMPTS, created_by)
+    )
+    return cursor.fetchone()[0]
+
+
+# Leases the oldest runnable job, or one whose worker died mid-run, without
+# waiting on jobs other workers hold.
+CLAIM_JOB = """
+WITH next_job AS (
+    SELECT job_id
+    FROM Jobs
+    WHERE (status = 'queued' AND run_after <= NOW())
+       OR (status = 'running' AND lease_expires_at < NOW())
+    ORDER BY run_after, job_id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE Jobs j
+SET status = 'running',
+    attempts = j.attempts + 1,
+    lease_expires_at = NOW() + make_interval(secs => %s)
+FROM next_job
+WHERE j.job_id = next_job.job_id
+RETURNING j.job_id, j.kind, j.payload, j.attempts, j.max_attempts;
+"""
+
+# Both updates match on attempts, so a worker whose lease expired and was
+# taken over cannot finish (or requeue) the job under the new owner.
+COMPLETE_JOB = """
+UPDATE Jobs
+SET status = 'succeeded',
+    result = %s,
+    error = NULL,
+    lease_expires_at = NULL,
+    finished_at = NOW()
+WHERE job_id = %s AND status = 'running' AND attempts = %s
+RETURNING job_id;
+"""
+
+RETRY_OR_FAIL_JOB = """
+UPDATE Jobs
+SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+    run_after = NOW() + make_interval(secs => %(delay)s),
+    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END,
+    error = %(error)s,
+    lease_expires_at = NULL
+WHERE job_id = %(job_id)s AND status = 'running' AND attempts = %(attempts)s
+RETURNING status;
+"""
+
+
+class JobLeaseLost(Exception):
+    pass
+
+
+def run_next_job(handlers, lease_seconds, retry_seconds):
+    """Claim and run one job; None when nothing is runnable.
+
+    handlers maps a job kind to handler(cursor, payload) -> JSON result. The
+    handler runs in the same transaction that marks the job succeeded, so its
+    writes commit exactly once. A failure rolls them back and requeues the job
+    with exponential backoff until max_attempts, then marks it failed.
+    Returns (job_id, kind, status).
+    """
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_JOB, (lease_seconds,))
+            job = cursor.fetchone()
+    if job is None:
+        return None
+
+    job_id, kind, payload, attempts, max_attempts = job
+    if attempts > max_attempts:
+        error = "Worker lease expired on the last attempt"
+    elif kind not in handlers:
+        # Requeued rather than failed: a newer worker may know the kind.
+        error = f"Unknown job kind {kind!r}"
+    else:
+        try:
+            with connection:
+                with connection.cursor() as cursor:
+                    result = handlers[kind](cursor, payload)
+                    cursor.execute(COMPLETE_JOB, (Json(result), job_id, attempts))
+                    if cursor.fetchone() is None:
+                        raise JobLeaseLost(f"Lease on job {job_id} expired")
+            return job_id, kind, "succeeded"
+        except JobLeaseLost:
+            return job_id, kind, "lease lost"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RETRY_OR_FAIL_JOB,
+                {
+                    "delay": retry_seconds * 2 ** (attempts - 1),
+                    "error": error,
+                    "job_id": job_id,
+                    "attempts": attempts,
+                },
+            )
+            row = cursor.fetchone()
+    return job_id, kind, row[0] if row else "lease lost"
+
+
+GET_JOB = """
+SELECT job_id, kind, status, attempts, max_attempts, result, error,
+       created_by, created_at, finished_at
+FROM Jobs
+WHERE job_id = %s;
+"""
+
+
+def get_job(job_id, user):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(GET_JOB, (job_id,))
+                row = cursor.fetchone()
+
+        # Other users' jobs are reported as missing rather than forbidden.
+        if row is None or (
+            row[7] != user.get("user_id") and user.get("account_type") != "admin"
+        ):
+            return jsonify({"error": "Job not found"}), 404
+
+        (
+            job_id,
+            kind,
+            status,
+            attempts,
+            max_attempts,
+            result,
+            error,
+            _,
+            created_at,
+            finished_at,
+        ) = row
+        return (
+            jsonify(
+                {
+                    "job_id": job_id,
+                    "kind": kind,
+                    "status": status,
+                    "attempts": attempts,
+                    "max_attempts": max_attempts,
+                    "result": result,
+                    "error": error,
+                    "created_at": created_at.isoformat(),
+                    "finished_at": finished_at.isoformat() if finished_at else None,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,273 @@
+from app.db import connection
+from flask import jsonify
+
+# Serializes snapshot runs so two schedulers cannot write the same cutoff.
+LOCK_LEDGER = """
+SELECT pg_advisory_xact_lock(hashtext('SupplyLedgerSnapshots'));
+"""
+
+GET_LEDGER_WINDOW = """
+SELECT MAX(snapshot_at), NOW()::timestamp - make_interval(secs => %s)
+FROM SupplyLedgerSnapshots;
+"""
+
+# since/cutoff are passed as literals so the planner prunes PartSupplyLog to
+# the partitions written since the previous run. Each changed key gets a
+# history row and replaces its row in SupplyLedgerCurrent.
+INSERT_LEDGER_SNAPSHOT = """
+WITH delta AS (
+    SELECT
+        work_order_id,
+        station_number,
+        part_number,
+        SUM(quantity_supplied) AS quantity_supplied
+    FROM PartSupplyLog
+    WHERE (%(since)s::timestamp IS NULL OR supplied_at > %(since)s)
+      AND supplied_at <= %(cutoff)s
+    GROUP BY work_order_id, station_number, part_number
+),
+snapshot AS (
+    INSERT INTO SupplyLedgerSnapshots (
+        work_order_id, station_number, part_number, snapshot_at, quantity_supplied
+    )
+    SELECT
+        d.work_order_id,
+        d.station_number,
+        d.part_number,
+        %(cutoff)s,
+        d.quantity_supplied + COALESCE(c.quantity_supplied, 0)
+    FROM delta d
+    LEFT JOIN SupplyLedgerCurrent c
+      ON c.work_order_id = d.work_order_id
+      AND c.station_number = d.station_number
+      AND c.part_number = d.part_number
+    RETURNING work_order_id, station_number, part_number, snapshot_at,
+              quantity_supplied
+)
+INSERT INTO SupplyLedgerCurrent (
+    work_order_id, station_number, part_number, snapshot_at, quantity_supplied
+)
+SELECT work_order_id, station_number, part_number, snapshot_at, quantity_supplied
+FROM snapshot
+ON CONFLICT (work_order_id, station_number, part_number) DO UPDATE
+SET snapshot_at = EXCLUDED.snapshot_at,
+    quantity_supplied = EXCLUDED.quantity_supplied;
+"""
+
+
+def take_ledger_snapshot(lag_seconds):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_LEDGER)
+            cursor.execute(GET_LEDGER_WINDOW, (lag_seconds,))
+            since, cutoff = cursor.fetchone()
+            if since is not None and cutoff <= since:
+                return cutoff, 0
+
+            cursor.execute(INSERT_LEDGER_SNAPSHOT, {"since": since, "cutoff": cutoff})
+            return cutoff, cursor.rowcount
+
+
+# Balance as of T = each key's latest snapshot at or before T plus the log
+# rows after the last snapshot run before T. Keys without a newer snapshot
+# had no supply between their own snapshot and that run, so only the tail
+# of the log is summed. Keys come from SupplyLedgerCurrent; only a key
+# snapshotted again after T looks up its older snapshot, one primary-key
+# probe into the history.
+GET_LEDGER_BALANCES = """
+WITH latest AS (
+    SELECT
+        c.work_order_id,
+        c.station_number,
+        c.part_number,
+        CASE
+            WHEN c.snapshot_at <= %(as_of)s THEN c.quantity_supplied
+            ELSE (
+                SELECT s.quantity_supplied
+                FROM SupplyLedgerSnapshots s
+                WHERE s.work_order_id = c.work_order_id
+                  AND s.station_number = c.station_number
+                  AND s.part_number = c.part_number
+                  AND s.snapshot_at <= %(as_of)s
+                ORDER BY s.snapshot_at DESC
+                LIMIT 1
+            )
+        END AS quantity_supplied
+    FROM SupplyLedgerCurrent c
+    WHERE (%(work_order_id)s::int IS NULL OR c.work_order_id = %(work_order_id)s)
+      AND (%(station_number)s::text IS NULL OR c.station_number = %(station_number)s)
+      AND (%(part_number)s::text IS NULL OR c.part_number = %(part_number)s)
+),
+delta AS (
+    SELECT
+        work_order_id,
+        station_number,
+        part_number,
+        SUM(quantity_supplied) AS quantity_supplied
+    FROM PartSupplyLog
+    WHERE (%(since)s::timestamp IS NULL OR supplied_at > %(since)s)
+      AND supplied_at <= %(as_of)s
+      AND (%(work_order_id)s::int IS NULL OR work_order_id = %(work_order_id)s)
+      AND (%(station_number)s::text IS NULL OR station_number = %(station_number)s)
+      AND (%(part_number)s::text IS NULL OR part_number = %(part_number)s)
+    GROUP BY work_order_id, station_number, part_number
+)
+SELECT
+    'WO' || LPAD(work_order_id::text, 7, '0') AS work_order_id,
+    station_number,
+    part_number,
+    COALESCE(latest.quantity_supplied, 0) + COALESCE(delta.quantity_supplied, 0)
+FROM latest
+FULL OUTER JOIN delta USING (work_order_id, station_number, part_number)
+WHERE latest.quantity_supplied IS NOT NULL OR delta.quantity_supplied IS NOT NULL
+ORDER BY work_order_id, station_number, part_number;
+"""
+
+GET_LAST_SNAPSHOT_BEFORE = """
+SELECT MAX(snapshot_at) FROM SupplyLedgerSnapshots WHERE snapshot_at <= %s;
+"""
+
+
+def get_ledger_balances(
+    as_of, work_order_id=None, station_number=None, part_number=None
+):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(GET_LAST_SNAPSHOT_BEFORE, (as_of,))
+                since = cursor.fetchone()[0]
+                cursor.execute(
+                    GET_LEDGER_BALANCES,
+                    {
+                        "as_of": as_of,
+                        "since": since,
+                        "work_order_id": work_order_id,
+                        "station_number": station_number,
+                        "part_number": part_number,
+                    },
+                )
+                rows = cursor.fetchall()
+
+        balances = [
+            {
+                "work_order_id": formatted_work_order_id,
+                "station_number": station,
+                "part_number": part,
+                "quantity_supplied": float(quantity_supplied),
+            }
+            for formatted_work_order_id, station, part, quantity_supplied in rows
+        ]
+        return (
+            jsonify(
+                {
+                    "as_of": as_of.isoformat(),
+                    "snapshot_at": since.isoformat() if since else None,
+                    "total_quantity_supplied": sum(
+                        b["quantity_supplied"] for b in balances
+                    ),
+                    "balances": balances,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Each snapshot must differ from the previous snapshot of its key by exactly
+# the log rows supplied in between.
+VERIFY_LEDGER_WINDOWS = """
+WITH snapshots AS (
+    SELECT
+        work_order_id,
+        station_number,
+        part_number,
+        snapshot_at,
+        quantity_supplied - COALESCE(LAG(quantity_supplied) OVER key_window, 0)
+            AS snapshot_delta,
+        LAG(snapshot_at) OVER key_window AS previous_at
+    FROM SupplyLedgerSnapshots
+    WINDOW key_window AS (
+        PARTITION BY work_order_id, station_number, part_number
+        ORDER BY snapshot_at
+    )
+)
+SELECT
+    'WO' || LPAD(s.work_order_id::text, 7, '0'),
+    s.station_number,
+    s.part_number,
+    s.snapshot_at,
+    s.snapshot_delta,
+    COALESCE(SUM(psl.quantity_supplied), 0) AS log_delta
+FROM snapshots s
+LEFT JOIN PartSupplyLog psl
+  ON psl.work_order_id = s.work_order_id
+  AND psl.station_number = s.station_number
+  AND psl.part_number = s.part_number
+  AND psl.supplied_at <= s.snapshot_at
+  AND (s.previous_at IS NULL OR psl.supplied_at > s.previous_at)
+WHERE (%(since)s::timestamp IS NULL OR s.previous_at >= %(since)s)
+GROUP BY s.work_order_id, s.station_number, s.part_number, s.snapshot_at,
+         s.snapshot_delta
+HAVING s.snapshot_delta <> COALESCE(SUM(psl.quantity_supplied), 0)
+ORDER BY s.snapshot_at, s.work_order_id, s.station_number, s.part_number;
+"""
+
+# Rows that landed at or before the last run but after their key's latest
+# snapshot (e.g. committed late by a long transaction) were never counted.
+VERIFY_LEDGER_MISSED_ROWS = """
+SELECT
+    'WO' || LPAD(psl.work_order_id::text, 7, '0'),
+    psl.station_number,
+    psl.part_number,
+    MAX(psl.supplied_at),
+    SUM(psl.quantity_supplied)
+FROM PartSupplyLog psl
+LEFT JOIN SupplyLedgerCurrent l
+  ON l.work_order_id = psl.work_order_id
+  AND l.station_number = psl.station_number
+  AND l.part_number = psl.part_number
+WHERE psl.supplied_at <= (SELECT MAX(snapshot_at) FROM SupplyLedgerSnapshots)
+  AND (%(since)s::timestamp IS NULL OR psl.supplied_at > %(since)s)
+  AND (l.snapshot_at IS NULL OR psl.supplied_at > l.snapshot_at)
+GROUP BY psl.work_order_id, psl.station_number, psl.part_number;
+"""
+
+
+def verify_ledger_snapshots(since=None):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(VERIFY_LEDGER_WINDOWS, {"since": since})
+            mismatches = cursor.fetchall()
+            cursor.execute(VERIFY_LEDGER_MISSED_ROWS, {"since": since})
+            missed = cursor.fetchall()
+    return mismatches, missed
+
+
+COUNT_ARCHIVED_SUPPLY_PARTITIONS = """
+SELECT COUNT(*)
+FROM pg_tables
+WHERE schemaname = 'archive' AND tablename LIKE 'partsupplylog\\_%';
+"""
+
+DELETE_LEDGER_SNAPSHOTS = """
+DELETE FROM SupplyLedgerSnapshots;
+DELETE FROM SupplyLedgerCurrent;
+"""
+
+
+def rebuild_ledger_snapshots(lag_seconds):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(COUNT_ARCHIVED_SUPPLY_PARTITIONS)
+            if cursor.fetchone()[0]:
+                raise RuntimeError(
+                    "PartSupplyLog has archived partitions; the attached log "
+                    "no longer holds the full history to rebuild from"
+                )
+            cursor.execute(LOCK_LEDGER)
+            cursor.execute(DELETE_LEDGER_SNAPSHOTS)
+            cursor.execute(GET_LEDGER_WINDOW, (lag_seconds,))
+            _, cutoff = cursor.fetchone()
+            cursor.execute(INSERT_LEDGER_SNAPSHOT, {"since": None, "cutoff": cutoff})
+            return cutoff, cursor.rowcount
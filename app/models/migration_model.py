@@ -0,0 +1,239 @@
+import importlib
+import pkgutil
+import re
+import time
+from collections import namedtuple
+import psycopg2
+from psycopg2 import errors, sql
+from app.config import Config
+
+Migration = namedtuple("Migration", "version name transactional upgrade")
+
+MIGRATION_MODULE = re.compile(r"^(\d{4})_(\w+)$")
+
+
+class MigrationError(Exception):
+    pass
+
+
+CREATE_SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS SchemaMigrations (
+  version INT PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at TIMESTAMP NOT NULL DEFAULT now()
+);
+"""
+
+# Session-level, so it is held across the non-transactional migrations and
+# released when the connection closes.
+TRY_MIGRATION_LOCK = """
+SELECT pg_try_advisory_lock(hashtext('SchemaMigrations'));
+"""
+
+SET_MIGRATION_TIMEOUTS = """
+SELECT
+  set_config('lock_timeout', %s, false),
+  set_config('statement_timeout', '0', false);
+"""
+
+GET_APPLIED_MIGRATIONS = """
+SELECT version, applied_at FROM SchemaMigrations;
+"""
+
+RECORD_MIGRATION = """
+INSERT INTO SchemaMigrations (version, name) VALUES (%s, %s);
+"""
+
+GET_INDEX_VALID = """
+SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s);
+"""
+
+GET_RELKIND = """
+SELECT relkind FROM pg_class WHERE oid = %s::regclass;
+"""
+
+# Partitions of the table without a partition of the index attached yet.
+GET_UNINDEXED_PARTITIONS = """
+SELECT p.inhrelid::regclass::text
+FROM pg_inherits p
+WHERE p.inhparent = %(table)s::regclass
+  AND NOT EXISTS (
+    SELECT 1
+    FROM pg_inherits ip
+    JOIN pg_index i ON i.indexrelid = ip.inhrelid
+    WHERE ip.inhparent = %(index)s::regclass
+      AND i.indrelid = p.inhrelid
+  )
+ORDER BY 1;
+"""
+
+
+def load_migrations():
+    import app.migrations
+
+    migrations = []
+    for module_info in pkgutil.iter_modules(app.migrations.__path__):
+        match = MIGRATION_MODULE.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"app.migrations.{module_info.name}")
+        migrations.append(
+            Migration(
+                int(match.group(1)),
+                match.group(2),
+                getattr(module, "TRANSACTIONAL", True),
+                module.upgrade,
+            )
+        )
+
+    migrations.sort()
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {versions}")
+    return migrations
+
+
+def _connect(lock_timeout_ms):
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(SET_MIGRATION_TIMEOUTS, (f"{lock_timeout_ms}ms",))
+        cursor.execute(CREATE_SCHEMA_MIGRATIONS)
+    return conn
+
+
+def _applied(cursor):
+    cursor.execute(GET_APPLIED_MIGRATIONS)
+    return dict(cursor.fetchall())
+
+
+def migration_status():
+    """Every known migration as (version, name, applied_at or None)."""
+    migrations = load_migrations()
+    conn = _connect(Config.MIGRATION_LOCK_TIMEOUT_MS)
+    try:
+        with conn.cursor() as cursor:
+            applied = _applied(cursor)
+    finally:
+        conn.close()
+    return [(m.version, m.name, applied.get(m.version)) for m in migrations]
+
+
+def _run(conn, migration):
+    # Transactional migrations commit together with their SchemaMigrations
+    # row. The others run statement by statement in autocommit (required by
+    # CREATE INDEX CONCURRENTLY), so they must be safe to run again.
+    if not migration.transactional:
+        with conn.cursor() as cursor:
+            migration.upgrade(cursor)
+            cursor.execute(RECORD_MIGRATION, (migration.version, migration.name))
+        return
+
+    # `with conn` opens a transaction even in autocommit mode on psycopg2 2.9,
+    # but not on older versions.
+    conn.autocommit = False
+    try:
+        with conn, conn.cursor() as cursor:
+            migration.upgrade(cursor)
+            cursor.execute(RECORD_MIGRATION, (migration.version, migration.name))
+    finally:
+        conn.autocommit = True
+
+
+def apply_migrations(lock_timeout_ms, retries, retry_wait_seconds, migrations=None):
+    """Apply pending migrations in version order.
+
+    Yields (version, name, seconds) per migration. A statement that cannot get
+    its lock within lock_timeout_ms fails instead of queueing behind a long
+    transaction (and blocking every query queued behind it); the migration is
+    then retried up to `retries` times.
+    """
+    if migrations is None:
+        migrations = load_migrations()
+
+    conn = _connect(lock_timeout_ms)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(TRY_MIGRATION_LOCK)
+            if not cursor.fetchone()[0]:
+                raise MigrationError("Another migration run is in progress")
+            applied = _applied(cursor)
+
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+            started = time.perf_counter()
+            for attempt in range(retries + 1):
+                try:
+                    _run(conn, migration)
+                    break
+                except errors.LockNotAvailable as e:
+                    if attempt == retries:
+                        raise MigrationError(
+                            f"{migration.version:04d}_{migration.name}: "
+                            f"lock not acquired after {retries + 1} attempts ({e})"
+                        ) from e
+                    time.sleep(retry_wait_seconds * (attempt + 1))
+                except psycopg2.Error as e:
+                    raise MigrationError(
+                        f"{migration.version:04d}_{migration.name}: {e}"
+                    ) from e
+            yield migration.version, migration.name, time.perf_counter() - started
+    finally:
+        conn.close()
+
+
+def create_index_concurrently(cursor, index, table, columns, where=None):
+    """Build an index without blocking writes. Needs a non-transactional
+    migration. `where` makes it a partial index.
+
+    A build that failed part way leaves an invalid index behind; it is dropped
+    and rebuilt rather than skipped by IF NOT EXISTS.
+    """
+    cursor.execute(GET_INDEX_VALID, (index,))
+    row = cursor.fetchone()
+    if row is not None and not row[0]:
+        cursor.execute(
+            sql.SQL("DROP INDEX CONCURRENTLY {}").format(sql.Identifier(index))
+        )
+    statement = "CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON {} ({})"
+    if where is not None:
+        statement += " WHERE " + where
+    cursor.execute(
+        sql.SQL(statement).format(
+            sql.Identifier(index), sql.SQL(table), sql.SQL(columns)
+        )
+    )
+
+
+def create_partitioned_index(cursor, index, table, columns):
+    """Index a partitioned table without blocking writes.
+
+    CONCURRENTLY is not supported on a partitioned table, so the parent index
+    is created ON ONLY the parent (empty, invalid), each partition is indexed
+    concurrently and attached, and the parent becomes valid once every
+    partition has one. Partitions created afterwards get the index
+    automatically.
+
+    A table that has not been partitioned yet (see
+    database/partition_part_supply_log.sql) gets a plain concurrent build
+    instead, since ON ONLY would build it there while blocking writes.
+    """
+    cursor.execute(GET_RELKIND, (table,))
+    if cursor.fetchone()[0] != "p":
+        create_index_concurrently(cursor, index, table, columns)
+        return
+    cursor.execute(
+        sql.SQL("CREATE INDEX IF NOT EXISTS {} ON ONLY {} ({})").format(
+            sql.Identifier(index), sql.SQL(table), sql.SQL(columns)
+        )
+    )
+    cursor.execute(GET_UNINDEXED_PARTITIONS, {"table": table, "index": index})
+    for (partition,) in cursor.fetchall():
+        partition_index = f"{index}_{partition}"
+        create_index_concurrently(cursor, partition_index, partition, columns)
+        cursor.execute(
+            sql.SQL("ALTER INDEX {} ATTACH PARTITION {}").format(
+                sql.Identifier(index), sql.Identifier(partition_index)
+            )
+        )
@@ -1,5 +1,6 @@
 from app.db import connection
 from flask import jsonify
+from psycopg2.extras import execute_values
 
 GET_ALL_PRODUCTS = """
 SELECT
@@ -12,16 +13,17 @@ ORDER BY
 """
 
 
+def build_products(rows):
+    return [{"product_number": row[0], "description": row[1]} for row in rows]
+
+
 def get_all_products():
     try:
         with connection:
             with connection.cursor() as cursor:
                 cursor.execute(GET_ALL_PRODUCTS)
                 rows = cursor.fetchall()
-                products = [
-                    {"product_number": row[0], "description": row[1]} for row in rows
-                ]
-                return jsonify(products), 200
+                return jsonify(build_products(rows)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -39,16 +41,18 @@ ORDER BY wop.work_order_id, wop.part_number;
 """
 
 
+def build_needed_parts(description, rows):
+    columns = [desc[0] for desc in description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
 def get_needed_parts():
     try:
         with connection:
             with connection.cursor() as cursor:
                 cursor.execute(GET_ALL_NEEDED_PARTS)
                 rows = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                report = [dict(zip(columns, row)) for row in rows]
-
-                return jsonify(report), 200
+                return jsonify(build_needed_parts(cursor.description, rows)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -67,10 +71,7 @@ INSERT INTO PartRequests (
 
 
 def add_part_request(data):
-    work_order_str = data["work_order_id"]
-
-    work_order_id = int(work_order_str[2:])
-
+    work_order_id = data["work_order_id"]
     station_number = data["station_number"]
     part_number = data["part_number"]
     quantity_requested = data["quantity_requested"]
@@ -110,3 +111,69 @@ def add_part_request(data):
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+INSERT_PART_REQUESTS_BATCH = """
+INSERT INTO PartRequests (
+            work_order_id,
+            station_number,
+            part_number,
+            quantity_requested,
+            requested_by
+        )
+        VALUES %s
+        RETURNING request_id, work_order_id, station_number, part_number, quantity_requested, request_date, status;
+"""
+
+
+def add_part_requests(data):
+    work_order_id = data["work_order_id"]
+    station_number = data["station_number"]
+    requested_by = data["requested_by"]
+    rows = [
+        (
+            work_order_id,
+            station_number,
+            line["part_number"],
+            line["quantity_requested"],
+            requested_by,
+        )
+        for line in data["parts"]
+    ]
+
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                # page_size covers every line so the batch is a single INSERT
+                results = execute_values(
+                    cursor,
+                    INSERT_PART_REQUESTS_BATCH,
+                    rows,
+                    page_size=len(rows),
+                    fetch=True,
+                )
+
+        requests = [
+            {
+                "request_id": result[0],
+                "work_order_id": result[1],
+                "station_number": result[2],
+                "part_number": result[3],
+                "quantity_requested": float(result[4]),
+                "request_date": result[5].isoformat(),
+                "status": result[6],
+            }
+            for result in results
+        ]
+        return (
+            jsonify(
+                {
+                    "message": "Part requests created",
+                    "request_ids": [r["request_id"] for r in requests],
+                    "requests": requests,
+                }
+            ),
+            201,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
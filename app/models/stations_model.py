@@ -14,9 +14,7 @@ INSERT INTO WorkOrderStationStatus (work_order_id, station_number, notes, update
 
 
 def post_comment(data):
-    work_order_str = data["work_order_id"]
-
-    work_order_id = int(work_order_str[2:])
+    work_order_id = data["work_order_id"]
     station_number = data["station_number"]
     comment = data["comment"]
 
@@ -0,0 +1,24 @@
+from app.db import connection
+
+CREATE_SUPPLY_LOG_PARTITIONS = """
+SELECT create_part_supply_log_partitions(%s);
+"""
+
+
+def create_supply_log_partitions(months_ahead):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_SUPPLY_LOG_PARTITIONS, (months_ahead,))
+            return cursor.fetchone()[0]
+
+
+ARCHIVE_SUPPLY_LOG_PARTITIONS = """
+SELECT archive_part_supply_log_partitions(%s);
+"""
+
+
+def archive_supply_log_partitions(retain_months):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_SUPPLY_LOG_PARTITIONS, (retain_months,))
+            return [row[0] for row in cursor.fetchall()]
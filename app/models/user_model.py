@@ -1,9 +1,24 @@
-import bcrypt
 import jwt
 from datetime import datetime, timedelta
 from app.db import connection
 from flask import jsonify
 from app.config import Config
+from app.utils.cache import TTLCache
+from app.utils.hashing import (
+    HashingBusyError,
+    hash_password,
+    verify_password,
+    needs_rehash,
+)
+
+
+def hashing_busy_response():
+    return (
+        jsonify({"error": "Too many sign-ins in progress, please retry shortly"}),
+        503,
+        {"Retry-After": "1"},
+    )
+
 
 # query to insert a new user
 
@@ -25,9 +40,10 @@ def create_user(data):
     # by default it will assign everything as production employee
     account_type = data.get("accountType", "production_employee")
 
-    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode(
-        "utf-8"
-    )
+    try:
+        password_hash = hash_password(password)
+    except HashingBusyError:
+        return hashing_busy_response()
 
     try:
         with connection:
@@ -77,7 +93,9 @@ def log_in_user(data):
 
         user_id, stored_hash, account_type, first_name, last_name, company = user
 
-        if bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8")):
+        if verify_password(password, stored_hash):
+            if needs_rehash(stored_hash):
+                rehash_password(user_id, password)
 
             payload = {
                 "user_id": user_id,
@@ -108,31 +126,79 @@ def log_in_user(data):
         else:
             return jsonify({"error": "Invalid email or password"}), 401
 
+    except HashingBusyError:
+        return hashing_busy_response()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-SELECT_USER_BY_EMAIL = """
-SELECT user_id, account_type FROM Users WHERE email = %s
+UPDATE_PASSWORD_HASH = """
+UPDATE Users SET password_hash = %s WHERE user_id = %s
 """
 
 
+def rehash_password(user_id, password):
+    # Best effort: the login already succeeded, so a busy pool or a failed
+    # update just leaves the old cost in place until the next sign-in.
+    try:
+        new_hash = hash_password(password)
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(UPDATE_PASSWORD_HASH, (new_hash, user_id))
+    except Exception as e:
+        print(f"[Login] Skipped password rehash for user {user_id}: {e}")
+
+
+# The no-op update makes ON CONFLICT return the existing row, so concurrent
+# first logins for the same email resolve to one user in a single statement.
+# Existing users are only read; the insert runs (and draws a user_id) only
+# for a new email. A concurrent first sign-in for the same email makes both
+# branches come back empty, so the caller runs it again.
+UPSERT_OAUTH_USER = """
+WITH existing AS (
+    SELECT user_id, account_type FROM Users WHERE email = %(email)s
+),
+inserted AS (
+    INSERT INTO Users (
+        email, password_hash, account_type, first_name, last_name, company
+    )
+    SELECT %(email)s, '-', 'production_employee', %(first_name)s, %(last_name)s, '-'
+    WHERE NOT EXISTS (SELECT 1 FROM existing)
+    ON CONFLICT (email) DO NOTHING
+    RETURNING user_id, account_type
+)
+SELECT user_id, account_type FROM existing
+UNION ALL
+SELECT user_id, account_type FROM inserted;
+"""
+
+_user_cache = TTLCache(Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL_SECONDS)
+
+
 def get_or_create_user(email, first_name, last_name):
+    cached = _user_cache.get(email)
+    if cached is not None:
+        return cached
 
-    with connection:
-        with connection.cursor() as cursor:
-            cursor.execute(SELECT_USER_BY_EMAIL, (email,))
-            result = cursor.fetchone()
-            if result:
-                return result[0], result[1]
-            else:
-                default_type = "production_employee"
-                cursor.execute(
-                    INSERT_NEW_USER,
-                    (email, "-", default_type, first_name, last_name, "-"),
-                )
-                user_id = cursor.fetchone()[0]
-                return user_id, default_type
+    params = {"email": email, "first_name": first_name, "last_name": last_name}
+    row = None
+    for _ in range(2):
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(UPSERT_OAUTH_USER, params)
+                row = cursor.fetchone()
+        if row is not None:
+            break
+    if row is None:
+        raise RuntimeError(f"Could not create or find user {email}")
+    user_id, account_type = row
+
+    _user_cache.set(email, (user_id, account_type))
+    return user_id, account_type
+
+
+def user_cache_stats():
+    return _user_cache.stats()
 
 
 UPDATE_USER_COMPANY = """
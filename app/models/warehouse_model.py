@@ -1,5 +1,6 @@
 from app.db import connection
 from flask import jsonify
+from psycopg2.extras import execute_values
 
 INSERT_NEW_DISPATCH = """
 INSERT INTO PartSupplyLog (
@@ -10,10 +11,7 @@ INSERT INTO PartSupplyLog (
 
 
 def post_dispatch_parts(data):
-    work_order_str = data["work_order_id"]
-
-    work_order_id = int(work_order_str[2:])
-
+    work_order_id = data["work_order_id"]
     station_number = data["station_number"]
     part_number = data["part_number"]
     quantity_supplied = data["quantity_supplied"]
@@ -37,3 +35,264 @@ def post_dispatch_parts(data):
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+INSERT_DISPATCH_BATCH = """
+INSERT INTO PartSupplyLog (
+                        work_order_id, station_number, part_number, quantity_supplied, supplied_at
+                    ) VALUES %s
+                    RETURNING supply_id;
+"""
+
+
+def post_dispatch_parts_batch(data):
+    rows = [
+        (
+            line["work_order_id"],
+            line["station_number"],
+            line["part_number"],
+            line["quantity_supplied"],
+        )
+        for line in data["lines"]
+    ]
+
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                # One INSERT for the whole cart; the statement-level supply
+                # trigger then applies a single grouped UPDATE.
+                results = execute_values(
+                    cursor,
+                    INSERT_DISPATCH_BATCH,
+                    rows,
+                    template="(%s, %s, %s, %s, NOW())",
+                    page_size=len(rows),
+                    fetch=True,
+                )
+        return (
+            jsonify(
+                {
+                    "message": "Part dispatches recorded successfully.",
+                    "supply_ids": [result[0] for result in results],
+                }
+            ),
+            201,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# The supplied_at bounds let the planner prune PartSupplyLog down to the
+# monthly partitions that overlap the requested window.
+GET_DISPATCH_HISTORY = """
+SELECT
+  psl.supply_id,
+  'WO' || LPAD(psl.work_order_id::text, 7, '0') AS work_order_id,
+  psl.station_number,
+  psl.part_number,
+  psl.quantity_supplied,
+  psl.supplied_at
+FROM PartSupplyLog psl
+WHERE psl.supplied_at >= %(since)s
+  AND psl.supplied_at < %(until)s
+  AND (%(work_order_id)s::int IS NULL OR psl.work_order_id = %(work_order_id)s)
+ORDER BY psl.supplied_at DESC, psl.supply_id DESC
+LIMIT %(limit)s;
+"""
+
+
+def get_dispatch_history(since, until, work_order_id=None, limit=1000):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    GET_DISPATCH_HISTORY,
+                    {
+                        "since": since,
+                        "until": until,
+                        "work_order_id": work_order_id,
+                        "limit": limit,
+                    },
+                )
+                rows = cursor.fetchall()
+
+        dispatches = [
+            {
+                "supply_id": supply_id,
+                "work_order_id": formatted_work_order_id,
+                "station_number": station_number,
+                "part_number": part_number,
+                "quantity_supplied": float(quantity_supplied),
+                "supplied_at": supplied_at.isoformat(),
+            }
+            for (
+                supply_id,
+                formatted_work_order_id,
+                station_number,
+                part_number,
+                quantity_supplied,
+                supplied_at,
+            ) in rows
+        ]
+        return (
+            jsonify(
+                {
+                    "from": since.isoformat(),
+                    "to": until.isoformat(),
+                    "dispatches": dispatches,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+CLAIM_PART_REQUESTS = """
+WITH next_requests AS (
+    SELECT request_id
+    FROM PartRequests
+    WHERE status = 'pending'
+       OR (status = 'picking' AND lease_expires_at < NOW())
+    ORDER BY request_date, request_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE PartRequests pr
+SET status = 'picking',
+    claimed_by = %s,
+    claimed_at = NOW(),
+    lease_expires_at = NOW() + make_interval(secs => %s)
+FROM next_requests
+WHERE pr.request_id = next_requests.request_id
+RETURNING pr.request_id, pr.work_order_id, pr.station_number, pr.part_number,
+          pr.quantity_requested, pr.request_date, pr.lease_expires_at;
+"""
+
+
+def claim_part_requests(user_id, limit, lease_seconds):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(CLAIM_PART_REQUESTS, (limit, user_id, lease_seconds))
+                rows = cursor.fetchall()
+
+        claimed = [
+            {
+                "request_id": request_id,
+                "work_order_id": f"WO{work_order_id:07d}",
+                "station_number": station_number,
+                "part_number": part_number,
+                "quantity_requested": float(quantity_requested),
+                "request_date": request_date.isoformat(),
+                "lease_expires_at": lease_expires_at.isoformat(),
+            }
+            for (
+                request_id,
+                work_order_id,
+                station_number,
+                part_number,
+                quantity_requested,
+                request_date,
+                lease_expires_at,
+            ) in sorted(rows, key=lambda row: (row[5], row[0]))
+        ]
+        return jsonify({"requests": claimed}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+COMPLETE_PART_REQUEST = """
+WITH claimed AS (
+    SELECT request_id, work_order_id, station_number, part_number, quantity_requested
+    FROM PartRequests
+    WHERE request_id = %s AND status = 'picking' AND claimed_by = %s
+      AND lease_expires_at > NOW()
+    FOR UPDATE
+),
+supplied AS (
+    INSERT INTO PartSupplyLog (
+        work_order_id, station_number, part_number, quantity_supplied, supplied_at
+    )
+    SELECT work_order_id, station_number, part_number,
+           COALESCE(%s, quantity_requested), NOW()
+    FROM claimed
+    RETURNING supply_id, quantity_supplied
+)
+UPDATE PartRequests pr
+SET status = 'fulfilled',
+    supply_id = supplied.supply_id,
+    fulfilled_at = NOW(),
+    lease_expires_at = NULL
+FROM claimed, supplied
+WHERE pr.request_id = claimed.request_id
+RETURNING pr.request_id, supplied.supply_id, supplied.quantity_supplied;
+"""
+
+
+def complete_part_request(request_id, user_id, quantity_supplied=None):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    COMPLETE_PART_REQUEST, (request_id, user_id, quantity_supplied)
+                )
+                result = cursor.fetchone()
+
+        if not result:
+            # Another picker may reclaim a request once its lease expires
+            return (
+                jsonify(
+                    {
+                        "error": "Request is not claimed by this user or its "
+                        "lease has expired"
+                    }
+                ),
+                409,
+            )
+
+        return (
+            jsonify(
+                {
+                    "message": "Part request fulfilled",
+                    "request_id": result[0],
+                    "supply_id": result[1],
+                    "quantity_supplied": float(result[2]),
+                }
+            ),
+            201,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+RELEASE_PART_REQUEST = """
+UPDATE PartRequests
+SET status = 'pending',
+    claimed_by = NULL,
+    claimed_at = NULL,
+    lease_expires_at = NULL
+WHERE request_id = %s AND status = 'picking' AND claimed_by = %s
+RETURNING request_id;
+"""
+
+
+def release_part_request(request_id, user_id):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(RELEASE_PART_REQUEST, (request_id, user_id))
+                result = cursor.fetchone()
+
+        if not result:
+            return (
+                jsonify({"error": "Request is not currently claimed by this user"}),
+                409,
+            )
+
+        return (
+            jsonify({"message": "Part request released", "request_id": result[0]}),
+            200,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
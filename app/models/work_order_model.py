@@ -1,5 +1,8 @@
+from app.config import Config
 from app.db import connection
+from app.models.job_model import enqueue_job
 from flask import jsonify
+from psycopg2.extras import Json
 
 GET_ALL_WORK_ORDERS_SUMMARY = """
 SELECT
@@ -13,39 +16,55 @@ SELECT
 FROM WorkOrders wo
 JOIN StationWorkOrderParts swop ON wo.work_order_id = swop.work_order_id
 GROUP BY wo.work_order_id, wo.product_number, wo.quantity_to_produce, wo.is_completed
-ORDER BY wo.work_order_id ASC;
+UNION ALL
+SELECT
+  wo.work_order_id,
+  'WO' || LPAD(wo.work_order_id::text, 7, '0') AS formatted_work_order_id,
+  wo.product_number,
+  wo.quantity_to_produce,
+  awo.total_quantity_needed,
+  awo.total_quantity_supplied,
+  wo.is_completed
+FROM WorkOrders wo
+JOIN ArchivedWorkOrders awo ON wo.work_order_id = awo.work_order_id
+ORDER BY work_order_id ASC;
 
 
 """
 
 
+def build_work_order_summaries(results):
+    work_orders = []
+    for row in results:
+        (
+            work_order_id,
+            formatted_work_order_id,
+            product_number,
+            quantity_to_produce,
+            total_quantity_needed,
+            total_quantity_supplied,
+            is_completed,
+        ) = row
+        work_orders.append(
+            {
+                "work_order_id": formatted_work_order_id,
+                "product_number": product_number,
+                "quantity_to_produce": quantity_to_produce,
+                "total_parts_needed": total_quantity_needed,
+                "total_parts_supplied": total_quantity_supplied,
+                "is_completed": is_completed,
+            }
+        )
+    return work_orders
+
+
 def retrieve_work_orders():
     try:
         with connection:
             with connection.cursor() as cursor:
                 cursor.execute(GET_ALL_WORK_ORDERS_SUMMARY)
                 results = cursor.fetchall()
-                work_orders = []
-                for row in results:
-                    (
-                        work_order_id,
-                        formatted_work_order_id,
-                        product_number,
-                        quantity_to_produce,
-                        total_quantity_needed,
-                        total_quantity_supplied,
-                        is_completed,
-                    ) = row
-                    work_orders.append(
-                        {
-                            "work_order_id": formatted_work_order_id,
-                            "product_number": product_number,
-                            "quantity_to_produce": quantity_to_produce,
-                            "total_parts_needed": total_quantity_needed,
-                            "total_parts_supplied": total_quantity_supplied,
-                            "is_completed": is_completed,
-                        }
-                    )
+                work_orders = build_work_order_summaries(results)
         return jsonify({"work_orders": work_orders}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -79,6 +98,48 @@ ORDER BY uss.unit_number, uss.station_number;
 """
 
 
+GET_ARCHIVED_WORK_ORDER = """
+SELECT snapshot FROM ArchivedWorkOrders WHERE work_order_id = %s;
+"""
+
+
+def build_units(results):
+    units_dict = {}
+
+    for (
+        unit_number,
+        station_number,
+        unit_status,
+        part_number,
+        part_description,
+        quantity_required,
+        quantity_supplied,
+        station_status,
+        station_comments,
+        is_completed,
+    ) in results:
+        if unit_number not in units_dict:
+            units_dict[unit_number] = {
+                "unit_number": unit_number,
+                "stations": [],
+            }
+
+        units_dict[unit_number]["stations"].append(
+            {
+                "station_number": station_number,
+                "unit_status": unit_status,
+                "station_status": station_status,
+                "station_comments": station_comments,
+                "part_number": part_number,
+                "part_description": part_description,
+                "quantity_required": float(quantity_required),
+                "quantity_supplied": float(quantity_supplied),
+            }
+        )
+
+    return list(units_dict.values())
+
+
 def retrieve_units_by_work_order_id(work_order_id):
 
     try:
@@ -86,41 +147,17 @@ def retrieve_units_by_work_order_id(work_order_id):
             with connection.cursor() as cursor:
                 cursor.execute(GET_WORK_ORDER_BY_ID, (work_order_id,))
                 results = cursor.fetchall()
-                units_dict = {}
 
-                is_completed = results[0][-1]
-                for (
-                    unit_number,
-                    station_number,
-                    unit_status,
-                    part_number,
-                    part_description,
-                    quantity_required,
-                    quantity_supplied,
-                    station_status,
-                    station_comments,
-                    is_completed,
-                ) in results:
-                    if unit_number not in units_dict:
-                        units_dict[unit_number] = {
-                            "unit_number": unit_number,
-                            "stations": [],
-                        }
-
-                    units_dict[unit_number]["stations"].append(
-                        {
-                            "station_number": station_number,
-                            "unit_status": unit_status,
-                            "station_status": station_status,
-                            "station_comments": station_comments,
-                            "part_number": part_number,
-                            "part_description": part_description,
-                            "quantity_required": float(quantity_required),
-                            "quantity_supplied": float(quantity_supplied),
-                        }
-                    )
+                if not results:
+                    # Archived orders no longer have rows in the hot tables
+                    cursor.execute(GET_ARCHIVED_WORK_ORDER, (work_order_id,))
+                    archived = cursor.fetchone()
+                    if not archived:
+                        return jsonify({"error": "Work order not found"}), 404
+                    return jsonify(archived[0]), 200
 
-                units = list(units_dict.values())
+                is_completed = results[0][-1]
+                units = build_units(results)
 
                 return jsonify({"units": units, "is_completed": is_completed}), 200
 
@@ -130,68 +167,66 @@ def retrieve_units_by_work_order_id(work_order_id):
         return jsonify({"error": str(e)}), 500
 
 
+# One statement creates the order and its part and station rows, so the
+# request costs a single round trip plus the commit.
 INSERT_NEW_WORK_ORDER = """
-INSERT INTO WorkOrders (product_number, quantity_to_produce)
-VALUES (%s, %s)
-RETURNING work_order_id;
-"""
-
-INSERT_NEW_WORKORDER_PARTS = """
-INSERT INTO WorkOrderParts (work_order_id, part_number, quantity_needed)
-SELECT
-    %s AS work_order_id,
-    b.part_number,
-    b.quantity * %s AS quantity_needed
-FROM BOM b
-WHERE b.product_number = %s;
-"""
-
-INSERT_NEW_WORKSTATION_PARTS = """
-INSERT INTO StationWorkOrderParts (
-    work_order_id, station_number, part_number, quantity_needed
+WITH new_order AS (
+    INSERT INTO WorkOrders (product_number, quantity_to_produce)
+    VALUES (%(product_number)s, %(quantity)s)
+    RETURNING work_order_id
+),
+order_parts AS (
+    INSERT INTO WorkOrderParts (work_order_id, part_number, quantity_needed)
+    SELECT
+        o.work_order_id,
+        b.part_number,
+        b.quantity * %(quantity)s AS quantity_needed
+    FROM new_order o
+    JOIN BOM b ON b.product_number = %(product_number)s
+),
+station_parts AS (
+    INSERT INTO StationWorkOrderParts (
+        work_order_id, station_number, part_number, quantity_needed
+    )
+    SELECT
+        o.work_order_id,
+        sp.station_number,
+        sp.part_number,
+        sp.quantity_required * %(quantity)s AS quantity_needed
+    FROM new_order o
+    JOIN BOM b ON b.product_number = %(product_number)s
+    JOIN StationParts sp ON b.part_number = sp.part_number
+),
+station_status AS (
+    INSERT INTO WorkOrderStationStatus (work_order_id, station_number, status)
+    SELECT
+        o.work_order_id,
+        s.station_number,
+        'not_started'::station_status
+    FROM new_order o
+    CROSS JOIN Stations s
 )
-SELECT
-    %s AS work_order_id,
-    sp.station_number,
-    sp.part_number,
-    sp.quantity_required * %s AS quantity_needed
-FROM BOM b
-JOIN StationParts sp ON b.part_number = sp.part_number
-WHERE b.product_number = %s;
+SELECT work_order_id FROM new_order;
 """
 
-INITIALIZE_STATUS = """
-INSERT INTO WorkOrderStationStatus (work_order_id, station_number, status)
-SELECT
-    %s,
-    s.station_number,
-    'not_started'::station_status
-FROM Stations s;
-"""
+
+def create_work_order_job(cursor, payload):
+    cursor.execute(INSERT_NEW_WORK_ORDER, payload)
+    return {"work_order_id": f"WO{cursor.fetchone()[0]:07d}"}
 
 
-def add_work_order(data):
-    product_number = data["product_number"]
-    quantity = data["quantity"]
+def add_work_order(data, user_id=None):
+    params = {"product_number": data["product_number"], "quantity": data["quantity"]}
+    async_quantity = Config.WORK_ORDER_ASYNC_QUANTITY
+    if async_quantity and params["quantity"] >= async_quantity:
+        return queue_work_order(params, user_id)
 
     try:
         with connection:
             with connection.cursor() as cursor:
-                cursor.execute(INSERT_NEW_WORK_ORDER, (product_number, quantity))
+                cursor.execute(INSERT_NEW_WORK_ORDER, params)
                 work_order_id = cursor.fetchone()[0]
 
-                cursor.execute(
-                    INSERT_NEW_WORKORDER_PARTS,
-                    (work_order_id, quantity, product_number),
-                )
-
-                cursor.execute(
-                    INSERT_NEW_WORKSTATION_PARTS,
-                    (work_order_id, quantity, product_number),
-                )
-
-                cursor.execute(INITIALIZE_STATUS, (work_order_id,))
-
         return (
             jsonify(
                 {
@@ -205,9 +240,30 @@ def add_work_order(data):
         return jsonify({"error": str(e)}), 500
 
 
+def queue_work_order(params, user_id):
+    try:
+        with connection:
+            with connection.cursor() as cursor:
+                job_id = enqueue_job(cursor, "create_work_order", params, user_id)
+
+        return (
+            jsonify(
+                {
+                    "message": "Work order queued",
+                    "job_id": job_id,
+                    "status_url": f"/api/jobs/{job_id}",
+                }
+            ),
+            202,
+            {"Location": f"/api/jobs/{job_id}"},
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 UPDATE_WORK_ORDER_COMPLETE = """
 UPDATE WorkOrders
-SET is_completed = TRUE
+SET is_completed = TRUE, completed_at = NOW()
 WHERE work_order_id = %s
   AND NOT EXISTS (
     SELECT 1 FROM WorkOrderStationStatus
@@ -276,3 +332,81 @@ def post_comment(work_order_id, unit_number, station_number, data):
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+SELECT_ARCHIVABLE_WORK_ORDERS = """
+SELECT wo.work_order_id
+FROM WorkOrders wo
+WHERE wo.is_completed
+  AND COALESCE(wo.completed_at, wo.created_at) < NOW() - make_interval(days => %s)
+  AND NOT EXISTS (
+    SELECT 1 FROM ArchivedWorkOrders awo WHERE awo.work_order_id = wo.work_order_id
+  )
+ORDER BY wo.work_order_id
+LIMIT %s;
+"""
+
+LOCK_COMPLETED_WORK_ORDER = """
+SELECT work_order_id
+FROM WorkOrders
+WHERE work_order_id = %s AND is_completed
+FOR UPDATE SKIP LOCKED;
+"""
+
+ARCHIVE_WORK_ORDER = """
+WITH archived AS (
+    INSERT INTO ArchivedWorkOrders (
+        work_order_id, total_quantity_needed, total_quantity_supplied, snapshot
+    )
+    SELECT
+        %(work_order_id)s,
+        SUM(quantity_needed),
+        SUM(COALESCE(quantity_supplied, 0)),
+        %(snapshot)s
+    FROM StationWorkOrderParts
+    WHERE work_order_id = %(work_order_id)s
+    RETURNING work_order_id
+),
+units AS (
+    DELETE FROM UnitStationStatus
+    WHERE work_order_id IN (SELECT work_order_id FROM archived)
+),
+station_parts AS (
+    DELETE FROM StationWorkOrderParts
+    WHERE work_order_id IN (SELECT work_order_id FROM archived)
+),
+station_status AS (
+    DELETE FROM WorkOrderStationStatus
+    WHERE work_order_id IN (SELECT work_order_id FROM archived)
+)
+DELETE FROM WorkOrderParts
+WHERE work_order_id IN (SELECT work_order_id FROM archived);
+"""
+
+
+def archive_completed_work_orders(older_than_days, limit):
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(SELECT_ARCHIVABLE_WORK_ORDERS, (older_than_days, limit))
+            candidates = [row[0] for row in cursor.fetchall()]
+
+    archived = []
+    for work_order_id in candidates:
+        # One transaction per order keeps locks short on the hot tables
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(LOCK_COMPLETED_WORK_ORDER, (work_order_id,))
+                if not cursor.fetchone():
+                    continue
+
+                cursor.execute(GET_WORK_ORDER_BY_ID, (work_order_id,))
+                results = cursor.fetchall()
+                snapshot = {"units": build_units(results), "is_completed": True}
+
+                cursor.execute(
+                    ARCHIVE_WORK_ORDER,
+                    {"work_order_id": work_order_id, "snapshot": Json(snapshot)},
+                )
+        archived.append(work_order_id)
+
+    return archived
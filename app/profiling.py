@@ -0,0 +1,154 @@
+import cProfile
+import marshal
+import threading
+import time
+from contextvars import ContextVar
+import jwt
+from flask import Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from app.db import fetch_observers, query_observers
+from app.utils.jwt_helper import decode_token, request_token
+
+# The profile of the request running in this thread or greenlet, if any.
+_current = ContextVar("request_profile", default=None)
+# Only one cProfile profiler can be enabled per process at a time.
+_profiler_lock = threading.Lock()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.round_trips = 0
+        self.db = 0.0
+        self.fetch = 0.0
+        self.serialize = 0.0
+        self.profiler = None
+        self.token = None
+
+    def server_timing(self, total):
+        # Whatever is left of the request after SQL, fetching and JSON
+        # encoding is Python building the response: the row loops.
+        transform = max(total - self.db - self.fetch - self.serialize, 0.0)
+        phases = [
+            f'db;dur={self.db * 1000:.2f};desc="{self.round_trips} round trips"',
+            f"fetch;dur={self.fetch * 1000:.2f}",
+            f"transform;dur={transform * 1000:.2f}",
+            f"serialize;dur={self.serialize * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ]
+        return ", ".join(phases)
+
+
+def _on_query(name, seconds, cursor, error):
+    profile = _current.get()
+    if profile is not None:
+        profile.round_trips += 1
+        profile.db += seconds
+
+
+def _on_fetch(seconds, cursor):
+    profile = _current.get()
+    if profile is not None:
+        profile.fetch += seconds
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return super().dumps(obj, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            profile.serialize += time.perf_counter() - started
+
+
+def _may_profile(account_types):
+    token = request_token()
+    if not token:
+        return False
+    try:
+        claims = decode_token(token)
+    except jwt.InvalidTokenError:
+        return False
+    return claims.get("account_type") in account_types
+
+
+def _finish(profile):
+    if profile.profiler is not None:
+        profile.profiler.disable()
+        _profiler_lock.release()
+    if profile.token is not None:
+        _current.reset(profile.token)
+        profile.token = None
+
+
+def init_profiling(app):
+    """Let admins profile a single request with an ``X-Profile`` header.
+
+    ``X-Profile: timing`` adds a ``Server-Timing`` header splitting the
+    request into db/fetch/transform/serialize. ``X-Profile: pstats`` also
+    runs cProfile and returns the stats as a ``.prof`` download in place of
+    the response body.
+    """
+    account_types = app.config["PROFILE_ACCOUNT_TYPES"]
+    app.json = TimedJSONProvider(app)
+    if _on_query not in query_observers:
+        query_observers.append(_on_query)
+        fetch_observers.append(_on_fetch)
+
+    @app.before_request
+    def start_profile():
+        mode = request.headers.get("X-Profile")
+        if not mode:
+            return None
+        if mode not in ("timing", "pstats"):
+            return jsonify({"error": "X-Profile must be timing or pstats"}), 400
+        if not _may_profile(account_types):
+            return jsonify({"error": "Profiling is restricted to admins"}), 403
+
+        profile = RequestProfile()
+        if mode == "pstats":
+            if not _profiler_lock.acquire(blocking=False):
+                return jsonify({"error": "Another request is being profiled"}), 429
+            profile.profiler = cProfile.Profile()
+        profile.token = _current.set(profile)
+        g.request_profile = profile
+        if profile.profiler is not None:
+            profile.profiler.enable()
+        return None
+
+    @app.after_request
+    def attach_profile(response):
+        profile = g.get("request_profile")
+        if profile is None:
+            return response
+
+        if profile.profiler is not None:
+            profile.profiler.disable()
+        total = time.perf_counter() - profile.started
+        timing = profile.server_timing(total)
+
+        if profile.profiler is not None:
+            profile.profiler.create_stats()
+            endpoint = (request.endpoint or "request").replace(".", "-")
+            response = Response(
+                marshal.dumps(profile.profiler.stats),
+                mimetype="application/octet-stream",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{endpoint}.prof"',
+                    "X-Profiled-Status": str(response.status_code),
+                },
+            )
+        response.headers["Server-Timing"] = timing
+        return response
+
+    @app.teardown_request
+    def finish_profile(exc):
+        # Runs even when a view raises with exceptions propagating
+        # (testing/debug) and after_request is skipped.
+        profile = g.pop("request_profile", None)
+        if profile is not None:
+            _finish(profile)
@@ -4,6 +4,8 @@ from .work_orders import work_orders_bp
 from .parts import parts_bp
 from .stations import stations_bp
 from .warehouse import warehouse_bp
+from .admin import admin_bp
+from .jobs import jobs_bp
 
 
 def register_blueprints(app):
@@ -13,3 +15,5 @@ def register_blueprints(app):
     app.register_blueprint(parts_bp, url_prefix="/api/parts")
     app.register_blueprint(stations_bp, url_prefix="/api/stations")
     app.register_blueprint(warehouse_bp, url_prefix="/api/warehouse")
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
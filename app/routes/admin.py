@@ -0,0 +1,84 @@
+from flask import Blueprint, jsonify, request
+from app.slow_queries import slow_query_log
+from ..utils.jwt_helper import admin_required
+
+admin_bp = Blueprint("admin", __name__)
+
+
+@admin_bp.get("/slow-queries")
+@admin_required
+def slow_queries():
+    """
+    Recent slow queries
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Admin
+    summary: Statements slower than SLOW_QUERY_MS seen by this worker, newest first
+    description: |
+      Each entry is keyed by the model SQL constant that ran. A sampled share
+      (SLOW_QUERY_EXPLAIN_RATE) carries the statement's EXPLAIN output;
+      read-only statements are explained with ANALYZE and BUFFERS.
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        example: 50
+    responses:
+      200:
+        description: Slow statements
+        schema:
+          type: object
+          properties:
+            threshold_ms:
+              type: number
+              example: 250
+            queries:
+              type: array
+              items:
+                type: object
+                properties:
+                  at:
+                    type: string
+                    example: "2025-07-20T10:15:00.123456+00:00"
+                  query:
+                    type: string
+                    example: "GET_WORK_ORDER_BY_ID"
+                  duration_ms:
+                    type: number
+                    example: 412.5
+                  rows:
+                    type: integer
+                    example: 6500
+                  params:
+                    type: string
+                    example: "(1,)"
+                  error:
+                    type: string
+                  explain:
+                    type: object
+      400:
+        description: Invalid limit
+      401:
+        description: Missing or invalid token
+      403:
+        description: Not an admin
+    """
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return jsonify({"error": "Invalid limit parameter"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit parameter"}), 400
+
+    return (
+        jsonify(
+            {
+                "threshold_ms": slow_query_log.threshold * 1000,
+                "queries": slow_query_log.recent(limit),
+            }
+        ),
+        200,
+    )
@@ -6,6 +6,8 @@ from urllib.parse import urlencode
 from datetime import datetime, timedelta
 from app.config import Config
 from app.models.user_model import get_or_create_user
+from app.utils.oidc import get_provider_config, DiscoveryUnavailableError
+from app.utils.http_client import provider_request, CircuitOpenError
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -15,11 +17,19 @@ def get_redirect_uri():
     return f"{base_url}/api/auth/callback"
 
 
-# Get Google OAuth URLs
-provider_cfg = requests.get(Config.GOOGLE_DISCOVERY_URL).json()
-auth_endpoint = provider_cfg["authorization_endpoint"]
-token_endpoint = provider_cfg["token_endpoint"]
-userinfo_endpoint = provider_cfg["userinfo_endpoint"]
+def discovery_unavailable():
+    return jsonify({"error": "Sign-in provider is currently unavailable"}), 503
+
+
+def provider_failed(step, e):
+    print(f"[OAuth Callback] {step} failed: {e}")
+    if isinstance(e, CircuitOpenError):
+        return (
+            jsonify({"error": "Sign-in provider is currently unavailable"}),
+            503,
+            {"Retry-After": str(Config.OAUTH_BREAKER_RESET_SECONDS)},
+        )
+    return jsonify({"error": f"{step} failed", "details": str(e)}), 502
 
 
 @auth_bp.route("/login")
@@ -34,7 +44,14 @@ def login():
     responses:
       302:
         description: Redirect to Google for authentication
+      503:
+        description: Google's OpenID configuration could not be loaded
     """
+    try:
+        auth_endpoint = get_provider_config()["authorization_endpoint"]
+    except DiscoveryUnavailableError:
+        return discovery_unavailable()
+
     params = {
         "client_id": Config.GOOGLE_CLIENT_ID,
         "redirect_uri": get_redirect_uri(),
@@ -92,12 +109,23 @@ def callback():
                   example: production_employee
       400:
         description: Error during OAuth2 callback or token exchange
+      502:
+        description: Google could not be reached or did not answer in time
+      503:
+        description: Google's OpenID configuration could not be loaded, or its circuit breaker is open
     """
     code = request.args.get("code")
 
     if not code:
         return jsonify({"error": "Missing authorization code"}), 400
 
+    try:
+        provider_cfg = get_provider_config()
+    except DiscoveryUnavailableError:
+        return discovery_unavailable()
+    token_endpoint = provider_cfg["token_endpoint"]
+    userinfo_endpoint = provider_cfg["userinfo_endpoint"]
+
     # Exchange code for access token
     token_data = {
         "code": code,
@@ -106,7 +134,10 @@ def callback():
         "redirect_uri": get_redirect_uri(),
         "grant_type": "authorization_code",
     }
-    token_response = requests.post(token_endpoint, data=token_data)
+    try:
+        token_response = provider_request("POST", token_endpoint, data=token_data)
+    except requests.exceptions.RequestException as e:
+        return provider_failed("Token exchange", e)
     if token_response.status_code != 200:
         return (
             jsonify(
@@ -120,9 +151,15 @@ def callback():
     # Fetch user info
     headers = {"Authorization": f"Bearer {access_token}"}
     try:
-        userinfo_response = requests.get(userinfo_endpoint, headers=headers, timeout=10)
+        userinfo_response = provider_request("GET", userinfo_endpoint, headers=headers)
         userinfo_response.raise_for_status()
         userinfo = userinfo_response.json()
+    except (
+        CircuitOpenError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    ) as e:
+        return provider_failed("User info request", e)
     except requests.exceptions.RequestException as e:
         print(f"[OAuth Callback] Failed to fetch user info: {e}")
         return (
@@ -0,0 +1,66 @@
+from flask import Blueprint, request
+from app.models.job_model import get_job
+from ..utils.jwt_helper import token_required
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.get("/<int:job_id>")
+@token_required
+def job_status(job_id):
+    """
+    Background job status
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Jobs
+    summary: Poll a job queued by a 202 response
+    description: |
+      Jobs are run by `flask jobs work`. A failed attempt is retried with
+      backoff up to max_attempts; `error` holds the last failure. Only the
+      user who queued the job (or an admin) can see it.
+    parameters:
+      - name: job_id
+        in: path
+        required: true
+        type: integer
+        example: 42
+    responses:
+      200:
+        description: Job state
+        schema:
+          type: object
+          properties:
+            job_id:
+              type: integer
+              example: 42
+            kind:
+              type: string
+              example: create_work_order
+            status:
+              type: string
+              enum: [queued, running, succeeded, failed]
+            attempts:
+              type: integer
+              example: 1
+            max_attempts:
+              type: integer
+              example: 5
+            result:
+              type: object
+              example: {"work_order_id": "WO0000042"}
+            error:
+              type: string
+            created_at:
+              type: string
+              example: "2025-07-20T10:15:00.123456"
+            finished_at:
+              type: string
+      401:
+        description: Missing or invalid token
+      404:
+        description: No such job for this user
+    """
+    response = get_job(job_id, request.user)
+    return response
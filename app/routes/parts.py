@@ -1,7 +1,14 @@
-from flask import Blueprint, request
-from app.models.parts_model import get_all_products, get_needed_parts, add_part_request
-from ..utils.validators import validate_work_order_id, validate_part_number
+from flask import Blueprint
+from app.models.parts_model import (
+    get_all_products,
+    get_needed_parts,
+    add_part_request,
+    add_part_requests,
+)
+from ..utils.validators import validate_body
+from ..utils.schemas import PART_REQUEST, PART_REQUEST_BATCH
 from ..utils.jwt_helper import token_required
+from ..utils.idempotency import idempotent
 
 parts_bp = Blueprint("parts", __name__)
 
@@ -79,9 +86,9 @@ def get_parts_needed():
 
 @parts_bp.post("/part_request")
 @token_required
-@validate_work_order_id
-@validate_part_number
-def post_part_request():
+@idempotent
+@validate_body(PART_REQUEST)
+def post_part_request(body):
     """
     Request Parts from Warehouse
     ---
@@ -93,6 +100,11 @@ def post_part_request():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Retries with the same key replay the original response instead of writing again
       - in: body
         name: body
         required: true
@@ -162,6 +174,125 @@ def post_part_request():
               type: string
               example: Internal server error
     """
-    data = request.get_json()
-    response = add_part_request(data)
+    response = add_part_request(body)
+    return response
+
+
+@parts_bp.post("/part_request/batch")
+@token_required
+@idempotent
+@validate_body(PART_REQUEST_BATCH)
+def post_part_requests_batch(body):
+    """
+    Request Multiple Parts from Warehouse
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Parts
+    summary: Request several parts for one station of a work order in a single call
+    consumes:
+      - application/json
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Retries with the same key replay the original response instead of writing again
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - work_order_id
+            - station_number
+            - requested_by
+            - parts
+          properties:
+            work_order_id:
+              type: string
+              example: "WO0000001"
+              description: Work order ID in display format
+            station_number:
+              type: string
+              example: "1"
+              description: Station requesting the parts
+            requested_by:
+              type: integer
+              example: 2
+              description: Person id requesting the parts
+            parts:
+              type: array
+              maxItems: 200
+              items:
+                type: object
+                required:
+                  - part_number
+                  - quantity_requested
+                properties:
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_requested:
+                    type: number
+                    example: 4
+    responses:
+      201:
+        description: All part requests created
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Part requests created"
+            request_ids:
+              type: array
+              items:
+                type: integer
+              example: [12, 13, 14]
+            requests:
+              type: array
+              items:
+                type: object
+                properties:
+                  request_id:
+                    type: integer
+                    example: 12
+                  work_order_id:
+                    type: integer
+                    example: 1
+                  station_number:
+                    type: string
+                    example: "1"
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_requested:
+                    type: number
+                    example: 4
+                  request_date:
+                    type: string
+                    example: "2025-07-20T10:15:00"
+                  status:
+                    type: string
+                    example: pending
+      400:
+        description: Missing fields or an invalid line; nothing is inserted
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Invalid parts[2].part_number: 'bad' does not match '^[0-9]{3}-[0-9]{5}$'"
+      500:
+        description: Internal server error
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Internal server error
+    """
+    response = add_part_requests(body)
     return response
@@ -1,15 +1,16 @@
 from flask import Blueprint, request
 from app.models.stations_model import post_comment, update_station_status
 from ..utils.jwt_helper import token_required
-from ..utils.validators import validate_work_order_id, validate_part_number
+from ..utils.validators import validate_work_order_id, validate_body
+from ..utils.schemas import STATION_COMMENT
 
 stations_bp = Blueprint("stations", __name__)
 
 
 @stations_bp.post("/comment")
 @token_required
-@validate_work_order_id
-def add_comment():
+@validate_body(STATION_COMMENT)
+def add_comment(body):
     """
     Add or Update a Comment on a Station for a Work Order
     ---
@@ -57,8 +58,7 @@ def add_comment():
       500:
         description: Internal server error
     """
-    data = request.get_json()
-    response = post_comment(data)
+    response = post_comment(body)
     return response
 
 
@@ -1,16 +1,35 @@
-from flask import Blueprint, request
-from app.models.warehouse_model import post_dispatch_parts
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify
+from app.config import Config
+from app.models.ledger_model import get_ledger_balances
+from app.models.warehouse_model import (
+    get_dispatch_history,
+    post_dispatch_parts,
+    post_dispatch_parts_batch,
+    claim_part_requests,
+    complete_part_request,
+    release_part_request,
+)
 from ..utils.jwt_helper import token_required
-from ..utils.validators import validate_work_order_id, validate_part_number
+from ..utils.idempotency import idempotent
+from ..utils.validators import validate_body
+from ..utils.schemas import (
+    DISPATCH,
+    DISPATCH_BATCH,
+    QUEUE_CLAIM,
+    QUEUE_COMPLETE,
+    parse_timestamp,
+    parse_work_order_id,
+)
 
 warehouse_bp = Blueprint("warehouse", __name__)
 
 
 @warehouse_bp.post("/dispatch")
 @token_required
-@validate_work_order_id
-@validate_part_number
-def dispatch_parts():
+@idempotent
+@validate_body(DISPATCH)
+def dispatch_parts(body):
     """
     Dispatch Parts from Warehouse
     ---
@@ -22,6 +41,11 @@ def dispatch_parts():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Retries with the same key replay the original response instead of writing again
       - in: body
         name: body
         required: true
@@ -78,6 +102,471 @@ def dispatch_parts():
               type: string
               example: Internal server error
     """
-    data = request.get_json()
-    response = post_dispatch_parts(data)
+    response = post_dispatch_parts(body)
+    return response
+
+
+@warehouse_bp.get("/dispatch")
+@token_required
+def dispatch_history():
+    """
+    Dispatch History
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: List part dispatches within a time window
+    description: |
+      Reads only the monthly PartSupplyLog partitions that overlap the window.
+      Defaults to the last 30 days. Months that have been archived are not included.
+      Times with a UTC offset are converted to UTC; times without one are UTC.
+    parameters:
+      - name: from
+        in: query
+        required: false
+        type: string
+        example: "2025-07-01"
+        description: Start of the window (ISO 8601, inclusive)
+      - name: to
+        in: query
+        required: false
+        type: string
+        example: "2025-08-01"
+        description: End of the window (ISO 8601, exclusive, defaults to now)
+      - name: work_order_id
+        in: query
+        required: false
+        type: string
+        example: "WO0000001"
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        example: 1000
+    responses:
+      200:
+        description: Dispatches in the window, newest first
+        schema:
+          type: object
+          properties:
+            from:
+              type: string
+              example: "2025-07-01T00:00:00"
+            to:
+              type: string
+              example: "2025-08-01T00:00:00"
+            dispatches:
+              type: array
+              items:
+                type: object
+                properties:
+                  supply_id:
+                    type: integer
+                    example: 101
+                  work_order_id:
+                    type: string
+                    example: "WO0000001"
+                  station_number:
+                    type: string
+                    example: "1"
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_supplied:
+                    type: number
+                    example: 10
+                  supplied_at:
+                    type: string
+                    example: "2025-07-20T10:15:00"
+      400:
+        description: Invalid query parameters
+      500:
+        description: Server error
+    """
+    try:
+        until = (
+            parse_timestamp(request.args["to"])
+            if "to" in request.args
+            else datetime.utcnow()
+        )
+        since = (
+            parse_timestamp(request.args["from"])
+            if "from" in request.args
+            else until - timedelta(days=Config.DISPATCH_HISTORY_DEFAULT_DAYS)
+        )
+        limit = int(request.args.get("limit", 1000))
+    except ValueError:
+        return jsonify({"error": "Invalid from, to or limit parameter"}), 400
+
+    if since >= until or not 1 <= limit <= 5000:
+        return jsonify({"error": "Invalid from, to or limit parameter"}), 400
+
+    work_order_id = request.args.get("work_order_id")
+    if work_order_id is not None:
+        if not work_order_id.startswith("WO") or not work_order_id[2:].isdigit():
+            return jsonify({"error": "Invalid work_order_id format"}), 400
+        work_order_id = parse_work_order_id(work_order_id)
+
+    response = get_dispatch_history(since, until, work_order_id, limit)
+    return response
+
+
+@warehouse_bp.post("/dispatch/batch")
+@token_required
+@idempotent
+@validate_body(DISPATCH_BATCH)
+def dispatch_parts_batch(body):
+    """
+    Dispatch a Cart of Parts from Warehouse
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: Log many part dispatches in a single insert
+    description: |
+      Records every line of a cart in one statement. Station supply totals are
+      updated once per work order, station and part, however many lines the cart has.
+      If any line is invalid, nothing is recorded.
+    consumes:
+      - application/json
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Retries with the same key replay the original response instead of writing again
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - lines
+          properties:
+            lines:
+              type: array
+              maxItems: 200
+              items:
+                type: object
+                required:
+                  - work_order_id
+                  - station_number
+                  - part_number
+                  - quantity_supplied
+                properties:
+                  work_order_id:
+                    type: string
+                    example: "WO0000001"
+                  station_number:
+                    type: string
+                    example: "1"
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_supplied:
+                    type: number
+                    example: 10
+    responses:
+      201:
+        description: All dispatches logged
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Part dispatches recorded successfully.
+            supply_ids:
+              type: array
+              items:
+                type: integer
+              example: [101, 102]
+      400:
+        description: Invalid input or formatting
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Invalid lines[1].part_number: 'bad' does not match '^[0-9]{3}-[0-9]{5}$'"
+      500:
+        description: Server error
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Internal server error
+    """
+    response = post_dispatch_parts_batch(body)
+    return response
+
+
+@warehouse_bp.get("/ledger")
+@token_required
+def supply_ledger():
+    """
+    Supply Ledger Balances
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: Quantity supplied per work order, station and part as of a point in time
+    description: |
+      Adds the latest ledger snapshot at or before `as_of` to the supply log rows
+      written since that snapshot. The cost depends on activity since the last
+      snapshot, not on the size of the whole supply history.
+    parameters:
+      - name: as_of
+        in: query
+        required: false
+        type: string
+        example: "2025-07-20T12:00:00"
+        description: Point in time (ISO 8601, UTC unless it has an offset, defaults to now)
+      - name: part_number
+        in: query
+        required: false
+        type: string
+        example: "200-00001"
+      - name: station_number
+        in: query
+        required: false
+        type: string
+        example: "1"
+      - name: work_order_id
+        in: query
+        required: false
+        type: string
+        example: "WO0000001"
+    responses:
+      200:
+        description: Balances matching the filters
+        schema:
+          type: object
+          properties:
+            as_of:
+              type: string
+              example: "2025-07-20T12:00:00"
+            snapshot_at:
+              type: string
+              example: "2025-07-20T11:55:00"
+            total_quantity_supplied:
+              type: number
+              example: 16
+            balances:
+              type: array
+              items:
+                type: object
+                properties:
+                  work_order_id:
+                    type: string
+                    example: "WO0000001"
+                  station_number:
+                    type: string
+                    example: "1"
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_supplied:
+                    type: number
+                    example: 16
+      400:
+        description: Invalid query parameters
+      500:
+        description: Server error
+    """
+    try:
+        as_of = (
+            parse_timestamp(request.args["as_of"])
+            if "as_of" in request.args
+            else datetime.utcnow()
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid as_of parameter"}), 400
+
+    work_order_id = request.args.get("work_order_id")
+    if work_order_id is not None:
+        if not work_order_id.startswith("WO") or not work_order_id[2:].isdigit():
+            return jsonify({"error": "Invalid work_order_id format"}), 400
+        work_order_id = parse_work_order_id(work_order_id)
+
+    response = get_ledger_balances(
+        as_of,
+        work_order_id=work_order_id,
+        station_number=request.args.get("station_number"),
+        part_number=request.args.get("part_number"),
+    )
+    return response
+
+
+@warehouse_bp.post("/queue/claim")
+@token_required
+@validate_body(QUEUE_CLAIM)
+def claim_queue(body):
+    """
+    Claim Pending Part Requests
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: Claim the oldest pending part requests for picking
+    description: |
+      Leases up to `limit` pending part requests to the calling user. Requests
+      locked by other pickers are skipped, so many warehouse clients can claim
+      concurrently without blocking each other or picking the same request twice.
+      Requests whose lease expired without completion go back into the queue.
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            limit:
+              type: integer
+              minimum: 1
+              maximum: 50
+              example: 5
+              description: Maximum number of requests to claim (default 1)
+            lease_seconds:
+              type: integer
+              minimum: 1
+              example: 300
+              description: How long the claim is held before it returns to the queue
+    responses:
+      200:
+        description: Claimed requests, oldest first (empty when the queue is empty)
+        schema:
+          type: object
+          properties:
+            requests:
+              type: array
+              items:
+                type: object
+                properties:
+                  request_id:
+                    type: integer
+                    example: 12
+                  work_order_id:
+                    type: string
+                    example: "WO0000001"
+                  station_number:
+                    type: string
+                    example: "1"
+                  part_number:
+                    type: string
+                    example: "200-00001"
+                  quantity_requested:
+                    type: number
+                    example: 4
+                  request_date:
+                    type: string
+                    example: "2025-07-20T10:15:00"
+                  lease_expires_at:
+                    type: string
+                    example: "2025-07-20T10:20:00"
+      400:
+        description: Invalid limit or lease_seconds
+      500:
+        description: Server error
+    """
+    response = claim_part_requests(
+        request.user["user_id"], body["limit"], body["lease_seconds"]
+    )
+    return response
+
+
+@warehouse_bp.post("/queue/<int:request_id>/complete")
+@token_required
+@validate_body(QUEUE_COMPLETE)
+def complete_queue_request(request_id, body):
+    """
+    Complete a Claimed Part Request
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: Record the dispatch for a claimed request and mark it fulfilled
+    description: |
+      Inserts the matching PartSupplyLog row and links it to the request in the
+      same transaction. Only the user currently holding the claim can complete it.
+    consumes:
+      - application/json
+    parameters:
+      - name: request_id
+        in: path
+        required: true
+        type: integer
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            quantity_supplied:
+              type: number
+              example: 4
+              description: Quantity dispatched (defaults to the quantity requested)
+    responses:
+      201:
+        description: Request fulfilled and dispatch logged
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Part request fulfilled
+            request_id:
+              type: integer
+              example: 12
+            supply_id:
+              type: integer
+              example: 101
+            quantity_supplied:
+              type: number
+              example: 4
+      400:
+        description: Invalid quantity_supplied
+      409:
+        description: The request is not claimed by the caller, its lease expired, or it is already done
+      500:
+        description: Server error
+    """
+    response = complete_part_request(
+        request_id, request.user["user_id"], body["quantity_supplied"]
+    )
+    return response
+
+
+@warehouse_bp.post("/queue/<int:request_id>/release")
+@token_required
+def release_queue_request(request_id):
+    """
+    Release a Claimed Part Request
+    ---
+    security:
+      - Bearer: []
+    tags:
+      - Warehouse
+    summary: Give a claimed request back to the queue without fulfilling it
+    parameters:
+      - name: request_id
+        in: path
+        required: true
+        type: integer
+    responses:
+      200:
+        description: Request returned to the pending queue
+      409:
+        description: The request is not claimed by the caller
+      500:
+        description: Server error
+    """
+    response = release_part_request(request_id, request.user["user_id"])
     return response
@@ -1,4 +1,4 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, jsonify
 from app.models.work_order_model import (
     retrieve_work_orders,
     retrieve_units_by_work_order_id,
@@ -7,7 +7,9 @@ from app.models.work_order_model import (
     post_comment,
 )
 from ..utils.jwt_helper import token_required
-from ..utils.validators import validate_part_number, validate_work_order_id
+from ..utils.idempotency import idempotent
+from ..utils.validators import validate_body, validate_work_order_id
+from ..utils.schemas import WORK_ORDER
 
 work_orders_bp = Blueprint("work_orders", __name__)
 
@@ -86,6 +88,7 @@ def get_work_order_by_id(work_order_id):
       Returns an array of units belonging to a specific work order.
       Each unit contains its associated stations, statuses, comments, and part requirements.
       Also includes a flag indicating whether the overall work order is completed.
+      Archived work orders are served from their stored snapshot.
     parameters:
       - name: work_order_id
         in: path
@@ -150,6 +153,8 @@ def get_work_order_by_id(work_order_id):
             error:
               type: string
               example: "Invalid work order ID format"
+      404:
+        description: Work order not found
       500:
         description: Server error
         schema:
@@ -170,8 +175,9 @@ def get_work_order_by_id(work_order_id):
 
 @work_orders_bp.post("/create_workorder")
 @token_required
-@validate_part_number
-def create_work_order():
+@idempotent
+@validate_body(WORK_ORDER)
+def create_work_order(body):
     """
     Create a New Work Order
     ---
@@ -180,9 +186,19 @@ def create_work_order():
     tags:
       - Work Orders
     summary: Create a new work order and initialize required parts and statuses.
+    description: |
+      When WORK_ORDER_ASYNC_QUANTITY is set (it is off by default), orders of
+      at least that many units are created by a background job instead: the
+      response is 202 with the job ID, and GET /api/jobs/{job_id} reports the
+      work order ID once a `flask jobs work` worker has run it.
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Retries with the same key replay the original response instead of writing again
       - in: body
         name: body
         required: true
@@ -197,6 +213,7 @@ def create_work_order():
               example: "100-00001"
             quantity:
               type: integer
+              minimum: 1
               example: 10
     responses:
       201:
@@ -210,13 +227,30 @@ def create_work_order():
             work_order_id:
               type: string
               example: WO0000001
+      202:
+        description: Large work order queued
+        headers:
+          Location:
+            type: string
+            description: Job status URL
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Work order queued
+            job_id:
+              type: integer
+              example: 42
+            status_url:
+              type: string
+              example: /api/jobs/42
       400:
         description: Bad request (e.g. missing fields or invalid format)
       500:
         description: Server error
     """
-    data = request.get_json()
-    response = add_work_order(data)
+    response = add_work_order(body, request.user["user_id"])
     return response
 
 
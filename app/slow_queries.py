@@ -0,0 +1,130 @@
+import logging
+import random
+import re
+from collections import deque
+from datetime import datetime, timezone
+import psycopg2
+from app.config import Config
+from app.db import query_observers
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = re.compile(rb"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|VALUES)\b", re.I)
+# EXPLAIN ANALYZE runs the statement again, so only these plain reads get it;
+# everything else only gets its estimated plan.
+ANALYZE_QUERIES = frozenset(
+    {
+        "GET_ALL_WORK_ORDERS_SUMMARY",
+        "GET_WORK_ORDER_BY_ID",
+        "GET_ARCHIVED_WORK_ORDER",
+        "GET_ALL_PRODUCTS",
+        "GET_ALL_NEEDED_PARTS",
+        "GET_DISPATCH_HISTORY",
+        "GET_LEDGER_BALANCES",
+        "GET_JOB",
+    }
+)
+# Statements whose parameters carry emails or password hashes
+REDACTED_QUERIES = frozenset(
+    {"INSERT_NEW_USER", "LOGIN_USER", "UPDATE_PASSWORD_HASH", "UPSERT_OAUTH_USER"}
+)
+MAX_PARAMS_LENGTH = 500
+
+
+def explain(cursor, analyze):
+    statement = cursor.query
+    if not statement or not _EXPLAINABLE.match(statement):
+        return None
+    options = b"ANALYZE, BUFFERS, FORMAT JSON" if analyze else b"FORMAT JSON"
+
+    # A plain cursor on the same connection and transaction, so the plan sees
+    # the same data and is not itself observed. The savepoint keeps a failed
+    # EXPLAIN from aborting the caller's transaction.
+    conn = cursor.connection
+    in_transaction = not conn.autocommit
+    with conn.cursor() as explain_cursor:
+        if in_transaction:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(b"EXPLAIN (" + options + b") " + statement)
+            plan = explain_cursor.fetchone()[0]
+        except psycopg2.Error as e:
+            if in_transaction:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return {"error": str(e).strip()}
+        if in_transaction:
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    return {"analyze": analyze, "plan": plan}
+
+
+class SlowQueryLog:
+    """Statements slower than a threshold, newest last, in a ring buffer.
+
+    Registered as an app.db query observer; a sampled share of the entries
+    also get the statement's EXPLAIN, captured right after it ran.
+    """
+
+    def __init__(self, threshold_ms, explain_rate, size, log_params):
+        self.threshold = threshold_ms / 1000
+        self.explain_rate = explain_rate
+        self.log_params = log_params
+        self.entries = deque(maxlen=size)
+
+    def __call__(self, name, seconds, cursor, error):
+        if seconds < self.threshold:
+            return
+
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "query": name,
+            "duration_ms": round(seconds * 1000, 2),
+            "rows": None,
+            "params": None,
+            "error": str(error).strip() if error is not None else None,
+            "explain": None,
+        }
+        if cursor is not None:
+            entry["rows"] = cursor.rowcount
+            # Unnamed statements could carry anything, so they never log
+            # parameters (or their text, which has the parameters bound in).
+            if (
+                self.log_params
+                and cursor.params is not None
+                and name != "other"
+                and name not in REDACTED_QUERIES
+            ):
+                entry["params"] = repr(cursor.params)[:MAX_PARAMS_LENGTH]
+            if (
+                error is None
+                and self.explain_rate
+                and random.random() < self.explain_rate
+            ):
+                entry["explain"] = explain(cursor, name in ANALYZE_QUERIES)
+
+        self.entries.append(entry)
+        logger.warning(
+            "slow query %s: %.1fms, %s rows, params %s",
+            name,
+            entry["duration_ms"],
+            entry["rows"],
+            entry["params"],
+        )
+
+    def recent(self, limit):
+        return list(reversed(self.entries))[:limit]
+
+    def clear(self):
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    Config.SLOW_QUERY_MS,
+    Config.SLOW_QUERY_EXPLAIN_RATE,
+    Config.SLOW_QUERY_BUFFER_SIZE,
+    Config.SLOW_QUERY_LOG_PARAMS,
+)
+
+
+def init_slow_query_log(app):
+    if slow_query_log not in query_observers:
+        query_observers.append(slow_query_log)
@@ -0,0 +1,136 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from app.config import Config
+
+
+class HashingBusyError(Exception):
+    pass
+
+
+def _admission_limit():
+    # The request thread waits for its hash, so admitting as many sign-ins as
+    # there are request threads would leave none for other requests. The DB
+    # pool is sized to the worker's request threads; keep one of them free.
+    return Config.BCRYPT_MAX_IN_FLIGHT or max(1, Config.DB_POOL_SIZE - 1)
+
+
+def _gevent_patched():
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+_stats_lock = None
+_stats = {"queued": 0, "active": 0, "completed": 0, "rejected": 0}
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+_workers = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if _gevent_patched():
+                    # Patched ThreadPoolExecutor threads are greenlets, and
+                    # bcrypt would block the hub. gevent's pool runs native
+                    # threads and its futures wait cooperatively.
+                    from gevent.threadpool import ThreadPoolExecutor as executor
+                else:
+                    executor = ThreadPoolExecutor
+                _executor = executor(max_workers=_workers, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def reset_hashing_pool():
+    # Worker threads do not survive fork(); call from gunicorn's post_fork,
+    # and again once gevent has patched threading.
+    # bcrypt releases the GIL, so a small dedicated pool bounds how many cores
+    # password work can take. Sign-ins beyond the admission limit are
+    # rejected right away instead of taking the worker's last request threads.
+    global _executor, _slots, _workers, _stats_lock
+    limit = _admission_limit()
+    _executor = None
+    _slots = threading.BoundedSemaphore(limit)
+    _workers = min(Config.BCRYPT_WORKERS or os.cpu_count() or 2, limit)
+    # Taken from the pool threads too, which are native under gevent.
+    if _gevent_patched():
+        from gevent.monkey import get_original
+
+        _stats_lock = get_original("threading", "Lock")()
+    else:
+        _stats_lock = threading.Lock()
+
+
+reset_hashing_pool()
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise HashingBusyError("Password hashing queue is full")
+
+    def task():
+        with _stats_lock:
+            _stats["queued"] -= 1
+            _stats["active"] += 1
+        try:
+            return fn(*args)
+        finally:
+            with _stats_lock:
+                _stats["active"] -= 1
+                _stats["completed"] += 1
+
+    # The slot is released by the caller, whose lock it is under gevent.
+    try:
+        with _stats_lock:
+            _stats["queued"] += 1
+        try:
+            future = _get_executor().submit(task)
+        except Exception:
+            with _stats_lock:
+                _stats["queued"] -= 1
+            raise
+        return future.result()
+    finally:
+        _slots.release()
+
+
+def _hash(password):
+    return bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+    ).decode("utf-8")
+
+
+def _check(password, stored_hash):
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash, e.g. the "-" placeholder of Google sign-in users
+        return False
+
+
+def hash_password(password):
+    return _run(_hash, password)
+
+
+def verify_password(password, stored_hash):
+    return _run(_check, password, stored_hash)
+
+
+def needs_rehash(stored_hash):
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    parts = stored_hash.split("$")
+    return (
+        len(parts) == 4 and parts[2].isdigit() and int(parts[2]) != Config.BCRYPT_ROUNDS
+    )
+
+
+def hashing_stats():
+    with _stats_lock:
+        return dict(_stats, workers=_workers)
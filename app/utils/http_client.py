@@ -0,0 +1,140 @@
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.config import Config
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    """Fails calls fast after repeated upstream failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls raise immediately for ``reset_timeout`` seconds. The first call
+    after that is let through as a trial: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            retry_in = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if retry_in > 0 or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"Circuit open, retry in {max(retry_in, 0):.0f}s"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_lock = threading.Lock()
+_session = None
+_breakers = {}
+
+
+def build_session():
+    # Connection errors are retried for every method because the request never
+    # reached the provider; read errors only for GET, since replaying a token
+    # exchange would spend the single-use authorization code twice.
+    retry = Retry(
+        total=Config.OAUTH_MAX_RETRIES,
+        connect=Config.OAUTH_MAX_RETRIES,
+        read=Config.OAUTH_MAX_RETRIES,
+        status=0,
+        allowed_methods=frozenset({"GET"}),
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=Config.OAUTH_POOL_SIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_breaker(url):
+    host = urlparse(url).netloc
+    with _lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                Config.OAUTH_BREAKER_FAILURES, Config.OAUTH_BREAKER_RESET_SECONDS
+            )
+        return breaker
+
+
+def reset_http_client():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _breakers.clear()
+
+
+def provider_request(method, url, **kwargs):
+    breaker = get_breaker(url)
+    breaker.before_call()
+
+    kwargs.setdefault(
+        "timeout",
+        (Config.OAUTH_CONNECT_TIMEOUT_SECONDS, Config.OAUTH_READ_TIMEOUT_SECONDS),
+    )
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        breaker.record_failure()
+        raise
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+from functools import wraps
+from flask import request, jsonify, make_response, Response
+from app.config import Config
+from app.models.idempotency_model import (
+    reserve_idempotency_key,
+    save_idempotent_response,
+    release_idempotency_key,
+)
+
+MAX_KEY_LENGTH = 255
+
+logger = logging.getLogger(__name__)
+
+
+# Replays the stored response when a POST is retried with the same
+# Idempotency-Key header. Apply below token_required so keys are scoped to the
+# caller. Requests without the header are handled as usual.
+def idempotent(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return f(*args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": "Idempotency-Key is too long"}), 400
+
+        user_id = getattr(request, "user", {}).get("user_id")
+        key_hash = hashlib.sha256(
+            f"{user_id}\x00{request.method} {request.path}\x00{key}".encode("utf-8")
+        ).digest()
+        request_hash = hashlib.sha256(request.get_data()).digest()
+
+        try:
+            stored = reserve_idempotency_key(
+                key_hash, request_hash, Config.IDEMPOTENCY_LEASE_SECONDS
+            )
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+        if stored is None:
+            return _in_progress()
+
+        reserved, stored_request_hash, status_code, response_body = stored
+        if not reserved:
+            if bytes(stored_request_hash) != request_hash:
+                return (
+                    jsonify(
+                        {
+                            "error": "Idempotency-Key was already used for another request"
+                        }
+                    ),
+                    422,
+                )
+            if status_code is None:
+                return _in_progress()
+
+            replay = Response(
+                response_body, status=status_code, mimetype="application/json"
+            )
+            replay.headers["Idempotent-Replayed"] = "true"
+            return replay
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            release_idempotency_key(key_hash)
+            raise
+
+        try:
+            if response.status_code >= 500:
+                # Let the client retry failed writes with the same key
+                release_idempotency_key(key_hash)
+            else:
+                save_idempotent_response(
+                    key_hash,
+                    response.status_code,
+                    response.get_data(as_text=True),
+                    Config.IDEMPOTENCY_TTL_SECONDS,
+                )
+        except Exception:
+            # The reservation lapses after IDEMPOTENCY_LEASE_SECONDS and a
+            # retry runs the request again.
+            logger.exception("Failed to store the response for an Idempotency-Key")
+
+        return response
+
+    return decorated
+
+
+def _in_progress():
+    response = jsonify({"error": "A request with this Idempotency-Key is in progress"})
+    response.status_code = 409
+    response.headers["Retry-After"] = "1"
+    return response
@@ -1,25 +1,50 @@
+import hashlib
 import jwt
 from flask import request, jsonify
 from app.config import Config
+from app.utils.cache import TTLCache
 from functools import wraps
 
+# Verified claims keyed by token digest. Entries expire at the token's own
+# exp (or after JWT_CACHE_TTL_SECONDS, whichever is sooner), after which the
+# token goes through full verification again and gets the usual errors.
+_token_cache = TTLCache(Config.JWT_CACHE_SIZE, ttl=Config.JWT_CACHE_TTL_SECONDS)
+
+
+def decode_token(token):
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = _token_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+        _token_cache.set(key, claims, expires_at=claims.get("exp"))
+    return dict(claims)
+
+
+def token_cache_stats():
+    return _token_cache.stats()
+
+
+def request_token():
+    token = request.cookies.get("authToken")
+    if not token:
+        auth_header = request.headers.get("Authorization", None)
+        if auth_header:
+            parts = auth_header.split()
+            if len(parts) == 2 and parts[0].lower() == "bearer":
+                token = parts[1]
+    return token
+
 
 def token_required(f):
 
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.cookies.get("authToken")
-        if not token:
-            auth_header = request.headers.get("Authorization", None)
-            if auth_header:
-                parts = auth_header.split()
-                if len(parts) == 2 and parts[0].lower() == "bearer":
-                    token = parts[1]
+        token = request_token()
         if not token:
             return jsonify({"error": "Authentication token is missing"}), 401
 
         try:
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+            data = decode_token(token)
             request.user = data  # optional: set the user info in request for later use
         except jwt.ExpiredSignatureError:
             return jsonify({"error": "Token has expired"}), 401
@@ -29,3 +54,14 @@ def token_required(f):
         return f(*args, **kwargs)
 
     return decorated
+
+
+def admin_required(f):
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if request.user.get("account_type") != "admin":
+            return jsonify({"error": "Admin access required"}), 403
+        return f(*args, **kwargs)
+
+    return token_required(decorated)
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+import requests
+from app.config import Config
+from app.utils.http_client import provider_request
+
+
+class DiscoveryUnavailableError(Exception):
+    pass
+
+
+# The provider document is fetched on first use rather than at import, kept
+# for as long as the provider's cache headers allow, and mirrored to a local
+# file so a restart during an outage can still start logins.
+_lock = threading.Lock()
+_state = {"config": None, "etag": None, "expires_at": 0.0}
+
+
+def get_provider_config():
+    if _state["config"] is not None and _state["expires_at"] > time.time():
+        return _state["config"]
+
+    with _lock:
+        if _state["config"] is not None and _state["expires_at"] > time.time():
+            return _state["config"]
+        _refresh()
+        return _state["config"]
+
+
+def clear_provider_config():
+    with _lock:
+        _state.update(config=None, etag=None, expires_at=0.0)
+
+
+def _refresh():
+    url = Config.GOOGLE_DISCOVERY_URL
+    try:
+        if url.startswith("file://"):
+            with open(url2pathname(urlparse(url).path), encoding="utf-8") as f:
+                config, etag, ttl = (
+                    json.load(f),
+                    None,
+                    Config.OIDC_DISCOVERY_TTL_SECONDS,
+                )
+        else:
+            config, etag, ttl = _fetch(url)
+            _write_fallback(config)
+    except (requests.RequestException, ValueError, OSError) as e:
+        print(f"[OIDC] Discovery failed, using cached configuration: {e}")
+        config = _state["config"] or _read_fallback()
+        if config is None:
+            raise DiscoveryUnavailableError(str(e)) from e
+        etag, ttl = _state["etag"], Config.OIDC_DISCOVERY_RETRY_SECONDS
+
+    _state.update(
+        config=config,
+        etag=etag,
+        expires_at=time.time() + max(ttl, Config.OIDC_DISCOVERY_RETRY_SECONDS),
+    )
+
+
+def _fetch(url):
+    headers = {}
+    if _state["config"] is not None and _state["etag"]:
+        headers["If-None-Match"] = _state["etag"]
+
+    response = provider_request("GET", url, headers=headers)
+    if response.status_code == 304:
+        return _state["config"], _state["etag"], _cache_ttl(response)
+
+    response.raise_for_status()
+    config = response.json()
+    for key in ("authorization_endpoint", "token_endpoint", "userinfo_endpoint"):
+        if key not in config:
+            raise ValueError(f"Discovery document is missing {key}")
+    return config, response.headers.get("ETag"), _cache_ttl(response)
+
+
+def _cache_ttl(response):
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        name = name.lower()
+        if name in ("no-store", "no-cache"):
+            return 0
+        if name == "max-age" and value.isdigit():
+            return int(value)
+
+    expires = response.headers.get("Expires")
+    if expires:
+        try:
+            return max(0, parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0
+
+    return Config.OIDC_DISCOVERY_TTL_SECONDS
+
+
+def _write_fallback(config):
+    path = Config.OIDC_DISCOVERY_CACHE_FILE
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[OIDC] Could not write discovery cache file: {e}")
+
+
+def _read_fallback():
+    try:
+        with open(Config.OIDC_DISCOVERY_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,285 @@
+import re
+from datetime import datetime, timezone
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import best_match
+from app.config import Config
+
+MAX_BATCH_LINES = 200
+
+WORK_ORDER_ID = {"type": "string", "pattern": "^WO[0-9]+$"}
+STATION_NUMBER = {"type": "string", "minLength": 1}
+PART_NUMBER = {"type": "string", "pattern": "^[0-9]{3}-[0-9]{5}$"}
+QUANTITY = {"type": "number", "exclusiveMinimum": 0}
+USER_ID = {"type": "integer"}
+
+
+def parse_work_order_id(work_order_id):
+    return int(work_order_id[2:])
+
+
+def parse_timestamp(value):
+    """ISO 8601 to the naive UTC datetimes the TIMESTAMP columns hold."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _with_work_order_id(body):
+    return dict(body, work_order_id=parse_work_order_id(body["work_order_id"]))
+
+
+class RequestSchema:
+    """A JSON schema checked once at import and compiled to plain Python.
+
+    ``error`` runs the compiled check, which covers the small keyword subset
+    the request schemas use, and returns None for a valid body. jsonschema
+    only runs when a body fails, to build the message for the best-matching
+    violation. ``convert`` turns the validated body into the values the
+    models take.
+    """
+
+    def __init__(self, schema, convert=None):
+        Draft7Validator.check_schema(schema)
+        self.schema = schema
+        self.validator = Draft7Validator(schema)
+        self.check = _compile(schema)
+        self.convert = convert or dict
+
+    def error(self, instance):
+        if self.check(instance):
+            return None
+
+        error = best_match(self.validator.iter_errors(instance))
+        if error is None:
+            # The compiled check and jsonschema disagree; reject the body
+            # rather than let it through.
+            return "Invalid request body"
+
+        location = ""
+        for part in error.absolute_path:
+            location += f"[{part}]" if isinstance(part, int) else f".{part}"
+        if error.validator == "required":
+            return f"Missing field: {error.message}"
+        if location:
+            return f"Invalid {location.lstrip('.')}: {error.message}"
+        return f"Invalid request body: {error.message}"
+
+
+_TYPE_CHECKS = {
+    "object": "type({v}) is dict",
+    "array": "type({v}) is list",
+    "string": "type({v}) is str",
+    "boolean": "type({v}) is bool",
+    "null": "{v} is None",
+    "integer": "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+    "number": "type({v}) in (int, float)",
+}
+
+
+def _compile(schema):
+    # Emit one straight-line function per schema, the way fastjsonschema
+    # does, so a valid body costs a handful of type and dict checks.
+    lines = ["def check(v0):"]
+    namespace = {}
+    _emit(schema, "v0", 1, lines, namespace)
+    lines.append("    return True")
+    exec("\n".join(lines), namespace)
+    return namespace["check"]
+
+
+def _emit(schema, var, depth, lines, namespace):
+    indent = "    " * depth
+    types = schema.get("type")
+    if types is None:
+        raise ValueError("Compiled schemas must declare a type at every level")
+    if isinstance(types, str):
+        types = [types]
+    elif len(types) != 2 or "null" not in types:
+        raise ValueError("Compiled schemas only combine a type with null")
+
+    check = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in types)
+    lines.append(f"{indent}if not ({check}):")
+    lines.append(f"{indent}    return False")
+    if "null" in types and len(schema) > 1:
+        # Every other keyword applies to the non-null type only
+        lines.append(f"{indent}if {var} is not None:")
+        indent += "    "
+        depth += 1
+
+    for keyword, value in schema.items():
+        if keyword == "type":
+            continue
+        elif keyword == "pattern":
+            name = f"_pattern{len(namespace)}"
+            namespace[name] = re.compile(value).search
+            check = f"{name}({var})"
+        elif keyword == "minLength" or keyword == "minItems":
+            check = f"len({var}) >= {value!r}"
+        elif keyword == "maxItems":
+            check = f"len({var}) <= {value!r}"
+        elif keyword == "exclusiveMinimum":
+            check = f"{var} > {value!r}"
+        elif keyword == "minimum":
+            check = f"{var} >= {value!r}"
+        elif keyword == "maximum":
+            check = f"{var} <= {value!r}"
+        elif keyword == "required":
+            check = " and ".join(f"{key!r} in {var}" for key in value)
+        elif keyword == "properties":
+            for key, subschema in value.items():
+                item = f"v{len(lines)}"
+                lines.append(f"{indent}if {key!r} in {var}:")
+                lines.append(f"{indent}    {item} = {var}[{key!r}]")
+                _emit(subschema, item, depth + 1, lines, namespace)
+            continue
+        elif keyword == "items":
+            item = f"v{len(lines)}"
+            lines.append(f"{indent}for {item} in {var}:")
+            _emit(value, item, depth + 1, lines, namespace)
+            continue
+        else:
+            raise ValueError(f"Unsupported schema keyword: {keyword}")
+
+        lines.append(f"{indent}if not ({check}):")
+        lines.append(f"{indent}    return False")
+
+
+PART_REQUEST = RequestSchema(
+    {
+        "type": "object",
+        "required": [
+            "work_order_id",
+            "station_number",
+            "part_number",
+            "quantity_requested",
+            "requested_by",
+        ],
+        "properties": {
+            "work_order_id": WORK_ORDER_ID,
+            "station_number": STATION_NUMBER,
+            "part_number": PART_NUMBER,
+            "quantity_requested": QUANTITY,
+            "requested_by": USER_ID,
+        },
+    },
+    convert=_with_work_order_id,
+)
+
+PART_REQUEST_BATCH = RequestSchema(
+    {
+        "type": "object",
+        "required": ["work_order_id", "station_number", "requested_by", "parts"],
+        "properties": {
+            "work_order_id": WORK_ORDER_ID,
+            "station_number": STATION_NUMBER,
+            "requested_by": USER_ID,
+            "parts": {
+                "type": "array",
+                "minItems": 1,
+                "maxItems": MAX_BATCH_LINES,
+                "items": {
+                    "type": "object",
+                    "required": ["part_number", "quantity_requested"],
+                    "properties": {
+                        "part_number": PART_NUMBER,
+                        "quantity_requested": QUANTITY,
+                    },
+                },
+            },
+        },
+    },
+    convert=_with_work_order_id,
+)
+
+DISPATCH = RequestSchema(
+    {
+        "type": "object",
+        "required": [
+            "work_order_id",
+            "station_number",
+            "part_number",
+            "quantity_supplied",
+        ],
+        "properties": {
+            "work_order_id": WORK_ORDER_ID,
+            "station_number": STATION_NUMBER,
+            "part_number": PART_NUMBER,
+            "quantity_supplied": QUANTITY,
+        },
+    },
+    convert=_with_work_order_id,
+)
+
+DISPATCH_BATCH = RequestSchema(
+    {
+        "type": "object",
+        "required": ["lines"],
+        "properties": {
+            "lines": {
+                "type": "array",
+                "minItems": 1,
+                "maxItems": MAX_BATCH_LINES,
+                "items": DISPATCH.schema,
+            },
+        },
+    },
+    convert=lambda body: {"lines": [_with_work_order_id(l) for l in body["lines"]]},
+)
+
+STATION_COMMENT = RequestSchema(
+    {
+        "type": "object",
+        "required": ["work_order_id", "station_number", "comment"],
+        "properties": {
+            "work_order_id": WORK_ORDER_ID,
+            "station_number": STATION_NUMBER,
+            "comment": {"type": "string"},
+        },
+    },
+    convert=_with_work_order_id,
+)
+
+WORK_ORDER = RequestSchema(
+    {
+        "type": "object",
+        "required": ["product_number", "quantity"],
+        "properties": {
+            "product_number": PART_NUMBER,
+            "quantity": {"type": "integer", "minimum": 1},
+        },
+    },
+    convert=lambda body: {
+        "product_number": body["product_number"],
+        "quantity": int(body["quantity"]),
+    },
+)
+
+# The queue endpoints take an optional body; a missing one means defaults.
+QUEUE_CLAIM = RequestSchema(
+    {
+        "type": ["object", "null"],
+        "properties": {
+            "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+            "lease_seconds": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": Config.PICK_LEASE_MAX_SECONDS,
+            },
+        },
+    },
+    convert=lambda body: {
+        "limit": int((body or {}).get("limit", 1)),
+        "lease_seconds": int(
+            (body or {}).get("lease_seconds", Config.PICK_LEASE_SECONDS)
+        ),
+    },
+)
+
+QUEUE_COMPLETE = RequestSchema(
+    {
+        "type": ["object", "null"],
+        "properties": {"quantity_supplied": QUANTITY},
+    },
+    convert=lambda body: {"quantity_supplied": (body or {}).get("quantity_supplied")},
+)
@@ -2,6 +2,13 @@ from functools import wraps
 from flask import request, jsonify
 import re
 
+PART_NUMBER_RE = re.compile(r"^\d{3}-\d{5}$")
+EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+UPPERCASE_RE = re.compile(r"[A-Z]")
+LOWERCASE_RE = re.compile(r"[a-z]")
+DIGIT_RE = re.compile(r"\d")
+SPECIAL_RE = re.compile(r"[!@#$%^&*()_+=\-{}\[\]:;\"'<>,.?/\\|~`]")
+
 
 def validate_part_number(f):
     @wraps(f)
@@ -12,7 +19,7 @@ def validate_part_number(f):
         else:
             part_number = data["part_number"]
 
-        if not part_number or not re.match(r"^\d{3}-\d{5}$", part_number):
+        if not part_number or not PART_NUMBER_RE.match(part_number):
             return jsonify({"error": "Invalid part_number format"}), 400
         return f(*args, **kwargs)
 
@@ -24,7 +31,7 @@ def validate_email(f):
     def decorated(*args, **kwargs):
         data = request.get_json() or {}
         email = data["email"]
-        if not email or not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):
+        if not email or not EMAIL_RE.match(email):
             return jsonify({"error": "Invalid email format"}), 400
         return f(*args, **kwargs)
 
@@ -61,7 +68,7 @@ def validate_password(f):
         if len(password) < 8:
             return jsonify({"error": "Password must be at least 8 characters"}), 400
 
-        if not re.search(r"[A-Z]", password):
+        if not UPPERCASE_RE.search(password):
             return (
                 jsonify(
                     {"error": "Password must contain at least one uppercase letter"}
@@ -69,7 +76,7 @@ def validate_password(f):
                 400,
             )
 
-        if not re.search(r"[a-z]", password):
+        if not LOWERCASE_RE.search(password):
             return (
                 jsonify(
                     {"error": "Password must contain at least one lowercase letter"}
@@ -77,10 +84,10 @@ def validate_password(f):
                 400,
             )
 
-        if not re.search(r"\d", password):
+        if not DIGIT_RE.search(password):
             return jsonify({"error": "Password must contain at least one digit"}), 400
 
-        if not re.search(r"[!@#$%^&*()_+=\-{}\[\]:;\"'<>,.?/\\|~`]", password):
+        if not SPECIAL_RE.search(password):
             return (
                 jsonify(
                     {"error": "Password must contain at least one special character"}
@@ -104,3 +111,20 @@ def validate_company(f):
         return f(*args, **kwargs)
 
     return decorated
+
+
+def validate_body(schema):
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            data = request.get_json(silent=True)
+            error = schema.error(data)
+            if error:
+                return jsonify({"error": error}), 400
+
+            kwargs["body"] = schema.convert(data)
+            return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
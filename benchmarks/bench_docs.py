@@ -0,0 +1,94 @@
+"""Startup time and memory of a worker per API_DOCS mode.
+
+Each run is a fresh interpreter, as a gunicorn worker (or the preloading
+master) would be: it imports the app, calls create_app and then serves
+/apispec_1.json once. Reported are the medians of --runs runs:
+
+    python -m benchmarks.bench_docs --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from app.docs import build_api_spec, write_api_spec
+
+MODES = ("off", "static", "dynamic")
+
+RUN = """
+import json
+import time
+
+
+def rss_mib():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+
+started = time.perf_counter()
+from app import create_app
+
+app = create_app()
+startup = time.perf_counter() - started
+rss_startup = rss_mib()
+
+client = app.test_client()
+started = time.perf_counter()
+client.get("/apispec_1.json")
+first_spec = time.perf_counter() - started
+
+print(json.dumps({
+    "startup_ms": startup * 1000,
+    "rss_startup_mib": rss_startup,
+    "first_spec_ms": first_spec * 1000,
+    "rss_after_spec_mib": rss_mib(),
+}))
+"""
+
+
+def run(mode, spec_path):
+    env = dict(os.environ, API_DOCS=mode, API_SPEC_PATH=spec_path)
+    result = subprocess.run(
+        [sys.executable, "-c", RUN],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_path = os.path.join(tmp, "apispec.json")
+        write_api_spec(build_api_spec(), spec_path)
+
+        print(
+            f"{'API_DOCS':<10} {'startup':>10} {'RSS':>10} "
+            f"{'1st spec':>10} {'RSS after':>10}"
+        )
+        for mode in MODES:
+            runs = [run(mode, spec_path) for _ in range(args.runs)]
+
+            def median(key):
+                return statistics.median(r[key] for r in runs)
+
+            print(
+                f"{mode:<10} {median('startup_ms'):8.0f}ms "
+                f"{median('rss_startup_mib'):6.1f}MiB "
+                f"{median('first_spec_ms'):8.1f}ms "
+                f"{median('rss_after_spec_mib'):6.1f}MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Per-row cost of the model functions that turn query rows into responses.
+
+Each case runs a model function end to end (tuple unpacking, dict building
+and jsonify) against a fake connection whose cursor returns N synthetic rows,
+and reports time and peak allocated bytes per row. Times are also expressed
+relative to a fixed reference loop run on the same machine, which is what
+--check compares against the committed baseline, so a slower CI runner does
+not read as a regression:
+
+    python -m benchmarks.bench_models --check
+    python -m benchmarks.bench_models --update   # after an intended change
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from app import create_app
+from app.models import parts_model, work_order_model
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_models_baseline.json")
+STATIONS = 13
+
+
+class FakeCursor:
+    def __init__(self, rows, description):
+        self.rows = rows
+        self.description = description
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeConnection:
+    def __init__(self, rows, columns=()):
+        self.rows = rows
+        self.description = [(column,) for column in columns]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.rows, self.description)
+
+
+def work_order_summary_rows(n):
+    return [
+        (
+            i,
+            f"WO{i:07d}",
+            "100-00001",
+            50,
+            Decimal(1200),
+            Decimal(i % 1200),
+            False,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def unit_rows(n):
+    return [
+        (
+            i // STATIONS + 1,
+            str(i % STATIONS + 1),
+            "in_progress",
+            f"300-{i % 26 + 1:05d}",
+            "Generated part",
+            Decimal(4),
+            Decimal(i % 5),
+            "in_progress",
+            None,
+            False,
+        )
+        for i in range(n)
+    ]
+
+
+def needed_part_rows(n):
+    return [
+        (
+            f"WO{i // 8 + 1:07d}",
+            f"300-{i % 26 + 1:05d}",
+            "Generated part",
+            Decimal(200),
+            Decimal(i % 200),
+        )
+        for i in range(n)
+    ]
+
+
+def part_request_row(n):
+    return [(n, 12, "1", "200-00001", Decimal(4), datetime(2026, 1, 1), "pending")]
+
+
+PART_REQUEST = {
+    "work_order_id": 12,
+    "station_number": "1",
+    "part_number": "200-00001",
+    "quantity_requested": 4,
+    "requested_by": 2,
+}
+
+
+# name -> (model module, call(n), make_rows(n), cursor columns, single_row).
+# add_part_request handles one row per call, so it is called n times.
+CASES = {
+    "retrieve_work_orders": (
+        work_order_model,
+        lambda n: work_order_model.retrieve_work_orders(),
+        work_order_summary_rows,
+        (),
+        False,
+    ),
+    "retrieve_units_by_work_order_id": (
+        work_order_model,
+        lambda n: work_order_model.retrieve_units_by_work_order_id(12),
+        unit_rows,
+        (),
+        False,
+    ),
+    "get_needed_parts": (
+        parts_model,
+        lambda n: parts_model.get_needed_parts(),
+        needed_part_rows,
+        (
+            "work_order",
+            "part_number",
+            "description",
+            "quantity_required",
+            "quantity_supplied",
+        ),
+        False,
+    ),
+    "add_part_request": (
+        parts_model,
+        lambda n: [parts_model.add_part_request(PART_REQUEST) for _ in range(n)],
+        part_request_row,
+        (),
+        True,
+    ),
+}
+
+
+def reference(rows):
+    # Fixed stand-in for a transform loop; only used to scale timings.
+    return json.dumps([{"a": a, "b": b, "c": float(c)} for a, b, c in rows])
+
+
+@contextmanager
+def fake_connection(module, conn):
+    original = module.connection
+    module.connection = conn
+    try:
+        yield
+    finally:
+        module.connection = original
+
+
+def run_once(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(rows, repeat):
+    app = create_app()
+    reference_rows = [(i, str(i), Decimal(i)) for i in range(rows)]
+    runs = {"reference": lambda: reference(reference_rows)}
+    for name, (module, call, make_rows, columns, single_row) in CASES.items():
+        conn = FakeConnection(make_rows(1 if single_row else rows), columns)
+        runs[name] = _bind(module, conn, call, rows)
+
+    with app.app_context():
+        allocations = {name: peak_bytes(fn) for name, fn in runs.items()}
+        # Round-robin over the cases and keep each one's best run, so a slow
+        # spell on a shared machine hits every case instead of one. GC is off
+        # while timing, as in timeit.
+        best = dict.fromkeys(runs, float("inf"))
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                for name, fn in runs.items():
+                    best[name] = min(best[name], run_once(fn))
+        finally:
+            gc.enable()
+
+    reference_seconds = best.pop("reference")
+    return {
+        name: {
+            "us_per_row": round(seconds / rows * 1e6, 3),
+            "relative": round(seconds / reference_seconds, 3),
+            "bytes_per_row": round(allocations[name] / rows, 1),
+        }
+        for name, seconds in best.items()
+    }
+
+
+def _bind(module, conn, call, rows):
+    def run():
+        with fake_connection(module, conn):
+            return call(rows)
+
+    return run
+
+
+def compare(results, baseline, time_threshold, memory_threshold):
+    failures = []
+    for name, current in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if current["relative"] > expected["relative"] * (1 + time_threshold):
+            failures.append(
+                f"{name}: {current['relative']:.2f}x the reference loop, "
+                f"baseline {expected['relative']:.2f}x"
+            )
+        if current["bytes_per_row"] > expected["bytes_per_row"] * (
+            1 + memory_threshold
+        ):
+            failures.append(
+                f"{name}: {current['bytes_per_row']:.0f} bytes per row, "
+                f"baseline {expected['bytes_per_row']:.0f}"
+            )
+    return failures
+
+
+def report(results):
+    print(f"{'case':<34} {'us/row':>8} {'vs ref':>7} {'bytes/row':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<34} {result['us_per_row']:>8.2f} {result['relative']:>7.2f} "
+            f"{result['bytes_per_row']:>10.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline")
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=0.5,
+        help="allowed slowdown relative to the baseline (0.5 = 50%%)",
+    )
+    parser.add_argument("--memory-threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = measure(args.rows, args.repeat)
+    report(results)
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Wrote {BASELINE_PATH}")
+
+    if args.check:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        thresholds = (args.time_threshold, args.memory_threshold)
+        failures = compare(results, baseline, *thresholds)
+        if failures:
+            # One noisy run on a shared runner should not fail the build.
+            print("Measuring again to rule out noise")
+            results = measure(args.rows, args.repeat)
+            report(results)
+            failures = compare(results, baseline, *thresholds)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare the per-request cost of the old stacked validators, validate_body
+(compiled check) and the jsonschema validator alone. Run with
+``python -m benchmarks.bench_validation``."""
+
+import timeit
+from flask import Flask, request
+from jsonschema.exceptions import best_match
+from app.utils.schemas import PART_REQUEST
+from app.utils.validators import (
+    validate_body,
+    validate_part_number,
+    validate_work_order_id,
+)
+
+BODY = {
+    "work_order_id": "WO0000012",
+    "station_number": "1",
+    "part_number": "200-00001",
+    "quantity_requested": 4,
+    "requested_by": 2,
+}
+
+
+@validate_work_order_id
+@validate_part_number
+def stacked_view():
+    data = request.get_json()
+    return int(data["work_order_id"][2:])
+
+
+@validate_body(PART_REQUEST)
+def schema_view(body):
+    return body["work_order_id"]
+
+
+def jsonschema_view():
+    # What validate_body cost when every body went through jsonschema
+    data = request.get_json()
+    if best_match(PART_REQUEST.validator.iter_errors(data)) is None:
+        return PART_REQUEST.convert(data)["work_order_id"]
+
+
+def bench(view, number):
+    # One request context for every call: get_json() caches the parsed body,
+    # so this measures the validation layer itself rather than Werkzeug.
+    app = Flask(__name__)
+    with app.test_request_context(method="POST", json=BODY):
+        request.get_json()
+        return min(timeit.repeat(view, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=100000):
+    for name, view in (
+        ("stacked decorators", stacked_view),
+        ("validate_body", schema_view),
+        ("jsonschema only", jsonschema_view),
+    ):
+        print(f"{name:<28} {bench(view, number):7.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Throughput of the gunicorn worker classes and the ASGI mode.
+
+Starts gunicorn with gunicorn.conf.py once per worker class (or uvicorn with
+asgi:app), drives it with keep-alive HTTP clients for a fixed time and prints
+requests/s and latency percentiles. Needs DATABASE_URL to point at a seeded
+database:
+
+    python -m benchmarks.bench_workers --path /api/workorders/ --concurrency 32
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+WORKER_CLASSES = ("sync", "gthread", "gevent", "uvicorn")
+
+
+def wait_until_up(port, deadline=15):
+    started = time.monotonic()
+    while time.monotonic() - started < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/apispec_1.json")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not start")
+
+
+def client(port, path, headers, stop_at, latencies, errors):
+    conn = None
+    while time.monotonic() < stop_at:
+        if conn is None:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+            if response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = None
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(values, pct):
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index] * 1000
+
+
+def run(worker_class, args):
+    port = args.port
+    env = dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+        GUNICORN_LOG_LEVEL="warning",
+        # Recycling workers mid-run drops their keep-alive connections.
+        GUNICORN_MAX_REQUESTS="0",
+    )
+    if worker_class == "uvicorn":
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "asgi:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ]
+    else:
+        command = [sys.executable, "-m", "gunicorn"]
+    server = subprocess.Popen(command, env=env)
+    try:
+        wait_until_up(port)
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        latencies, errors = [], []
+
+        # Warm up every worker before measuring.
+        warmup_stop = time.monotonic() + 2
+        threads = [
+            threading.Thread(
+                target=client, args=(port, args.path, headers, warmup_stop, [], [])
+            )
+            for _ in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stop_at = time.monotonic() + args.duration
+        threads = [
+            threading.Thread(
+                target=client,
+                args=(port, args.path, headers, stop_at, latencies, errors),
+            )
+            for _ in range(args.concurrency)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    latencies.sort()
+    print(
+        f"{worker_class:<8} {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {percentile(latencies, 50):7.1f}ms  "
+        f"p99 {percentile(latencies, 99):7.1f}ms  "
+        f"errors {len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/api/workorders/")
+    parser.add_argument("--token", help="Bearer token for protected paths")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--worker-class", action="append", choices=WORKER_CLASSES, dest="classes"
+    )
+    args = parser.parse_args()
+
+    for worker_class in args.classes or WORKER_CLASSES:
+        run(worker_class, args)
+
+
+if __name__ == "__main__":
+    main()
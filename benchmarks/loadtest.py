@@ -0,0 +1,250 @@
+"""Replay a production-like request mix against a running server.
+
+Each client loops over a weighted mix of tablet polls (a work order's unit
+grid), unit status updates, warehouse dispatches and sign-ins, and the run
+ends with per-endpoint throughput and p50/p95/p99 latency. Targets are
+sampled from the database at DATABASE_URL, normally one filled by
+``flask data generate``, which the server must be using too:
+
+    flask --app run.py data generate --scale 100 --units 500
+    gunicorn &
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+import psycopg2
+from app.config import Config
+from benchmarks.bench_workers import percentile
+
+DEFAULT_MIX = "poll=70,status=20,dispatch=7,login=3"
+STATUSES = ("not_started", "in_progress", "completed", "alert", "hold")
+
+SAMPLE_TARGETS = """
+SELECT swop.work_order_id, swop.station_number, swop.part_number, wo.quantity_to_produce
+FROM StationWorkOrderParts swop
+JOIN WorkOrders wo USING (work_order_id)
+JOIN WorkOrderStationStatus USING (work_order_id, station_number)
+WHERE NOT wo.is_completed
+ORDER BY random()
+LIMIT %s;
+"""
+
+SAMPLE_USERS = """
+SELECT email, account_type FROM Users WHERE email LIKE 'loadtest.%%@example.com';
+"""
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(","):
+        name, weight = item.split("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}")
+        mix[name] = float(weight)
+    return mix
+
+
+def load_targets(dsn, sample_size):
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(SAMPLE_TARGETS, (sample_size,))
+            targets = cursor.fetchall()
+            cursor.execute(SAMPLE_USERS)
+            users = cursor.fetchall()
+    finally:
+        conn.close()
+    if not targets or not users:
+        raise SystemExit("no load-test data; run flask data generate first")
+    return targets, users
+
+
+def work_order(target):
+    return f"WO{target[0]:07d}"
+
+
+def poll(client):
+    target = client.rng.choice(client.targets)
+    return "GET", f"/api/workorders/{work_order(target)}", None, {}
+
+
+def status(client):
+    work_order_id, station, _, units = target = client.rng.choice(client.targets)
+    unit = client.rng.randint(1, units)
+    path = (
+        f"/api/stations/workorders/{work_order(target)}"
+        f"/units/{unit}/stations/{station}/status"
+    )
+    return "PUT", path, {"status": client.rng.choice(STATUSES)}, {}
+
+
+def dispatch(client):
+    target = client.rng.choice(client.targets)
+    body = {
+        "work_order_id": work_order(target),
+        "station_number": target[1],
+        "part_number": target[2],
+        "quantity_supplied": client.rng.randint(1, 10),
+    }
+    headers = {"Authorization": f"Bearer {client.token}"}
+    return "POST", "/api/warehouse/dispatch", body, headers
+
+
+def login(client):
+    email, _ = client.rng.choice(client.users)
+    body = {"email": email, "password": client.password}
+    return "POST", "/api/users/signin", body, {}
+
+
+OPERATIONS = {"poll": poll, "status": status, "dispatch": dispatch, "login": login}
+
+
+class Client:
+    def __init__(self, args, targets, users, seed):
+        self.host, self.port = args.host, args.port
+        self.targets = targets
+        self.users = users
+        self.password = args.password
+        self.rng = random.Random(seed)
+        self.conn = None
+        self.token = None
+
+    def request(self, method, path, body=None, headers=None):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+        if response.will_close:
+            self.conn.close()
+            self.conn = None
+        return response.status, data
+
+    def sign_in(self):
+        # Dispatch needs a warehouse token; fetched once, outside the timings.
+        email = next(e for e, kind in self.users if kind == "warehouse_employee")
+        status, data = self.request(
+            "POST", "/api/users/signin", {"email": email, "password": self.password}
+        )
+        if status != 200:
+            raise SystemExit(f"sign-in as {email} failed with {status}")
+        self.token = json.loads(data)["token"]
+
+    def run(self, mix, stop_at, think, results):
+        names = list(mix)
+        weights = list(mix.values())
+        while time.monotonic() < stop_at:
+            name = self.rng.choices(names, weights)[0]
+            method, path, body, headers = OPERATIONS[name](self)
+            started = time.perf_counter()
+            try:
+                outcome, _ = self.request(method, path, body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                outcome = type(e).__name__
+            results[name].append((time.perf_counter() - started, outcome))
+            if think:
+                time.sleep(self.rng.expovariate(1 / think))
+
+
+def drive(clients, mix, duration, think):
+    results = [defaultdict(list) for _ in clients]
+    stop_at = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=client.run, args=(mix, stop_at, think, result))
+        for client, result in zip(clients, results)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    merged = defaultdict(list)
+    for result in results:
+        for name, samples in result.items():
+            merged[name].extend(samples)
+    return merged, elapsed
+
+
+def report(merged, elapsed):
+    print(
+        f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  failures"
+    )
+    everything = []
+    for name in list(OPERATIONS) + ["total"]:
+        samples = everything if name == "total" else merged.get(name, [])
+        if name != "total":
+            everything.extend(samples)
+        if not samples:
+            continue
+        latencies = sorted(seconds for seconds, _ in samples)
+        errors = Counter(
+            outcome
+            for _, outcome in samples
+            if not isinstance(outcome, int) or outcome >= 400
+        )
+        line = (
+            f"{name:<10} {len(samples):>9} {sum(errors.values()):>7} "
+            f"{len(samples) / elapsed:>8.1f} {percentile(latencies, 50):>8.1f} "
+            f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f}  "
+        )
+        failures = " ".join(f"{outcome}x{count}" for outcome, count in errors.items())
+        print((line + failures).rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument(
+        "--think-ms", type=float, default=0, help="mean pause between requests"
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--sample-size", type=int, default=2000)
+    parser.add_argument("--password", default=Config.GENERATOR_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    args.host, args.port = url.hostname, url.port or 80
+    mix = parse_mix(args.mix)
+    targets, users = load_targets(os.environ["DATABASE_URL"], args.sample_size)
+
+    clients = [
+        Client(args, targets, users, args.seed + n) for n in range(args.concurrency)
+    ]
+    if "dispatch" in mix:
+        for client in clients:
+            client.sign_in()
+
+    think = args.think_ms / 1000
+    if args.warmup:
+        drive(clients, mix, args.warmup, think)
+    merged, elapsed = drive(clients, mix, args.duration, think)
+    report(merged, elapsed)
+
+
+if __name__ == "__main__":
+    main()
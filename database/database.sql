@@ -49,6 +49,8 @@ CREATE TABLE WorkOrderParts (
   quantity_supplied NUMERIC DEFAULT 0 CHECK (quantity_supplied >= 0),
   PRIMARY KEY (work_order_id, part_number)
 );
+-- The primary key leads with work_order_id; lookups from Parts need this
+CREATE INDEX idx_work_order_parts_part_number ON WorkOrderParts (part_number);
 -- 9. StationWorkOrderParts Table
 CREATE TABLE StationWorkOrderParts (
   work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
@@ -58,29 +60,100 @@ CREATE TABLE StationWorkOrderParts (
   quantity_supplied NUMERIC DEFAULT 0 CHECK (quantity_supplied >= 0),
   PRIMARY KEY (work_order_id, station_number, part_number)
 );
--- 10. PartSupplyLog Table
+-- 10. PartSupplyLog Table (range-partitioned by supplied_at month)
 CREATE TABLE PartSupplyLog (
-  supply_id SERIAL PRIMARY KEY,
+  supply_id SERIAL,
   work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
   station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
   part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
   quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied > 0),
-  supplied_at TIMESTAMP DEFAULT now()
+  supplied_at TIMESTAMP NOT NULL DEFAULT now(),
+  PRIMARY KEY (supply_id, supplied_at)
+) PARTITION BY RANGE (supplied_at);
+-- Catches rows outside the created months; keep it empty by running
+-- create_part_supply_log_partitions ahead of time
+CREATE TABLE PartSupplyLog_default PARTITION OF PartSupplyLog DEFAULT;
+-- 10a. Monthly partitions named partsupplylog_YYYY_MM, from from_month
+-- (default: this month) through months_ahead months from now
+CREATE OR REPLACE FUNCTION create_part_supply_log_partitions(
+    months_ahead INT DEFAULT 3,
+    from_month DATE DEFAULT NULL
+  ) RETURNS INT AS $$
+DECLARE month_start DATE := date_trunc('month', COALESCE(from_month, now()))::date;
+last_month DATE := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+partition_name TEXT;
+created INT := 0;
+BEGIN WHILE month_start <= last_month LOOP partition_name := 'partsupplylog_' || to_char(month_start, 'YYYY_MM');
+IF to_regclass(partition_name) IS NULL THEN EXECUTE format(
+  'CREATE TABLE %I PARTITION OF PartSupplyLog FOR VALUES FROM (%L) TO (%L)',
+  partition_name,
+  month_start,
+  (month_start + INTERVAL '1 month')::date
+);
+created := created + 1;
+END IF;
+month_start := (month_start + INTERVAL '1 month')::date;
+END LOOP;
+RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+-- 10b. Detach months older than retain_months and move them to the archive
+-- schema, keeping the data but taking it out of every hot query and vacuum
+CREATE SCHEMA IF NOT EXISTS archive;
+CREATE OR REPLACE FUNCTION archive_part_supply_log_partitions(retain_months INT DEFAULT 12) RETURNS SETOF TEXT AS $$
+DECLARE cutoff DATE := (date_trunc('month', now()) - make_interval(months => retain_months))::date;
+partition_name TEXT;
+BEGIN FOR partition_name IN
+SELECT c.relname
+FROM pg_inherits i
+  JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'partsupplylog'::regclass
+  AND c.relname ~ '^partsupplylog_\d{4}_\d{2}$'
+  AND to_date(substring(c.relname FROM 15), 'YYYY_MM') < cutoff
+ORDER BY c.relname LOOP EXECUTE format(
+    'ALTER TABLE PartSupplyLog DETACH PARTITION %I',
+    partition_name
+  );
+EXECUTE format('ALTER TABLE %I SET SCHEMA archive', partition_name);
+RETURN NEXT partition_name;
+END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+SELECT create_part_supply_log_partitions();
+-- Ledger snapshots and balances sum the log after the last snapshot run
+CREATE INDEX idx_part_supply_log_supplied_at ON PartSupplyLog (supplied_at);
+-- Lookups by key (ledger verification, history filters, cascades)
+CREATE INDEX idx_part_supply_log_key ON PartSupplyLog (
+  work_order_id,
+  station_number,
+  part_number,
+  supplied_at
 );
 -- 11. Trigger Function to update StationWorkOrderParts
+-- Statement-level: one grouped UPDATE per INSERT, however many rows it adds
 CREATE OR REPLACE FUNCTION update_station_work_order_parts_supply() RETURNS TRIGGER AS $$ BEGIN
-UPDATE StationWorkOrderParts
-SET quantity_supplied = quantity_supplied + NEW.quantity_supplied
-WHERE work_order_id = NEW.work_order_id
-  AND station_number = NEW.station_number
-  AND part_number = NEW.part_number;
-RETURN NEW;
+UPDATE StationWorkOrderParts swop
+SET quantity_supplied = swop.quantity_supplied + supplied.quantity_supplied
+FROM (
+    SELECT work_order_id,
+      station_number,
+      part_number,
+      SUM(quantity_supplied) AS quantity_supplied
+    FROM new_supply
+    GROUP BY work_order_id,
+      station_number,
+      part_number
+  ) supplied
+WHERE swop.work_order_id = supplied.work_order_id
+  AND swop.station_number = supplied.station_number
+  AND swop.part_number = supplied.part_number;
+RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 -- 12. Trigger on PartSupplyLog
 CREATE TRIGGER trg_update_station_work_order_parts_supply
 AFTER
-INSERT ON PartSupplyLog FOR EACH ROW EXECUTE FUNCTION update_station_work_order_parts_supply();
+INSERT ON PartSupplyLog REFERENCING NEW TABLE AS new_supply FOR EACH STATEMENT EXECUTE FUNCTION update_station_work_order_parts_supply();
 -- 13. Users Table
 CREATE TABLE Users (
   user_id SERIAL PRIMARY KEY,
@@ -137,10 +210,87 @@ CREATE TABLE PartRequests (
   quantity_requested NUMERIC NOT NULL CHECK (quantity_requested > 0),
   requested_by INT REFERENCES Users(user_id),
   request_date TIMESTAMP DEFAULT NOW(),
-  status TEXT DEFAULT 'pending' -- Optional: 'pending', 'fulfilled', 'cancelled'
+  status TEXT DEFAULT 'pending', -- 'pending', 'picking', 'fulfilled', 'cancelled'
+  claimed_by INT REFERENCES Users(user_id),
+  claimed_at TIMESTAMP,
+  lease_expires_at TIMESTAMP,
+  supply_id INT, -- PartSupplyLog.supply_id; no FK since the log is partitioned
+  fulfilled_at TIMESTAMP
 );
+-- Warehouse pick queue: only open requests are indexed
+CREATE INDEX idx_part_requests_pending ON PartRequests (request_date, request_id)
+WHERE status = 'pending';
+CREATE INDEX idx_part_requests_leased ON PartRequests (lease_expires_at)
+WHERE status = 'picking';
 ALTER TABLE WorkOrders
 ADD COLUMN is_completed BOOLEAN DEFAULT FALSE;
+ALTER TABLE WorkOrders
+ADD COLUMN completed_at TIMESTAMP;
+-- Completed work orders moved out of the hot per-unit/per-station tables.
+-- snapshot holds the GET /api/workorders/<id> payload (TOAST-compressed).
+CREATE TABLE ArchivedWorkOrders (
+  work_order_id INT PRIMARY KEY REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  total_quantity_needed NUMERIC,
+  total_quantity_supplied NUMERIC,
+  snapshot JSONB NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
+-- Supply ledger: cumulative PartSupplyLog totals per key as of snapshot_at.
+-- Snapshot runs only write keys that changed since the previous run.
+CREATE TABLE SupplyLedgerSnapshots (
+  work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
+  part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
+  snapshot_at TIMESTAMP NOT NULL,
+  quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied >= 0),
+  PRIMARY KEY (
+    work_order_id,
+    station_number,
+    part_number,
+    snapshot_at
+  )
+);
+CREATE INDEX idx_supply_ledger_snapshots_snapshot_at ON SupplyLedgerSnapshots (snapshot_at);
+-- Newest snapshot per key, written with each snapshot run, so current
+-- balances read one row per key instead of the snapshot history
+CREATE TABLE SupplyLedgerCurrent (
+  work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
+  part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
+  snapshot_at TIMESTAMP NOT NULL,
+  quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied >= 0),
+  PRIMARY KEY (work_order_id, station_number, part_number)
+);
+-- Idempotency-Key store: one compact row per (user, endpoint, key)
+CREATE TABLE IdempotencyKeys (
+  key_hash BYTEA PRIMARY KEY,
+  request_hash BYTEA NOT NULL,
+  status_code SMALLINT, -- NULL while the original request is still running
+  response_body TEXT,
+  expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX idx_idempotency_keys_expires_at ON IdempotencyKeys (expires_at);
+-- Background job queue, worked by `flask jobs work`
+CREATE TABLE Jobs (
+  job_id SERIAL PRIMARY KEY,
+  kind TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+  attempts INT NOT NULL DEFAULT 0,
+  max_attempts INT NOT NULL CHECK (max_attempts > 0),
+  run_after TIMESTAMP NOT NULL DEFAULT now(),
+  lease_expires_at TIMESTAMP,
+  result JSONB,
+  error TEXT,
+  created_by INT, -- user_id from the token; only used to scope status reads
+  created_at TIMESTAMP NOT NULL DEFAULT now(),
+  finished_at TIMESTAMP
+);
+-- Workers only scan runnable jobs and expired leases
+CREATE INDEX idx_jobs_queued ON Jobs (run_after, job_id)
+WHERE status = 'queued';
+CREATE INDEX idx_jobs_running ON Jobs (lease_expires_at)
+WHERE status = 'running';
 ------------------------------------
 -- MOCK DATA
 -- 1. Parts
@@ -248,30 +398,21 @@ INSERT INTO PartSupplyLog (
     quantity_supplied
   )
 VALUES (1, '1', '200-00001', 16);
-DO $$
-DECLARE wo RECORD;
-unit_num INT;
-station RECORD;
-BEGIN FOR wo IN
-SELECT work_order_id,
-  quantity_to_produce
-FROM WorkOrders LOOP FOR unit_num IN 1..wo.quantity_to_produce LOOP FOR station IN
-SELECT DISTINCT station_number
-FROM StationWorkOrderParts
-WHERE work_order_id = wo.work_order_id LOOP
+-- One row per unit at every station the order has parts for
 INSERT INTO UnitStationStatus (
     work_order_id,
     unit_number,
     station_number,
     status
   )
-VALUES (
-    wo.work_order_id,
-    unit_num,
-    station.station_number,
-    'not_started'
-  ) ON CONFLICT (work_order_id, unit_number, station_number) DO NOTHING;
-END LOOP;
-END LOOP;
-END LOOP;
-END $$;
\ No newline at end of file
+SELECT wo.work_order_id,
+  u.unit_number,
+  s.station_number,
+  'not_started'
+FROM WorkOrders wo
+  CROSS JOIN LATERAL generate_series(1, wo.quantity_to_produce) AS u(unit_number)
+  JOIN (
+    SELECT DISTINCT work_order_id,
+      station_number
+    FROM StationWorkOrderParts
+  ) s ON s.work_order_id = wo.work_order_id ON CONFLICT (work_order_id, unit_number, station_number) DO NOTHING;
\ No newline at end of file
@@ -0,0 +1,62 @@
+-- One-off conversion of an existing, unpartitioned PartSupplyLog into the
+-- range-partitioned layout from database.sql. Run once, in a maintenance
+-- window: the table is locked for the duration of the copy.
+-- Requires create_part_supply_log_partitions / archive_part_supply_log_partitions
+-- from database.sql, which can be created beforehand without side effects.
+BEGIN;
+LOCK TABLE PartSupplyLog IN ACCESS EXCLUSIVE MODE;
+ALTER TABLE PartRequests DROP CONSTRAINT IF EXISTS partrequests_supply_id_fkey;
+DROP TRIGGER IF EXISTS trg_update_station_work_order_parts_supply ON PartSupplyLog;
+ALTER TABLE PartSupplyLog
+  RENAME TO PartSupplyLog_legacy;
+ALTER TABLE PartSupplyLog_legacy
+  RENAME CONSTRAINT partsupplylog_pkey TO partsupplylog_legacy_pkey;
+-- Built on the plain table by migrations 0002 and 0010; recreated below
+DROP INDEX IF EXISTS idx_part_supply_log_key,
+idx_part_supply_log_supplied_at;
+CREATE TABLE PartSupplyLog (
+  supply_id INT NOT NULL DEFAULT nextval('partsupplylog_supply_id_seq'),
+  work_order_id INT REFERENCES WorkOrders(work_order_id) ON DELETE CASCADE,
+  station_number TEXT REFERENCES Stations(station_number) ON DELETE CASCADE,
+  part_number TEXT REFERENCES Parts(part_number) ON DELETE CASCADE,
+  quantity_supplied NUMERIC NOT NULL CHECK (quantity_supplied > 0),
+  supplied_at TIMESTAMP NOT NULL DEFAULT now(),
+  PRIMARY KEY (supply_id, supplied_at)
+) PARTITION BY RANGE (supplied_at);
+ALTER SEQUENCE partsupplylog_supply_id_seq OWNED BY PartSupplyLog.supply_id;
+CREATE TABLE PartSupplyLog_default PARTITION OF PartSupplyLog DEFAULT;
+SELECT create_part_supply_log_partitions(
+    3,
+    (
+      SELECT MIN(supplied_at)::date
+      FROM PartSupplyLog_legacy
+    )
+  );
+-- The supply trigger is recreated afterwards so copied rows are not counted twice
+INSERT INTO PartSupplyLog (
+    supply_id,
+    work_order_id,
+    station_number,
+    part_number,
+    quantity_supplied,
+    supplied_at
+  )
+SELECT supply_id,
+  work_order_id,
+  station_number,
+  part_number,
+  quantity_supplied,
+  COALESCE(supplied_at, now())
+FROM PartSupplyLog_legacy;
+CREATE INDEX idx_part_supply_log_supplied_at ON PartSupplyLog (supplied_at);
+CREATE INDEX idx_part_supply_log_key ON PartSupplyLog (
+  work_order_id,
+  station_number,
+  part_number,
+  supplied_at
+);
+CREATE TRIGGER trg_update_station_work_order_parts_supply
+AFTER
+INSERT ON PartSupplyLog REFERENCING NEW TABLE AS new_supply FOR EACH STATEMENT EXECUTE FUNCTION update_station_work_order_parts_supply();
+DROP TABLE PartSupplyLog_legacy;
+COMMIT;
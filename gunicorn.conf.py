@@ -0,0 +1,106 @@
+# Gunicorn settings for production. Every value can be overridden from the
+# environment, e.g. GUNICORN_WORKER_CLASS=gevent GUNICORN_WORKERS=2.
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+wsgi_app = os.getenv("GUNICORN_APP", "run:app")
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# gthread: each worker runs `threads` requests at once on its own pooled DB
+# connections. gevent: one greenlet per request; psycopg2 is made
+# cooperative in post_worker_init. sync: one request per worker.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gevent":
+    # Patch before preload imports the app (and ssl/requests with it).
+    from gevent import monkey
+
+    monkey.patch_all()
+
+workers = env_int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+threads = env_int("GUNICORN_THREADS", 4)
+# gthread also stops accepting past this many open connections, keep-alive
+# ones included, so keep it well above the expected client count.
+worker_connections = env_int("GUNICORN_WORKER_CONNECTIONS", 1000)
+
+# Size each worker's DB pool to the requests it can run concurrently unless
+# DB_POOL_SIZE is set explicitly. Must happen before the app is imported.
+if worker_class == "gthread":
+    os.environ.setdefault("DB_POOL_SIZE", str(threads))
+elif worker_class == "sync":
+    os.environ.setdefault("DB_POOL_SIZE", "1")
+
+# Serve the spec from `flask docs build` when the deploy ran it. Dynamic docs
+# cost each worker ~110-150ms of CPU building the spec on the first docs
+# request, and ~2MiB (python -m benchmarks.bench_docs).
+spec_path = os.getenv(
+    "API_SPEC_PATH", os.path.join(os.path.dirname(__file__), "app", "apispec.json")
+)
+if os.path.exists(spec_path):
+    os.environ.setdefault("API_DOCS", "static")
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 200)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+# Longer than the load balancer's idle timeout would leave it reusing
+# sockets gunicorn has already closed; Render's proxy keeps them ~60s.
+keepalive = env_int("GUNICORN_KEEPALIVE", 75)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Multi-worker /metrics: each worker writes its histograms under this
+    # directory, which must start empty.
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            if name.endswith(".db"):
+                os.remove(os.path.join(metrics_dir, name))
+
+
+def reset_worker_state():
+    from app.db import connection
+    from app.utils.hashing import reset_hashing_pool
+    from app.utils.http_client import reset_http_client
+
+    connection.reset()
+    reset_hashing_pool()
+    reset_http_client()
+
+
+def post_fork(server, worker):
+    # With preload_app the app was imported in the master; drop anything
+    # process-bound it may have created before this worker serves requests.
+    reset_worker_state()
+
+
+def post_worker_init(worker):
+    # The gevent worker monkey-patches threading after post_fork, so the
+    # pool's locks and thread-locals are rebuilt once more as greenlet-aware.
+    if worker_class == "gevent":
+        from app.db import use_gevent_wait_callback
+
+        use_gevent_wait_callback()
+        reset_worker_state()
+
+
+def worker_exit(server, worker):
+    from app.db import connection
+
+    connection.reset()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,91 @@
+import os
+
+# Tests only ever touch TEST_DATABASE_URL, never the DATABASE_URL the app is
+# configured with: some rebuild the ledger or drop PartSupplyLog partitions.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+else:
+    os.environ.pop("DATABASE_URL", None)
+
+import jwt
+import psycopg2
+import pytest
+from datetime import datetime, timedelta
+from app import create_app
+from app.config import Config
+from app.models.work_order_model import INSERT_NEW_WORK_ORDER
+from app.utils import oidc
+
+needs_db = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="needs TEST_DATABASE_URL, a scratch database loaded from database.sql",
+)
+
+DISCOVERY_STUB = os.path.join(
+    os.path.dirname(__file__), "fixtures", "openid-configuration.json"
+)
+
+
+@pytest.fixture(autouse=True)
+def stub_discovery(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "GOOGLE_DISCOVERY_URL", f"file://{DISCOVERY_STUB}")
+    monkeypatch.setattr(
+        Config, "OIDC_DISCOVERY_CACHE_FILE", str(tmp_path / "openid.json")
+    )
+    oidc.clear_provider_config()
+    yield
+    oidc.clear_provider_config()
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def make_token(user_id=2, account_type="production_employee"):
+    payload = {
+        "user_id": user_id,
+        "email": "station@example.com",
+        "account_type": account_type,
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+    return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm="HS256")
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {make_token()}"}
+
+
+def run_sql(statement, params=None):
+    """Run one statement on its own connection and commit it."""
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(statement, params)
+            return cursor.fetchall() if cursor.description else None
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def work_order():
+    """A fresh 3-unit work order with unit rows, deleted afterwards."""
+    [(work_order_id,)] = run_sql(
+        INSERT_NEW_WORK_ORDER, {"product_number": "100-00001", "quantity": 3}
+    )
+    run_sql(
+        """
+        INSERT INTO UnitStationStatus (work_order_id, unit_number, station_number)
+        SELECT DISTINCT work_order_id, unit_number, station_number
+        FROM StationWorkOrderParts, generate_series(1, 3) AS unit_number
+        WHERE work_order_id = %s
+        """,
+        (work_order_id,),
+    )
+    yield work_order_id
+    run_sql("DELETE FROM WorkOrders WHERE work_order_id = %s", (work_order_id,))
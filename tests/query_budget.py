@@ -0,0 +1,76 @@
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from app import db
+
+DB_FILE = os.path.abspath(db.__file__)
+APP_DIR = os.path.dirname(DB_FILE)
+ROOT_DIR = os.path.dirname(APP_DIR)
+TRANSACTION_ENDS = ("COMMIT", "ROLLBACK")
+
+
+def _call_site():
+    # The innermost app frame outside app/db.py: the model line that ran
+    # the statement or closed the `with connection:` block.
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(APP_DIR) and filename != DB_FILE:
+            path = os.path.relpath(filename, ROOT_DIR)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<outside app>"
+
+
+class QueryLog:
+    """Statements and commits seen by app.db while active, with call sites.
+
+    Round trips are statements plus COMMIT/ROLLBACK. psycopg2 also sends a
+    BEGIN before the first statement of each transaction; that one is not
+    observed and not counted.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def __call__(self, name, seconds, cursor, error):
+        self.entries.append((name, _call_site()))
+
+    @property
+    def queries(self):
+        return [entry for entry in self.entries if entry[0] not in TRANSACTION_ENDS]
+
+    @property
+    def round_trips(self):
+        return len(self.entries)
+
+    def report(self):
+        lines = [f"  {name:<32} {site}" for name, site in self.entries]
+        repeated = [
+            f"  {name} ran {count} times from {site}"
+            for (name, site), count in Counter(self.queries).items()
+            if count > 1
+        ]
+        if repeated:
+            lines += ["Repeated statements (N+1?):"] + repeated
+        return "\n".join(lines)
+
+
+@contextmanager
+def query_budget(max_queries=None, max_round_trips=None):
+    """Fail the test if the block runs more statements or round trips."""
+    log = QueryLog()
+    db.query_observers.append(log)
+    try:
+        yield log
+    finally:
+        db.query_observers.remove(log)
+
+    over = []
+    if max_queries is not None and len(log.queries) > max_queries:
+        over.append(f"{len(log.queries)} statements (budget {max_queries})")
+    if max_round_trips is not None and log.round_trips > max_round_trips:
+        over.append(f"{log.round_trips} round trips (budget {max_round_trips})")
+    if over:
+        raise AssertionError(f"Ran {', '.join(over)}:\n{log.report()}")
@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("psycopg_pool")
+pytest.importorskip("a2wsgi")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient
+from app.asgi import create_asgi_app
+from app.asgi.routes import FlaskJSONResponse
+from .conftest import needs_db
+
+
+@pytest.fixture
+def asgi_client():
+    # Without the `with` block the lifespan never opens the async pool, so
+    # only routes that answer before touching the database can be used.
+    return TestClient(create_asgi_app())
+
+
+def test_json_matches_flask(client):
+    payload = {
+        "b": Decimal("1.50"),
+        "a": datetime(2025, 1, 2, 3, 4, 5),
+        "id": uuid.UUID(int=1),
+        "nested": [1, None, True],
+    }
+    with client.application.app_context():
+        from flask import jsonify
+
+        expected = jsonify(payload).get_data()
+
+    assert FlaskJSONResponse(payload).body == expected
+
+
+def test_invalid_work_order_id_is_rejected(asgi_client):
+    response = asgi_client.get("/api/workorders/WOabc")
+
+    assert response.status_code == 400
+    assert response.json() == {"error": "Invalid work order ID format"}
+
+
+def test_other_routes_fall_through_to_flask(asgi_client, auth_headers):
+    response = asgi_client.post(
+        "/api/warehouse/dispatch", json={}, headers=auth_headers
+    )
+
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_cors_preflight(asgi_client):
+    response = asgi_client.options(
+        "/api/workorders/",
+        headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+
+
+@needs_db
+@pytest.mark.parametrize(
+    "path", ["/api/workorders/", "/api/parts/products", "/api/parts/needed_parts"]
+)
+def test_responses_match_flask(client, path):
+    with TestClient(create_asgi_app()) as asgi_client:
+        response = asgi_client.get(path)
+
+    expected = client.get(path)
+    assert response.status_code == expected.status_code
+    assert response.content == expected.data
@@ -0,0 +1,29 @@
+from benchmarks import bench_models
+
+
+def test_every_case_runs_against_the_fake_cursor():
+    results = bench_models.measure(rows=20, repeat=1)
+
+    assert set(results) == set(bench_models.CASES)
+    for result in results.values():
+        assert result["us_per_row"] > 0
+        assert result["bytes_per_row"] > 0
+
+
+def test_compare_flags_slower_and_larger_cases():
+    baseline = {"case": {"relative": 2.0, "bytes_per_row": 1000}}
+
+    assert (
+        bench_models.compare(
+            {"case": {"relative": 2.9, "bytes_per_row": 1200}}, baseline, 0.5, 0.25
+        )
+        == []
+    )
+    failures = bench_models.compare(
+        {"case": {"relative": 3.2, "bytes_per_row": 1300}}, baseline, 0.5, 0.25
+    )
+    assert len(failures) == 2
+
+
+def test_cases_without_a_baseline_are_skipped():
+    assert bench_models.compare({"new": {"relative": 9}}, {}, 0.5, 0.25) == []
@@ -0,0 +1,146 @@
+import threading
+import pytest
+from psycopg2 import extensions
+from app import db
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.entered = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def __enter__(self):
+        self.entered += 1
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self, cursor_factory=None):
+        return "cursor"
+
+    def get_transaction_status(self):
+        return self.status
+
+
+class FakePool:
+    def __init__(self, minconn, maxconn, dsn):
+        self.minconn = minconn
+        self.idle = []
+        self.opened = 0
+        self.discarded = 0
+
+    def getconn(self):
+        if self.idle:
+            return self.idle.pop()
+        self.opened += 1
+        return FakeConn()
+
+    def putconn(self, conn, close=False):
+        # Mirrors psycopg2: only `minconn` connections are kept idle.
+        if close or len(self.idle) >= self.minconn:
+            self.discarded += 1
+        else:
+            self.idle.append(conn)
+
+    def closeall(self):
+        self.idle = []
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    monkeypatch.setattr(db, "ThreadedConnectionPool", FakePool)
+    return db.PooledConnection("dbname=test", maxconn=2, timeout=0.1)
+
+
+def test_connection_is_returned_after_block(connection):
+    with connection as conn:
+        assert connection.cursor() == "cursor"
+
+    with connection as again:
+        assert again is conn
+    assert connection._pool.opened == 1
+    assert connection._pool.idle == [conn]
+
+
+def test_pool_keeps_every_returned_connection(connection):
+    inside = threading.Barrier(2)
+
+    def worker():
+        with connection:
+            inside.wait(timeout=1)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert connection._pool.discarded == 0
+    assert len(connection._pool.idle) == 2
+
+
+def test_cursor_outside_block_is_an_error(connection):
+    with pytest.raises(RuntimeError):
+        connection.cursor()
+
+
+def test_threads_get_their_own_connections(connection):
+    inside = threading.Barrier(2)
+    seen = []
+
+    def worker():
+        with connection as conn:
+            seen.append(conn)
+            inside.wait(timeout=1)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen[0] is not seen[1]
+
+
+def test_exhausted_pool_times_out(connection):
+    hold = threading.Event()
+    held = threading.Barrier(3)
+
+    def worker():
+        with connection:
+            held.wait(timeout=1)
+            hold.wait(timeout=1)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    held.wait(timeout=1)
+    with pytest.raises(db.PoolTimeoutError):
+        with connection:
+            pass
+    hold.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_connection_left_in_transaction_is_discarded(connection):
+    with connection as conn:
+        conn.status = extensions.TRANSACTION_STATUS_INERROR
+
+    assert connection._pool.discarded == 1
+    assert connection._pool.idle == []
+
+
+def test_forked_child_does_not_reuse_parent_pool(connection):
+    with connection:
+        pass
+    parent_pool = connection._pool
+
+    connection._pid = -1
+    with connection:
+        pass
+
+    assert connection._pool is not parent_pool
+    assert connection._abandoned == [parent_pool]
@@ -0,0 +1,52 @@
+import pytest
+from app import create_app
+from app.config import Config
+from app.docs import build_api_spec, write_api_spec
+
+
+@pytest.fixture
+def spec_path(tmp_path, monkeypatch):
+    path = tmp_path / "apispec.json"
+    write_api_spec(build_api_spec(), str(path))
+    monkeypatch.setattr(Config, "API_SPEC_PATH", str(path))
+    return path
+
+
+def test_built_spec_matches_dynamic_spec(client, spec_path):
+    static_client = create_app(api_docs="static").test_client()
+
+    assert (
+        static_client.get("/apispec_1.json").get_json()
+        == client.get("/apispec_1.json").get_json()
+    )
+
+
+def test_static_spec_is_cacheable(spec_path):
+    client = create_app(api_docs="static").test_client()
+
+    response = client.get("/apispec_1.json")
+    assert response.status_code == 200
+    assert (
+        response.headers["Cache-Control"]
+        == f"public, max-age={Config.API_SPEC_MAX_AGE}"
+    )
+
+    revalidated = client.get(
+        "/apispec_1.json", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_static_mode_requires_a_built_spec(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "API_SPEC_PATH", str(tmp_path / "missing.json"))
+
+    with pytest.raises(RuntimeError, match="flask docs build"):
+        create_app(api_docs="static")
+
+
+def test_docs_off_registers_no_routes():
+    client = create_app(api_docs="off").test_client()
+
+    assert client.get("/apispec_1.json").status_code == 404
+    assert client.get("/apidocs/").status_code == 404
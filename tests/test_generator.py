@@ -0,0 +1,36 @@
+import random
+from datetime import datetime
+from app.models.generator_model import catalog_rows, work_order_rows
+
+
+def generate(seed):
+    rng = random.Random(seed)
+    catalog = catalog_rows(rng, stations=13, users=6, password_hash="hash")
+    orders = work_order_rows(rng, 3, 10, 50, 6, datetime(2026, 1, 1))
+    return catalog, orders
+
+
+def test_same_seed_gives_same_rows():
+    assert generate(42) == generate(42)
+    assert generate(42) != generate(43)
+
+
+def test_catalog_covers_every_station():
+    catalog, _ = generate(42)
+
+    stations = {station for station, _, _ in catalog["gen_station_parts"]}
+    assert stations == {str(n) for n in range(1, 14)}
+    assert len(catalog["gen_parts"]) == 26
+    assert {kind for _, _, kind, *_ in catalog["gen_users"]} == {
+        "production_employee",
+        "warehouse_employee",
+        "manager",
+    }
+
+
+def test_work_orders_continue_after_existing_ids():
+    _, orders = generate(42)
+
+    assert [order[0] for order in orders] == list(range(3, 13))
+    assert all(order[2] == 50 for order in orders)
+    assert all(order[3] <= datetime(2026, 1, 1) for order in orders)
@@ -0,0 +1,167 @@
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import create_app
+from app.config import Config
+from app.models import user_model
+from app.utils import hashing
+
+
+class FakeConnection:
+    def __init__(self, row):
+        self.row = row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchone(self):
+        return self.row
+
+
+@pytest.fixture
+def low_cost(monkeypatch):
+    monkeypatch.setattr(Config, "BCRYPT_ROUNDS", 4)
+
+
+def test_hash_and_verify(low_cost):
+    stored = hashing.hash_password("Passw0rd!")
+    assert hashing.verify_password("Passw0rd!", stored)
+    assert not hashing.verify_password("wrong", stored)
+
+
+def test_placeholder_hash_never_verifies():
+    assert not hashing.verify_password("-", "-")
+
+
+def test_needs_rehash_when_cost_changes(low_cost, monkeypatch):
+    stored = hashing.hash_password("Passw0rd!")
+    assert not hashing.needs_rehash(stored)
+    monkeypatch.setattr(Config, "BCRYPT_ROUNDS", 5)
+    assert hashing.needs_rehash(stored)
+
+
+def test_full_queue_rejects_instead_of_waiting(monkeypatch):
+    monkeypatch.setattr(hashing, "_slots", threading.BoundedSemaphore(1))
+    started, release = threading.Event(), threading.Event()
+
+    def hold_slot():
+        started.set()
+        release.wait()
+
+    worker = threading.Thread(target=hashing._run, args=(hold_slot,))
+    worker.start()
+    started.wait()
+    try:
+        with pytest.raises(hashing.HashingBusyError):
+            hashing.hash_password("Passw0rd!")
+        assert hashing.hashing_stats()["rejected"] >= 1
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_admission_limit_keeps_a_request_thread_free(monkeypatch):
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", 4)
+    assert hashing._admission_limit() == 3
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", 1)
+    assert hashing._admission_limit() == 1
+    monkeypatch.setattr(Config, "BCRYPT_MAX_IN_FLIGHT", 2)
+    assert hashing._admission_limit() == 2
+
+
+def test_sign_in_burst_leaves_other_requests_served(monkeypatch):
+    # Four request threads, as a gthread worker with GUNICORN_THREADS=4 has
+    request_threads = 4
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", request_threads)
+    monkeypatch.setattr(Config, "BCRYPT_MAX_IN_FLIGHT", 0)
+    monkeypatch.setattr(
+        user_model,
+        "connection",
+        FakeConnection((7, "$2b$12$stored", "production_employee", "A", "B", "C")),
+    )
+    release = threading.Event()
+
+    def slow_check(password, stored_hash):
+        release.wait(10)
+        return True
+
+    monkeypatch.setattr(hashing, "_check", slow_check)
+    hashing.reset_hashing_pool()
+    app = create_app()
+
+    def sign_in():
+        return app.test_client().post(
+            "/api/users/signin",
+            json={"email": "station@example.com", "password": "Passw0rd!"},
+        )
+
+    def api_spec():
+        return app.test_client().get("/apispec_1.json")
+
+    try:
+        with ThreadPoolExecutor(max_workers=request_threads) as pool:
+            sign_ins = [pool.submit(sign_in) for _ in range(8)]
+            other = pool.submit(api_spec)
+            # Served while three sign-ins are still hashing
+            assert other.result(timeout=5).status_code == 200
+            assert not release.is_set()
+            release.set()
+            statuses = sorted(f.result(timeout=10).status_code for f in sign_ins)
+    finally:
+        release.set()
+        hashing.reset_hashing_pool()
+
+    assert statuses == [200] * 3 + [503] * 5
+
+
+GEVENT_SIGN_IN = """
+from gevent import monkey
+
+monkey.patch_all()
+import gevent
+from app.config import Config
+from app.utils import hashing
+
+Config.BCRYPT_ROUNDS = 13
+ticks = []
+
+
+def tick():
+    while True:
+        ticks.append(1)
+        gevent.sleep(0.01)
+
+
+ticker = gevent.spawn(tick)
+gevent.sleep(0)
+hashing.hash_password("Passw0rd!")
+ticker.kill()
+print(len(ticks))
+"""
+
+
+def test_gevent_sign_in_does_not_block_other_greenlets():
+    pytest.importorskip("gevent")
+    # monkey.patch_all has to run before anything else is imported
+    result = subprocess.run(
+        [sys.executable, "-c", GEVENT_SIGN_IN],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    # bcrypt at cost 13 takes several hundred ms; a blocked hub ticks once
+    assert int(result.stdout) > 5
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import psycopg2
+import pytest
+from flask import Response
+from app.config import Config
+from app.models.idempotency_model import reserve_idempotency_key
+from .conftest import needs_db
+
+
+class FakeKeyStore:
+    def __init__(self):
+        self.rows = {}
+
+    def reserve(self, key_hash, request_hash, lease_seconds):
+        if key_hash not in self.rows:
+            self.rows[key_hash] = [request_hash, None, None]
+            return (True, None, None, None)
+        return (False, *self.rows[key_hash])
+
+    def save(self, key_hash, status_code, response_body, ttl_seconds):
+        self.rows[key_hash][1:] = [status_code, response_body]
+
+    def release(self, key_hash):
+        self.rows.pop(key_hash, None)
+
+
+@pytest.fixture
+def key_store(monkeypatch):
+    store = FakeKeyStore()
+    monkeypatch.setattr("app.utils.idempotency.reserve_idempotency_key", store.reserve)
+    monkeypatch.setattr("app.utils.idempotency.save_idempotent_response", store.save)
+    monkeypatch.setattr("app.utils.idempotency.release_idempotency_key", store.release)
+    return store
+
+
+@pytest.fixture
+def dispatch_calls(monkeypatch):
+    calls = []
+
+    def fake_post_dispatch_parts(data):
+        calls.append(data)
+        body = {
+            "message": "Part dispatch recorded successfully.",
+            "supply_id": len(calls),
+        }
+        return Response(json.dumps(body), status=201, mimetype="application/json")
+
+    monkeypatch.setattr(
+        "app.routes.warehouse.post_dispatch_parts", fake_post_dispatch_parts
+    )
+    return calls
+
+
+DISPATCH = {
+    "work_order_id": "WO0000001",
+    "station_number": "1",
+    "part_number": "200-00001",
+    "quantity_supplied": 10,
+}
+
+
+def test_retry_replays_original_response(
+    client, auth_headers, key_store, dispatch_calls
+):
+    headers = dict(auth_headers, **{"Idempotency-Key": "tablet-7-0001"})
+
+    first = client.post("/api/warehouse/dispatch", json=DISPATCH, headers=headers)
+    retry = client.post("/api/warehouse/dispatch", json=DISPATCH, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(dispatch_calls) == 1
+
+
+def test_key_reused_with_different_body(
+    client, auth_headers, key_store, dispatch_calls
+):
+    headers = dict(auth_headers, **{"Idempotency-Key": "tablet-7-0002"})
+
+    client.post("/api/warehouse/dispatch", json=DISPATCH, headers=headers)
+    response = client.post(
+        "/api/warehouse/dispatch",
+        json=dict(DISPATCH, quantity_supplied=20),
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+    assert len(dispatch_calls) == 1
+
+
+def test_requests_without_key_are_not_stored(
+    client, auth_headers, key_store, dispatch_calls
+):
+    client.post("/api/warehouse/dispatch", json=DISPATCH, headers=auth_headers)
+    client.post("/api/warehouse/dispatch", json=DISPATCH, headers=auth_headers)
+
+    assert len(dispatch_calls) == 2
+    assert key_store.rows == {}
+
+
+def delete_keys(request_hash):
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM IdempotencyKeys WHERE request_hash = %s", (request_hash,)
+            )
+    finally:
+        conn.close()
+
+
+@needs_db
+def test_crashed_reservation_is_taken_over_after_its_lease():
+    # A worker reserved the key and died before saving a response.
+    key_hash, request_hash = b"crashed-worker-key", b"crashed-worker-body"
+    try:
+        assert reserve_idempotency_key(key_hash, request_hash, 60)[0] is True
+        reserved, _, status_code, _ = reserve_idempotency_key(
+            key_hash, request_hash, 60
+        )
+        assert (reserved, status_code) == (False, None)
+
+        delete_keys(request_hash)
+        assert reserve_idempotency_key(key_hash, request_hash, 0)[0] is True
+        # The zero-second lease has passed by the next transaction.
+        assert reserve_idempotency_key(key_hash, request_hash, 60)[0] is True
+    finally:
+        delete_keys(request_hash)
+
+
+@needs_db
+def test_retry_runs_again_when_the_response_was_not_saved(
+    client, auth_headers, dispatch_calls, monkeypatch
+):
+    def failing_save(*args):
+        raise RuntimeError("connection lost")
+
+    headers = dict(auth_headers, **{"Idempotency-Key": "tablet-7-crash"})
+    body = json.dumps(DISPATCH).encode("utf-8")
+    monkeypatch.setattr(Config, "IDEMPOTENCY_LEASE_SECONDS", 0)
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                "app.utils.idempotency.save_idempotent_response", failing_save
+            )
+            first = client.post(
+                "/api/warehouse/dispatch",
+                data=body,
+                headers=headers,
+                content_type="application/json",
+            )
+        retry = client.post(
+            "/api/warehouse/dispatch",
+            data=body,
+            headers=headers,
+            content_type="application/json",
+        )
+        replay = client.post(
+            "/api/warehouse/dispatch",
+            data=body,
+            headers=headers,
+            content_type="application/json",
+        )
+    finally:
+        delete_keys(hashlib.sha256(body).digest())
+
+    assert first.status_code == retry.status_code == replay.status_code == 201
+    assert len(dispatch_calls) == 2
+    assert replay.headers["Idempotent-Replayed"] == "true"
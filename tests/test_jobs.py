@@ -0,0 +1,105 @@
+import pytest
+from app.config import Config
+from app.db import connection
+from app.jobs import JOB_HANDLERS
+from app.models import migration_model
+from app.models.job_model import enqueue_job, run_next_job
+from .conftest import make_token, needs_db, run_sql
+
+
+@pytest.fixture
+def jobs():
+    list(migration_model.apply_migrations(Config.MIGRATION_LOCK_TIMEOUT_MS, 0, 0))
+    created = []
+    yield created
+    run_sql("DELETE FROM Jobs WHERE job_id = ANY(%s)", (created,))
+
+
+@needs_db
+def test_large_work_order_is_created_by_a_job(client, auth_headers, jobs, monkeypatch):
+    monkeypatch.setattr(Config, "WORK_ORDER_ASYNC_QUANTITY", 100)
+
+    response = client.post(
+        "/api/workorders/create_workorder",
+        json={"product_number": "100-00001", "quantity": 500},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    jobs.append(job_id)
+    assert response.headers["Location"] == f"/api/jobs/{job_id}"
+    assert client.get(response.headers["Location"], headers=auth_headers).get_json()[
+        "status"
+    ] == ("queued")
+
+    assert run_next_job(JOB_HANDLERS, 60, 0) == (
+        job_id,
+        "create_work_order",
+        "succeeded",
+    )
+
+    body = client.get(f"/api/jobs/{job_id}", headers=auth_headers).get_json()
+    assert body["status"] == "succeeded"
+    assert body["attempts"] == 1
+    work_order_id = int(body["result"]["work_order_id"][2:])
+    try:
+        assert run_sql(
+            "SELECT quantity_to_produce FROM WorkOrders WHERE work_order_id = %s",
+            (work_order_id,),
+        ) == [(500,)]
+    finally:
+        run_sql("DELETE FROM WorkOrders WHERE work_order_id = %s", (work_order_id,))
+
+
+@needs_db
+def test_work_orders_are_created_inline_by_default(client, auth_headers):
+    assert Config.WORK_ORDER_ASYNC_QUANTITY == 0
+
+    response = client.post(
+        "/api/workorders/create_workorder",
+        json={"product_number": "100-00001", "quantity": 5000},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    run_sql(
+        "DELETE FROM WorkOrders WHERE work_order_id = %s",
+        (int(response.get_json()["work_order_id"][2:]),),
+    )
+
+
+@needs_db
+def test_failing_job_is_retried_then_failed(jobs, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_MAX_ATTEMPTS", 2)
+
+    def handler(cursor, payload):
+        cursor.execute(
+            "INSERT INTO Stations (station_number, description) VALUES ('99', 'x')"
+        )
+        raise ValueError("boom")
+
+    with connection:
+        with connection.cursor() as cursor:
+            jobs.append(enqueue_job(cursor, "test_fail", {}))
+
+    handlers = {"test_fail": handler}
+    assert run_next_job(handlers, 60, 0)[2] == "queued"
+    assert run_next_job(handlers, 60, 0)[2] == "failed"
+    assert run_next_job(handlers, 60, 0) is None
+
+    assert run_sql(
+        "SELECT status, attempts, error FROM Jobs WHERE job_id = %s", (jobs[0],)
+    ) == [("failed", 2, "ValueError: boom")]
+    # The handler's writes were rolled back with each attempt.
+    assert run_sql("SELECT 1 FROM Stations WHERE station_number = '99'") == []
+
+
+@needs_db
+def test_jobs_are_private_to_their_creator(client, jobs):
+    with connection:
+        with connection.cursor() as cursor:
+            jobs.append(enqueue_job(cursor, "test_private", {}, created_by=2))
+
+    other = {"Authorization": f"Bearer {make_token(user_id=3)}"}
+    admin = {"Authorization": f"Bearer {make_token(user_id=3, account_type='admin')}"}
+    assert client.get(f"/api/jobs/{jobs[0]}", headers=other).status_code == 404
+    assert client.get(f"/api/jobs/{jobs[0]}", headers=admin).status_code == 200
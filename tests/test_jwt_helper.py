@@ -0,0 +1,52 @@
+import time
+import jwt
+import pytest
+from datetime import datetime, timedelta
+from app.config import Config
+from app.utils import jwt_helper
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    jwt_helper._token_cache.clear()
+    yield
+    jwt_helper._token_cache.clear()
+
+
+def encode(exp):
+    payload = {"user_id": 7, "account_type": "admin", "exp": exp}
+    return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm="HS256")
+
+
+def test_repeat_decode_is_served_from_cache(monkeypatch):
+    token = encode(datetime.utcnow() + timedelta(hours=1))
+    assert jwt_helper.decode_token(token)["user_id"] == 7
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature verified twice")
+
+    hits = jwt_helper.token_cache_stats()["hits"]
+    monkeypatch.setattr(jwt_helper.jwt, "decode", fail)
+    assert jwt_helper.decode_token(token)["user_id"] == 7
+    assert jwt_helper.token_cache_stats()["hits"] == hits + 1
+
+
+def test_cached_token_still_expires():
+    token = encode(int(time.time()) + 1)
+    jwt_helper.decode_token(token)
+    time.sleep(1.1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        jwt_helper.decode_token(token)
+
+
+def test_tampered_token_is_not_served_from_cache():
+    token = encode(datetime.utcnow() + timedelta(hours=1))
+    jwt_helper.decode_token(token)
+    with pytest.raises(jwt.InvalidTokenError):
+        jwt_helper.decode_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
+
+
+def test_returned_claims_are_copies():
+    token = encode(datetime.utcnow() + timedelta(hours=1))
+    jwt_helper.decode_token(token)["user_id"] = 99
+    assert jwt_helper.decode_token(token)["user_id"] == 7
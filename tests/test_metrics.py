@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from flask import jsonify
+from app import db, metrics
+from app.models import warehouse_model, work_order_model
+
+
+def sample(client, name, **labels):
+    body = client.get("/metrics").get_data(as_text=True)
+    selector = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    for line in body.splitlines():
+        if line.startswith(f"{name}{{") and all(
+            f'{key}="{value}"' in line for key, value in labels.items()
+        ):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name}{{{selector}}} not exported")
+
+
+def test_statements_are_named_after_model_constants():
+    db.register_model_queries()
+
+    assert (
+        db.query_name(work_order_model.GET_WORK_ORDER_BY_ID) == "GET_WORK_ORDER_BY_ID"
+    )
+    assert db.query_name("SELECT 1") == "other"
+
+    # execute_values() sends the text before `VALUES %s` plus the rows
+    prefix = warehouse_model.INSERT_DISPATCH_BATCH.split("%s")[0]
+    batch = (prefix + "(1,'1','200-00001',1,NOW()) RETURNING supply_id;").encode()
+    assert db.query_name(batch) == "INSERT_DISPATCH_BATCH"
+
+
+def test_first_registration_wins():
+    db.register_queries(SimpleNamespace(ALIAS=work_order_model.GET_WORK_ORDER_BY_ID))
+
+    assert (
+        db.query_name(work_order_model.GET_WORK_ORDER_BY_ID) == "GET_WORK_ORDER_BY_ID"
+    )
+
+
+def test_request_latency_is_recorded_per_route(client, monkeypatch):
+    monkeypatch.setattr(
+        "app.routes.work_orders.retrieve_units_by_work_order_id",
+        lambda work_order_id: (jsonify({"error": "Work order not found"}), 404),
+    )
+    labels = {
+        "endpoint": "/api/workorders/<work_order_id>",
+        "method": "GET",
+        "status": "404",
+    }
+    client.get("/api/workorders/WO0000001")
+    before = sample(client, "linelink_http_request_duration_seconds_count", **labels)
+
+    client.get("/api/workorders/WO0000002")
+
+    after = sample(client, "linelink_http_request_duration_seconds_count", **labels)
+    assert after == before + 1
+
+
+def test_query_timings_and_errors(client):
+    metrics.observe_query("GET_WORK_ORDER_BY_ID", 0.002, None, RuntimeError())
+    before = sample(
+        client, "linelink_db_query_errors_total", query="GET_WORK_ORDER_BY_ID"
+    )
+
+    metrics.observe_query("GET_WORK_ORDER_BY_ID", 0.002, None, RuntimeError())
+
+    assert (
+        sample(client, "linelink_db_query_errors_total", query="GET_WORK_ORDER_BY_ID")
+        == before + 1
+    )
+    assert (
+        sample(
+            client,
+            "linelink_db_query_duration_seconds_bucket",
+            query="GET_WORK_ORDER_BY_ID",
+            le="0.0025",
+        )
+        >= 2
+    )
+
+
+def test_pool_and_cache_figures_are_exported(client):
+    assert sample(client, "linelink_db_pool_max_connections") == db.connection.maxconn
+    assert sample(client, "linelink_cache_hit_ratio", cache="jwt") >= 0
+    assert sample(client, "linelink_hashing_jobs", state="queued") == 0
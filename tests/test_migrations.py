@@ -0,0 +1,122 @@
+import psycopg2
+import pytest
+from app.config import Config
+from app.models import migration_model
+from app.models.migration_model import Migration, MigrationError
+from .conftest import needs_db, run_sql
+
+
+def test_migrations_are_numbered_in_order():
+    migrations = migration_model.load_migrations()
+
+    versions = [migration.version for migration in migrations]
+    assert versions == sorted(versions)
+    assert versions[:2] == [1, 2]
+    assert all(callable(migration.upgrade) for migration in migrations)
+
+
+@needs_db
+def test_migrate_builds_valid_indexes_once():
+    list(migration_model.apply_migrations(1000, 0, 0))
+
+    assert list(migration_model.apply_migrations(1000, 0, 0)) == []
+    assert all(applied_at for *_, applied_at in migration_model.migration_status())
+    rows = run_sql(
+        """
+        SELECT c.relname, i.indisvalid
+        FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname IN (
+            'idx_work_order_parts_part_number', 'idx_part_supply_log_key'
+        )
+        """
+    )
+    assert sorted(rows) == [
+        ("idx_part_supply_log_key", True),
+        ("idx_work_order_parts_part_number", True),
+    ]
+
+
+@needs_db
+def test_invalid_index_is_rebuilt():
+    def upgrade(cursor):
+        migration_model.create_index_concurrently(
+            cursor, "idx_test_migration_stations", "Stations", "description"
+        )
+
+    # A concurrent build that fails (duplicate keys) leaves an invalid index.
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor, pytest.raises(psycopg2.errors.UniqueViolation):
+            cursor.execute(
+                "CREATE UNIQUE INDEX CONCURRENTLY idx_test_migration_stations "
+                "ON Stations ((1))"
+            )
+    finally:
+        conn.close()
+
+    try:
+        list(
+            migration_model.apply_migrations(
+                1000, 0, 0, [Migration(9001, "test_rebuild", False, upgrade)]
+            )
+        )
+        rows = run_sql(
+            """
+            SELECT indisvalid, pg_get_indexdef(indexrelid) FROM pg_index
+            WHERE indexrelid = 'idx_test_migration_stations'::regclass
+            """
+        )
+        assert rows[0][0] is True
+        assert "description" in rows[0][1]
+    finally:
+        run_sql("DROP INDEX IF EXISTS idx_test_migration_stations")
+        run_sql("DELETE FROM SchemaMigrations WHERE version = 9001")
+
+
+@needs_db
+def test_lock_timeout_fails_without_recording():
+    def upgrade(cursor):
+        cursor.execute("LOCK TABLE Stations IN ACCESS EXCLUSIVE MODE")
+
+    blocker = psycopg2.connect(Config.DATABASE_URL)
+    try:
+        with blocker.cursor() as cursor:
+            cursor.execute("LOCK TABLE Stations IN ACCESS SHARE MODE")
+            with pytest.raises(MigrationError, match="after 2 attempts"):
+                list(
+                    migration_model.apply_migrations(
+                        50, 1, 0, [Migration(9002, "test_lock", True, upgrade)]
+                    )
+                )
+    finally:
+        blocker.rollback()
+        blocker.close()
+
+    assert run_sql("SELECT 1 FROM SchemaMigrations WHERE version = 9002") == []
+
+
+@needs_db
+def test_partitioned_index_on_a_plain_table_is_built_concurrently():
+    run_sql("CREATE TABLE test_unpartitioned_log (supplied_at TIMESTAMP)")
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            migration_model.create_partitioned_index(
+                cursor,
+                "idx_test_unpartitioned_log",
+                "test_unpartitioned_log",
+                "supplied_at",
+            )
+            assert b"CONCURRENTLY" in cursor.query
+        rows = run_sql(
+            """
+            SELECT indisvalid FROM pg_index
+            WHERE indexrelid = 'idx_test_unpartitioned_log'::regclass
+            """
+        )
+        assert rows == [(True,)]
+    finally:
+        conn.close()
+        run_sql("DROP TABLE test_unpartitioned_log")
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from app.config import Config
+from app.utils import http_client, oidc
+
+
+class StandInProvider(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_request(self):
+        server = self.server
+        server.requests.append((self.command, self.path, self.client_address[1]))
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        base = f"http://127.0.0.1:{server.server_port}"
+        if server.failing:
+            self.send_json(500, {"error": "unavailable"})
+        elif self.path == "/.well-known/openid-configuration":
+            self.send_json(
+                200,
+                {
+                    "authorization_endpoint": f"{base}/auth",
+                    "token_endpoint": f"{base}/token",
+                    "userinfo_endpoint": f"{base}/userinfo",
+                },
+            )
+        elif self.path == "/token":
+            self.send_json(200, {"access_token": "stand-in-token"})
+        elif self.path == "/userinfo":
+            self.send_json(
+                200,
+                {
+                    "email": "jane@example.com",
+                    "given_name": "Jane",
+                    "family_name": "Doe",
+                },
+            )
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    do_GET = handle_request
+    do_POST = handle_request
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInProvider)
+    server.requests = []
+    server.delay = 0
+    server.failing = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(Config, "OAUTH_READ_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(Config, "OAUTH_MAX_RETRIES", 0)
+    monkeypatch.setattr(Config, "OAUTH_BREAKER_FAILURES", 2)
+    monkeypatch.setattr(Config, "OAUTH_BREAKER_RESET_SECONDS", 60)
+    monkeypatch.setattr(
+        Config,
+        "GOOGLE_DISCOVERY_URL",
+        f"http://127.0.0.1:{server.server_port}/.well-known/openid-configuration",
+    )
+    http_client.reset_http_client()
+    oidc.clear_provider_config()
+    yield server
+    http_client.reset_http_client()
+    server.shutdown()
+    server.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def test_requests_reuse_a_pooled_connection(provider):
+    for _ in range(3):
+        response = http_client.provider_request("GET", url(provider, "/userinfo"))
+        assert response.status_code == 200
+
+    client_ports = {port for _, _, port in provider.requests}
+    assert len(provider.requests) == 3
+    assert len(client_ports) == 1
+
+
+def test_slow_provider_times_out(provider):
+    provider.delay = 1
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        http_client.provider_request("POST", url(provider, "/token"))
+    assert time.monotonic() - started < 0.9
+
+
+def test_breaker_opens_and_fails_fast(provider):
+    provider.failing = True
+    for _ in range(2):
+        http_client.provider_request("GET", url(provider, "/userinfo"))
+
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.provider_request("GET", url(provider, "/userinfo"))
+    assert len(provider.requests) == 2
+
+
+def test_half_open_trial_closes_breaker():
+    breaker = http_client.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(http_client.CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    breaker.before_call()
+    with pytest.raises(http_client.CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_callback_against_stand_in_provider(provider, client, monkeypatch):
+    monkeypatch.setattr(
+        "app.routes.auth.oauth_routes.get_or_create_user",
+        lambda email, first_name, last_name: (5, "production_employee"),
+    )
+
+    response = client.get("/api/auth/callback?code=abc")
+
+    assert response.status_code == 302
+    assert "authToken=" in response.headers["Set-Cookie"]
+    assert [path for _, path, _ in provider.requests] == [
+        "/.well-known/openid-configuration",
+        "/token",
+        "/userinfo",
+    ]
+
+
+def test_callback_fails_fast_when_provider_hangs(provider, client):
+    oidc.get_provider_config()
+    provider.delay = 1
+
+    first = client.get("/api/auth/callback?code=abc")
+    second = client.get("/api/auth/callback?code=abc")
+    third = client.get("/api/auth/callback?code=abc")
+
+    assert first.status_code == 502
+    assert second.status_code == 502
+    assert third.status_code == 503
+    assert third.headers["Retry-After"] == "60"
@@ -0,0 +1,105 @@
+import json
+import requests
+import pytest
+from app.config import Config
+from app.utils import oidc
+
+DISCOVERY = {
+    "authorization_endpoint": "https://idp.example.com/auth",
+    "token_endpoint": "https://idp.example.com/token",
+    "userinfo_endpoint": "https://idp.example.com/userinfo",
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    calls = []
+    responses = []
+
+    def fake_request(method, url, headers=None):
+        calls.append(headers or {})
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(
+        Config, "GOOGLE_DISCOVERY_URL", "https://idp.example.com/.well-known"
+    )
+    monkeypatch.setattr(oidc, "provider_request", fake_request)
+    return calls, responses
+
+
+def expire_cache():
+    oidc._state["expires_at"] = 0.0
+
+
+def test_stub_discovery_is_used_in_tests():
+    config = oidc.get_provider_config()
+    assert config["token_endpoint"] == "https://oauth2.googleapis.com/token"
+
+
+def test_discovery_is_cached_for_max_age(provider):
+    calls, responses = provider
+    responses.append(
+        FakeResponse(body=DISCOVERY, headers={"Cache-Control": "public, max-age=600"})
+    )
+
+    assert oidc.get_provider_config() == DISCOVERY
+    assert oidc.get_provider_config() == DISCOVERY
+    assert len(calls) == 1
+
+
+def test_refresh_revalidates_with_etag(provider):
+    calls, responses = provider
+    responses.append(FakeResponse(body=DISCOVERY, headers={"ETag": '"v1"'}))
+    responses.append(FakeResponse(status_code=304))
+
+    oidc.get_provider_config()
+    expire_cache()
+
+    assert oidc.get_provider_config() == DISCOVERY
+    assert calls[1] == {"If-None-Match": '"v1"'}
+
+
+def test_outage_falls_back_to_cache_file(provider):
+    calls, responses = provider
+    responses.append(FakeResponse(body=DISCOVERY))
+    oidc.get_provider_config()
+
+    with open(Config.OIDC_DISCOVERY_CACHE_FILE, encoding="utf-8") as f:
+        assert json.load(f) == DISCOVERY
+
+    oidc.clear_provider_config()
+    responses.append(requests.ConnectionError("down"))
+    assert oidc.get_provider_config() == DISCOVERY
+
+
+def test_outage_without_any_copy_raises(provider):
+    calls, responses = provider
+    responses.append(FakeResponse(status_code=503))
+
+    with pytest.raises(oidc.DiscoveryUnavailableError):
+        oidc.get_provider_config()
+
+
+def test_login_redirects_using_stub_discovery(client):
+    response = client.get("/api/auth/login")
+    assert response.status_code == 302
+    assert response.headers["Location"].startswith(
+        "https://accounts.google.com/o/oauth2/v2/auth?"
+    )
@@ -2,6 +2,7 @@ import json
 import pytest
 from flask import Response
 from app import create_app
+from .conftest import needs_db
 
 
 @pytest.fixture
@@ -38,6 +39,16 @@ def fake_add_part_request(data):
     return Response(json.dumps(response_data), status=201, mimetype="application/json")
 
 
+# Fake response for POST /part_request/batch
+def fake_add_part_requests(data):
+    response_data = {
+        "message": "Part requests created",
+        "request_ids": list(range(1, len(data["parts"]) + 1)),
+    }
+    return Response(json.dumps(response_data), status=201, mimetype="application/json")
+
+
+@needs_db
 def test_get_products(monkeypatch, client):
     # Patch the get_all_products function from the parts model.
     monkeypatch.setattr(
@@ -50,6 +61,7 @@ def test_get_products(monkeypatch, client):
     assert data[0]["product_number"] == "100-00001"
 
 
+@needs_db
 def test_get_needed_parts(monkeypatch, client):
     # Patch the get_needed_parts function from the parts model.
     monkeypatch.setattr(
@@ -60,3 +72,41 @@ def test_get_needed_parts(monkeypatch, client):
     data = response.get_json()
     assert isinstance(data, list)
     assert data[0]["part_number"] == "200-00001"
+
+
+def test_post_part_requests_batch(monkeypatch, client, auth_headers):
+    monkeypatch.setattr("app.routes.parts.add_part_requests", fake_add_part_requests)
+    payload = {
+        "work_order_id": "WO0000001",
+        "station_number": "1",
+        "requested_by": 2,
+        "parts": [
+            {"part_number": "200-00001", "quantity_requested": 4},
+            {"part_number": "200-00002", "quantity_requested": 6},
+        ],
+    }
+    response = client.post(
+        "/api/parts/part_request/batch", json=payload, headers=auth_headers
+    )
+    assert response.status_code == 201
+    assert response.get_json()["request_ids"] == [1, 2]
+
+
+def test_post_part_requests_batch_rejects_invalid_line(
+    monkeypatch, client, auth_headers
+):
+    monkeypatch.setattr("app.routes.parts.add_part_requests", fake_add_part_requests)
+    payload = {
+        "work_order_id": "WO0000001",
+        "station_number": "1",
+        "requested_by": 2,
+        "parts": [
+            {"part_number": "200-00001", "quantity_requested": 4},
+            {"part_number": "bad", "quantity_requested": 6},
+        ],
+    }
+    response = client.post(
+        "/api/parts/part_request/batch", json=payload, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert "parts[1]" in response.get_json()["error"]
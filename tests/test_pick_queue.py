@@ -0,0 +1,136 @@
+from datetime import datetime
+import psycopg2
+import pytest
+from app.config import Config
+from app.models.warehouse_model import CLAIM_PART_REQUESTS
+from .conftest import make_token, needs_db, run_sql
+
+
+@pytest.fixture
+def pick_queue(work_order):
+    """Two pending requests on the fixture work order, older than any other,
+    and two pickers to claim them."""
+    users = [
+        run_sql(
+            """
+            INSERT INTO Users (email, password_hash, account_type)
+            VALUES (%s, '-', 'warehouse_employee')
+            RETURNING user_id
+            """,
+            (f"picker{n}@example.com",),
+        )[0][0]
+        for n in (1, 2)
+    ]
+    requests = [
+        run_sql(
+            """
+            INSERT INTO PartRequests (
+                work_order_id, station_number, part_number, quantity_requested,
+                requested_by, request_date
+            )
+            SELECT work_order_id, station_number, part_number, 2, %s, %s
+            FROM StationWorkOrderParts
+            WHERE work_order_id = %s
+            ORDER BY station_number, part_number
+            LIMIT 1
+            RETURNING request_id
+            """,
+            (users[0], datetime(2001, 1, day), work_order),
+        )[0][0]
+        for day in (1, 2)
+    ]
+    yield requests, users
+    run_sql("DELETE FROM PartRequests WHERE request_id = ANY(%s)", (requests,))
+    run_sql("DELETE FROM Users WHERE user_id = ANY(%s)", (users,))
+
+
+def headers(user_id):
+    token = make_token(user_id=user_id, account_type="warehouse_employee")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def claim(client, user_id, **body):
+    response = client.post(
+        "/api/warehouse/queue/claim", json=body, headers=headers(user_id)
+    )
+    assert response.status_code == 200
+    return [r["request_id"] for r in response.get_json()["requests"]]
+
+
+@needs_db
+def test_concurrent_claims_get_different_requests(client, pick_queue):
+    requests, (first, second) = pick_queue
+    # The first picker's claim is still uncommitted while the second claims
+    conn = psycopg2.connect(Config.DATABASE_URL)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CLAIM_PART_REQUESTS, (1, first, 60))
+            [(held, *_)] = cursor.fetchall()
+
+            assert held == requests[0]
+            assert claim(client, second) == [requests[1]]
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@needs_db
+def test_expired_lease_can_be_reclaimed(client, pick_queue):
+    requests, (first, second) = pick_queue
+    assert claim(client, first, limit=2) == requests
+    run_sql(
+        """
+        UPDATE PartRequests SET lease_expires_at = NOW() - INTERVAL '1 second'
+        WHERE request_id = %s
+        """,
+        (requests[0],),
+    )
+
+    assert claim(client, second) == [requests[0]]
+
+
+@needs_db
+def test_expired_lease_cannot_be_completed(client, pick_queue):
+    requests, (first, _) = pick_queue
+    assert claim(client, first) == [requests[0]]
+    run_sql(
+        """
+        UPDATE PartRequests SET lease_expires_at = NOW() - INTERVAL '1 second'
+        WHERE request_id = %s
+        """,
+        (requests[0],),
+    )
+
+    response = client.post(
+        f"/api/warehouse/queue/{requests[0]}/complete", headers=headers(first)
+    )
+    assert response.status_code == 409
+    assert run_sql(
+        "SELECT status, supply_id FROM PartRequests WHERE request_id = %s",
+        (requests[0],),
+    ) == [("picking", None)]
+
+
+@needs_db
+def test_completing_a_request_logs_the_dispatch(client, pick_queue):
+    requests, (first, _) = pick_queue
+    assert claim(client, first) == [requests[0]]
+
+    response = client.post(
+        f"/api/warehouse/queue/{requests[0]}/complete",
+        json={"quantity_supplied": 1.5},
+        headers=headers(first),
+    )
+    assert response.status_code == 201
+    supply_id = response.get_json()["supply_id"]
+
+    [(status, linked_supply_id)] = run_sql(
+        "SELECT status, supply_id FROM PartRequests WHERE request_id = %s",
+        (requests[0],),
+    )
+    assert (status, linked_supply_id) == ("fulfilled", supply_id)
+    [(quantity,)] = run_sql(
+        "SELECT quantity_supplied FROM PartSupplyLog WHERE supply_id = %s",
+        (supply_id,),
+    )
+    assert quantity == 1.5
@@ -0,0 +1,83 @@
+import pstats
+import pytest
+from flask import jsonify
+from app import db, profiling
+from .conftest import make_token
+
+
+def fake_retrieve_units(work_order_id):
+    for observer in db.query_observers:
+        observer("GET_WORK_ORDER_BY_ID", 0.004, None, None)
+    for observer in db.fetch_observers:
+        observer(0.001, None)
+    return jsonify({"units": [], "is_completed": False}), 200
+
+
+@pytest.fixture(autouse=True)
+def fake_model(monkeypatch):
+    monkeypatch.setattr(
+        "app.routes.work_orders.retrieve_units_by_work_order_id", fake_retrieve_units
+    )
+
+
+def profile_headers(mode, account_type="admin"):
+    return {
+        "Authorization": f"Bearer {make_token(account_type=account_type)}",
+        "X-Profile": mode,
+    }
+
+
+def parse_server_timing(header):
+    phases = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        phases[name] = dict(param.split("=", 1) for param in params)
+    return phases
+
+
+def test_timing_breakdown(client):
+    response = client.get(
+        "/api/workorders/WO0000001", headers=profile_headers("timing")
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"units": [], "is_completed": False}
+    phases = parse_server_timing(response.headers["Server-Timing"])
+    assert list(phases) == ["db", "fetch", "transform", "serialize", "total"]
+    assert float(phases["db"]["dur"]) == 4.0
+    assert phases["db"]["desc"] == '"1 round trips"'
+    assert float(phases["fetch"]["dur"]) == 1.0
+    assert float(phases["serialize"]["dur"]) > 0
+
+
+def test_pstats_download(client, tmp_path):
+    response = client.get(
+        "/api/workorders/WO0000001", headers=profile_headers("pstats")
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert "attachment" in response.headers["Content-Disposition"]
+    path = tmp_path / "request.prof"
+    path.write_bytes(response.data)
+    functions = {func for _, _, func in pstats.Stats(str(path)).stats}
+    assert "fake_retrieve_units" in functions
+    assert not profiling._profiler_lock.locked()
+
+
+def test_only_admins_can_profile(client):
+    response = client.get(
+        "/api/workorders/WO0000001",
+        headers=profile_headers("timing", account_type="production_employee"),
+    )
+
+    assert response.status_code == 403
+    assert "Server-Timing" not in response.headers
+
+
+def test_unprofiled_requests_are_untouched(client):
+    response = client.get("/api/workorders/WO0000001")
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+    assert profiling._current.get() is None
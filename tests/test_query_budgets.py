@@ -0,0 +1,66 @@
+import pytest
+from app import db
+from .conftest import needs_db, run_sql
+from .query_budget import query_budget
+
+
+def test_budget_failure_lists_statements_and_repeats():
+    with pytest.raises(AssertionError) as excinfo:
+        with query_budget(max_queries=1):
+            for _ in range(3):
+                for observer in db.query_observers:
+                    observer("GET_PART", 0.001, None, None)
+
+    message = str(excinfo.value)
+    assert "3 statements (budget 1)" in message
+    assert "GET_PART ran 3 times" in message
+
+
+def test_commits_count_as_round_trips_only():
+    with query_budget(max_queries=1, max_round_trips=2) as log:
+        for name in ("GET_PART", "COMMIT"):
+            for observer in db.query_observers:
+                observer(name, 0.001, None, None)
+
+    assert len(log.queries) == 1
+    assert log.round_trips == 2
+
+
+def delete_work_order(work_order_id):
+    run_sql("DELETE FROM WorkOrders WHERE work_order_id = %s", (work_order_id,))
+
+
+@needs_db
+@pytest.mark.parametrize(
+    "path", ["/api/workorders/", "/api/parts/products", "/api/parts/needed_parts"]
+)
+def test_reads_use_one_statement(client, path):
+    with query_budget(max_queries=1, max_round_trips=2):
+        response = client.get(path)
+
+    assert response.status_code == 200
+
+
+@needs_db
+def test_work_order_poll_uses_one_statement(client, work_order):
+    with query_budget(max_queries=1, max_round_trips=2):
+        response = client.get(f"/api/workorders/WO{work_order:07d}")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["units"]) == 3
+
+
+@needs_db
+def test_create_work_order_uses_two_round_trips(client, auth_headers):
+    with query_budget(max_round_trips=2) as log:
+        response = client.post(
+            "/api/workorders/create_workorder",
+            json={"product_number": "100-00001", "quantity": 2},
+            headers=auth_headers,
+        )
+
+    assert response.status_code == 201
+    assert [name for name, _ in log.entries] == ["INSERT_NEW_WORK_ORDER", "COMMIT"]
+    assert "app/models/work_order_model.py" in log.entries[0][1]
+
+    delete_work_order(int(response.get_json()["work_order_id"][2:]))
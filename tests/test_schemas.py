@@ -0,0 +1,159 @@
+import pytest
+from app.config import Config
+from app.utils import schemas
+
+PART_REQUEST = {
+    "work_order_id": "WO0000012",
+    "station_number": "1",
+    "part_number": "200-00001",
+    "quantity_requested": 4,
+    "requested_by": 2,
+}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        PART_REQUEST,
+        dict(PART_REQUEST, quantity_requested=2.5),
+        dict(PART_REQUEST, requested_by=2.0),
+    ],
+)
+def test_valid_body_has_no_error(body):
+    assert schemas.PART_REQUEST.error(body) is None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        dict(PART_REQUEST, work_order_id="0000012"),
+        dict(PART_REQUEST, work_order_id="WO12a"),
+        dict(PART_REQUEST, part_number="20-000001"),
+        dict(PART_REQUEST, part_number=200),
+        dict(PART_REQUEST, quantity_requested=0),
+        dict(PART_REQUEST, quantity_requested=True),
+        dict(PART_REQUEST, quantity_requested="4"),
+        dict(PART_REQUEST, requested_by=2.5),
+        dict(PART_REQUEST, station_number=""),
+        {k: v for k, v in PART_REQUEST.items() if k != "part_number"},
+        [],
+        None,
+    ],
+)
+def test_invalid_body_is_rejected(body):
+    assert schemas.PART_REQUEST.error(body)
+
+
+def test_batch_limits():
+    schema = schemas.DISPATCH_BATCH
+    line = {k: v for k, v in PART_REQUEST.items() if k != "requested_by"}
+    line["quantity_supplied"] = line.pop("quantity_requested")
+
+    assert schema.error({"lines": []}).startswith("Invalid lines:")
+    assert schema.error({"lines": [line]}) is None
+    assert schema.error({"lines": [line] * schemas.MAX_BATCH_LINES}) is None
+    assert schema.error({"lines": [line] * 201}).startswith("Invalid lines:")
+
+
+def test_error_names_the_failing_field():
+    body = {
+        "work_order_id": "WO0000012",
+        "station_number": "1",
+        "requested_by": 2,
+        "parts": [
+            {"part_number": "200-00001", "quantity_requested": 4},
+            {"part_number": "bad", "quantity_requested": 6},
+        ],
+    }
+    error = schemas.PART_REQUEST_BATCH.error(body)
+    assert error.startswith("Invalid parts[1].part_number:")
+
+    del body["station_number"]
+    assert schemas.PART_REQUEST_BATCH.error(body) == (
+        "Missing field: 'station_number' is a required property"
+    )
+
+
+def test_convert_parses_work_order_id_once():
+    assert schemas.PART_REQUEST.error(PART_REQUEST) is None
+    body = schemas.PART_REQUEST.convert(PART_REQUEST)
+
+    assert body["work_order_id"] == 12
+    assert PART_REQUEST["work_order_id"] == "WO0000012"
+
+
+def test_queue_bodies_are_optional():
+    assert schemas.QUEUE_CLAIM.error(None) is None
+    assert schemas.QUEUE_CLAIM.convert(None) == {
+        "limit": 1,
+        "lease_seconds": Config.PICK_LEASE_SECONDS,
+    }
+    assert schemas.QUEUE_CLAIM.error({"limit": 51}).startswith("Invalid limit:")
+    assert schemas.QUEUE_CLAIM.error({"lease_seconds": True}) is not None
+
+    assert schemas.QUEUE_COMPLETE.convert(None) == {"quantity_supplied": None}
+    assert schemas.QUEUE_COMPLETE.error({"quantity_supplied": 0}) is not None
+    assert schemas.QUEUE_COMPLETE.error([]) is not None
+
+
+def test_work_order_quantity_is_a_positive_integer():
+    body = {"product_number": "100-00001", "quantity": 10.0}
+    assert schemas.WORK_ORDER.error(body) is None
+    assert schemas.WORK_ORDER.convert(body) == {
+        "product_number": "100-00001",
+        "quantity": 10,
+    }
+    for quantity in (0, 2.5, "10", True, None):
+        assert schemas.WORK_ORDER.error(dict(body, quantity=quantity)) is not None
+
+
+SCHEMAS = [
+    schemas.PART_REQUEST,
+    schemas.PART_REQUEST_BATCH,
+    schemas.DISPATCH,
+    schemas.DISPATCH_BATCH,
+    schemas.STATION_COMMENT,
+    schemas.WORK_ORDER,
+    schemas.QUEUE_CLAIM,
+    schemas.QUEUE_COMPLETE,
+]
+
+VALUES = [None, True, 0, 1, -1, 2.5, 10.0, 51, 86401, "", "1", "WO12", "200-00001"]
+
+
+def bodies():
+    line = {k: v for k, v in PART_REQUEST.items() if k != "requested_by"}
+    dispatch = dict(line, quantity_supplied=line.pop("quantity_requested"))
+    base = [
+        PART_REQUEST,
+        dict(PART_REQUEST, parts=[line, line]),
+        dispatch,
+        {"lines": [dispatch]},
+        {"work_order_id": "WO12", "station_number": "1", "comment": "ok"},
+        {"product_number": "100-00001", "quantity": 3},
+        {"limit": 2, "lease_seconds": 60},
+        {"quantity_supplied": 1.5},
+    ]
+    yield from (None, [], "body", {})
+    for body in base:
+        yield body
+        for key in body:
+            yield {k: v for k, v in body.items() if k != key}
+            for value in VALUES + [[], [{}], [line], [dispatch], {}]:
+                yield dict(body, **{key: value})
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+def test_compiled_check_agrees_with_jsonschema(schema):
+    for body in bodies():
+        assert schema.check(body) == schema.validator.is_valid(body), body
+
+
+def test_disagreement_is_rejected_with_a_generic_message(monkeypatch):
+    monkeypatch.setattr(schemas.PART_REQUEST, "check", lambda body: False)
+    assert schemas.PART_REQUEST.error(PART_REQUEST) == "Invalid request body"
+
+
+def test_unsupported_keyword_fails_at_import():
+    with pytest.raises(ValueError, match="Unsupported schema keyword"):
+        schemas.RequestSchema({"type": "string", "format": "date-time"})
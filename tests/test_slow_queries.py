@@ -0,0 +1,178 @@
+import psycopg2
+import pytest
+from app.slow_queries import SlowQueryLog, slow_query_log
+from .conftest import make_token
+
+PLAN = [{"Plan": {"Node Type": "Seq Scan"}}]
+
+
+class FakeExplainCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        self.conn.executed.append(statement)
+        if self.conn.fail and isinstance(statement, bytes):
+            raise psycopg2.ProgrammingError("cannot EXPLAIN this")
+
+    def fetchone(self):
+        return (PLAN,)
+
+
+class FakeConnection:
+    autocommit = False
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+
+    def cursor(self):
+        return FakeExplainCursor(self)
+
+
+class FakeCursor:
+    def __init__(self, query, params=None, rowcount=3, fail=False):
+        self.query = query
+        self.params = params
+        self.rowcount = rowcount
+        self.connection = FakeConnection(fail)
+
+
+def make_log(**kwargs):
+    options = dict(threshold_ms=100, explain_rate=1, size=10, log_params=True)
+    options.update(kwargs)
+    return SlowQueryLog(**options)
+
+
+def test_fast_statements_are_ignored():
+    log = make_log()
+
+    log("GET_ALL_PRODUCTS", 0.05, FakeCursor(b"SELECT 1"), None)
+
+    assert log.recent(10) == []
+
+
+def test_slow_statement_is_recorded():
+    log = make_log(explain_rate=0)
+
+    log("GET_WORK_ORDER_BY_ID", 0.25, FakeCursor(b"SELECT ...", (1,)), None)
+
+    (entry,) = log.recent(10)
+    assert entry["query"] == "GET_WORK_ORDER_BY_ID"
+    assert entry["duration_ms"] == 250.0
+    assert entry["rows"] == 3
+    assert entry["params"] == "(1,)"
+    assert entry["explain"] is None
+
+
+def test_params_can_be_left_out():
+    log = make_log(explain_rate=0, log_params=False)
+
+    log("GET_DISPATCH_HISTORY", 0.25, FakeCursor(b"SELECT ...", (1,)), None)
+
+    assert log.recent(10)[0]["params"] is None
+
+
+@pytest.mark.parametrize("name", ["UPSERT_OAUTH_USER", "UPDATE_PASSWORD_HASH"])
+def test_credentials_are_never_logged(name):
+    log = make_log(explain_rate=0)
+
+    log(name, 0.25, FakeCursor(b"UPDATE Users ...", ("$2b$12$hash", 7)), None)
+
+    assert log.recent(10)[0]["params"] is None
+
+
+def test_unnamed_statements_log_neither_text_nor_params():
+    log = make_log(explain_rate=0)
+    cursor = FakeCursor(b"SELECT * FROM Users WHERE email = 'a@b.c'", ("a@b.c",))
+
+    log("other", 0.25, cursor, None)
+
+    entry = log.recent(10)[0]
+    assert entry["query"] == "other"
+    assert entry["params"] is None
+
+
+def test_allowlisted_reads_are_explained_with_analyze():
+    log = make_log()
+    cursor = FakeCursor(b"SELECT * FROM UnitStationStatus WHERE work_order_id = 1")
+
+    log("GET_WORK_ORDER_BY_ID", 0.25, cursor, None)
+
+    assert log.recent(10)[0]["explain"] == {"analyze": True, "plan": PLAN}
+    assert cursor.connection.executed == [
+        "SAVEPOINT slow_query_explain",
+        b"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + cursor.query,
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+
+
+@pytest.mark.parametrize(
+    "name, query",
+    [
+        ("INSERT_PART_SUPPLY_LOG", b"INSERT INTO PartSupplyLog VALUES (1)"),
+        ("LOCK_COMPLETED_WORK_ORDER", b"SELECT 1 FROM WorkOrders FOR UPDATE"),
+        # A plain-looking SELECT can still call a function that writes
+        ("other", b"SELECT create_part_supply_log_partitions(3)"),
+        ("SELECT_ARCHIVABLE_WORK_ORDERS", b"SELECT work_order_id FROM WorkOrders"),
+    ],
+)
+def test_other_statements_only_get_the_estimated_plan(name, query):
+    log = make_log()
+    cursor = FakeCursor(query)
+
+    log(name, 0.25, cursor, None)
+
+    assert log.recent(10)[0]["explain"]["analyze"] is False
+    assert b"EXPLAIN (FORMAT JSON) " + query in cursor.connection.executed
+
+
+def test_failed_explain_keeps_the_transaction_usable():
+    log = make_log()
+    cursor = FakeCursor(b"SELECT 1", fail=True)
+
+    log("STATEMENT", 0.25, cursor, None)
+
+    assert log.recent(10)[0]["explain"] == {"error": "cannot EXPLAIN this"}
+    assert cursor.connection.executed[-1] == "ROLLBACK TO SAVEPOINT slow_query_explain"
+
+
+def test_failed_statements_are_not_explained():
+    log = make_log()
+    cursor = FakeCursor(b"SELECT 1")
+
+    log("STATEMENT", 0.25, cursor, RuntimeError("canceling statement"))
+
+    entry = log.recent(10)[0]
+    assert entry["error"] == "canceling statement"
+    assert entry["explain"] is None
+    assert cursor.connection.executed == []
+
+
+def test_buffer_keeps_the_newest_entries():
+    log = make_log(explain_rate=0, size=2)
+
+    for name in ("A", "B", "C"):
+        log(name, 0.25, None, None)
+
+    assert [entry["query"] for entry in log.recent(10)] == ["C", "B"]
+
+
+def test_endpoint_is_admin_only(client):
+    slow_query_log.clear()
+    slow_query_log("GET_ALL_PRODUCTS", 10, None, None)
+    admin = {"Authorization": f"Bearer {make_token(account_type='admin')}"}
+    employee = {"Authorization": f"Bearer {make_token()}"}
+
+    response = client.get("/api/admin/slow-queries", headers=admin)
+    assert response.status_code == 200
+    assert response.get_json()["queries"][0]["query"] == "GET_ALL_PRODUCTS"
+
+    assert client.get("/api/admin/slow-queries", headers=employee).status_code == 403
+    slow_query_log.clear()
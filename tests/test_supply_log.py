@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from app.models.supply_log_model import (
+    archive_supply_log_partitions,
+    create_supply_log_partitions,
+)
+from .conftest import needs_db, run_sql
+
+OLD_MONTH = date(2001, 1, 1)
+
+
+def partitions():
+    rows = run_sql(
+        """
+        SELECT inhrelid::regclass::text FROM pg_inherits
+        WHERE inhparent = 'partsupplylog'::regclass
+        """
+    )
+    return {name for (name,) in rows}
+
+
+def months_since_old_month():
+    # retain_months that puts the archive cutoff right after OLD_MONTH
+    today = date.today()
+    return (today.year - OLD_MONTH.year) * 12 + today.month - OLD_MONTH.month - 1
+
+
+def history(client, auth_headers, work_order_id):
+    tomorrow = date.today() + timedelta(days=1)
+    response = client.get(
+        f"/api/warehouse/dispatch?from={OLD_MONTH.isoformat()}"
+        f"&to={tomorrow.isoformat()}&work_order_id=WO{work_order_id:07d}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    return [d["quantity_supplied"] for d in response.get_json()["dispatches"]]
+
+
+@needs_db
+def test_future_partitions_are_created_once():
+    before = partitions()
+    try:
+        assert create_supply_log_partitions(15) > 0
+        month = date.today().replace(day=1)
+        for _ in range(15):
+            month = (month + timedelta(days=32)).replace(day=1)
+        assert f"partsupplylog_{month:%Y_%m}" in partitions()
+        assert create_supply_log_partitions(15) == 0
+    finally:
+        for name in partitions() - before:
+            run_sql(f"DROP TABLE {name}")
+
+
+@needs_db
+def test_supply_across_partitions_and_archive(client, auth_headers, work_order):
+    run_sql(
+        f"""
+        CREATE TABLE partsupplylog_{OLD_MONTH:%Y_%m} PARTITION OF PartSupplyLog
+        FOR VALUES FROM ('{OLD_MONTH}') TO ('{OLD_MONTH + timedelta(days=31)}')
+        """
+    )
+    try:
+        [(station_number, part_number, supplied_before)] = run_sql(
+            """
+            SELECT station_number, part_number, quantity_supplied
+            FROM StationWorkOrderParts
+            WHERE work_order_id = %s
+            ORDER BY station_number, part_number
+            LIMIT 1
+            """,
+            (work_order,),
+        )
+        # One INSERT landing in two partitions fires the statement trigger once
+        run_sql(
+            """
+            INSERT INTO PartSupplyLog (
+                work_order_id, station_number, part_number, quantity_supplied,
+                supplied_at
+            )
+            VALUES (%(wo)s, %(station)s, %(part)s, 2, '2001-01-15'),
+                   (%(wo)s, %(station)s, %(part)s, 3, NOW())
+            """,
+            {"wo": work_order, "station": station_number, "part": part_number},
+        )
+        [(supplied_after,)] = run_sql(
+            """
+            SELECT quantity_supplied FROM StationWorkOrderParts
+            WHERE work_order_id = %s AND station_number = %s AND part_number = %s
+            """,
+            (work_order, station_number, part_number),
+        )
+        assert supplied_after == supplied_before + 5
+        assert history(client, auth_headers, work_order) == [3.0, 2.0]
+
+        archived = archive_supply_log_partitions(months_since_old_month())
+
+        assert archived == [f"partsupplylog_{OLD_MONTH:%Y_%m}"]
+        assert history(client, auth_headers, work_order) == [3.0]
+        assert run_sql(
+            f"SELECT quantity_supplied FROM archive.partsupplylog_{OLD_MONTH:%Y_%m}"
+        ) == [(Decimal(2),)]
+    finally:
+        run_sql(f"DROP TABLE IF EXISTS partsupplylog_{OLD_MONTH:%Y_%m}")
+        run_sql(f"DROP TABLE IF EXISTS archive.partsupplylog_{OLD_MONTH:%Y_%m}")
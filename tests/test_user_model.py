@@ -0,0 +1,85 @@
+import pytest
+from app.models import user_model
+from .conftest import needs_db, run_sql
+
+
+class RecordingConnection:
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchone(self):
+        return self.row
+
+
+@pytest.fixture
+def db(monkeypatch):
+    conn = RecordingConnection((11, "production_employee"))
+    monkeypatch.setattr(user_model, "connection", conn)
+    user_model._user_cache.clear()
+    yield conn
+    user_model._user_cache.clear()
+
+
+def test_get_or_create_user_is_one_statement(db):
+    assert user_model.get_or_create_user("new@example.com", "New", "User") == (
+        11,
+        "production_employee",
+    )
+    assert db.statements == [
+        (
+            user_model.UPSERT_OAUTH_USER,
+            {"email": "new@example.com", "first_name": "New", "last_name": "User"},
+        )
+    ]
+
+
+def test_repeat_login_is_served_from_cache(db):
+    user_model.get_or_create_user("new@example.com", "New", "User")
+    user_model.get_or_create_user("new@example.com", "New", "User")
+
+    assert len(db.statements) == 1
+    assert user_model.user_cache_stats()["size"] == 1
+
+
+def row_version(email):
+    # The row's xmin changes on any update; the sequence on any insert attempt
+    return run_sql(
+        """
+        SELECT xmin::text, (SELECT last_value FROM users_user_id_seq)
+        FROM Users WHERE email = %s
+        """,
+        (email,),
+    )
+
+
+@needs_db
+def test_sign_in_of_existing_user_does_not_write():
+    email = "sso-existing@example.com"
+    user_model._user_cache.clear()
+    try:
+        user_id, account_type = user_model.get_or_create_user(email, "Sso", "User")
+        assert account_type == "production_employee"
+        written = row_version(email)
+
+        user_model._user_cache.clear()
+        assert user_model.get_or_create_user(email, "Sso", "User") == (
+            user_id,
+            account_type,
+        )
+        assert row_version(email) == written
+    finally:
+        user_model._user_cache.clear()
+        run_sql("DELETE FROM Users WHERE email = %s", (email,))
@@ -0,0 +1,167 @@
+import json
+from datetime import datetime
+from flask import Response
+
+
+# Fake response for POST /queue/claim
+def fake_claim_part_requests(user_id, limit, lease_seconds):
+    response_data = {
+        "requests": [{"request_id": 12, "claimed_by": user_id, "limit": limit}]
+    }
+    return Response(json.dumps(response_data), status=200, mimetype="application/json")
+
+
+def test_claim_queue_uses_caller_and_defaults(monkeypatch, client, auth_headers):
+    monkeypatch.setattr(
+        "app.routes.warehouse.claim_part_requests", fake_claim_part_requests
+    )
+    response = client.post("/api/warehouse/queue/claim", headers=auth_headers)
+    assert response.status_code == 200
+    claimed = response.get_json()["requests"][0]
+    assert claimed["claimed_by"] == 2
+    assert claimed["limit"] == 1
+
+
+def test_claim_queue_rejects_invalid_limit(monkeypatch, client, auth_headers):
+    monkeypatch.setattr(
+        "app.routes.warehouse.claim_part_requests", fake_claim_part_requests
+    )
+    response = client.post(
+        "/api/warehouse/queue/claim", json={"limit": 500}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_complete_queue_request_validates_quantity(monkeypatch, client, auth_headers):
+    calls = []
+
+    def fake_complete_part_request(request_id, user_id, quantity_supplied):
+        calls.append((request_id, user_id, quantity_supplied))
+        return Response("{}", status=201, mimetype="application/json")
+
+    monkeypatch.setattr(
+        "app.routes.warehouse.complete_part_request", fake_complete_part_request
+    )
+    response = client.post(
+        "/api/warehouse/queue/12/complete",
+        json={"quantity_supplied": -1},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Invalid quantity_supplied:")
+
+    response = client.post("/api/warehouse/queue/12/complete", headers=auth_headers)
+    assert response.status_code == 201
+    assert calls == [(12, 2, None)]
+
+
+# Fake response for POST /dispatch/batch
+def fake_post_dispatch_parts_batch(data):
+    response_data = {"supply_ids": list(range(101, 101 + len(data["lines"])))}
+    return Response(json.dumps(response_data), status=201, mimetype="application/json")
+
+
+def test_dispatch_batch_rejects_invalid_work_order(monkeypatch, client, auth_headers):
+    monkeypatch.setattr(
+        "app.routes.warehouse.post_dispatch_parts_batch",
+        fake_post_dispatch_parts_batch,
+    )
+    line = {
+        "work_order_id": "WO0000001",
+        "station_number": "1",
+        "part_number": "200-00001",
+        "quantity_supplied": 10,
+    }
+    response = client.post(
+        "/api/warehouse/dispatch/batch",
+        json={"lines": [line, dict(line, work_order_id="0000002")]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert "lines[1]" in response.get_json()["error"]
+
+    response = client.post(
+        "/api/warehouse/dispatch/batch",
+        json={"lines": [line, dict(line, part_number="200-00002")]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert response.get_json()["supply_ids"] == [101, 102]
+
+
+def capture_dispatch_history(monkeypatch):
+    calls = []
+
+    def fake_get_dispatch_history(since, until, work_order_id, limit):
+        calls.append((since, until))
+        return Response("{}", status=200, mimetype="application/json")
+
+    monkeypatch.setattr(
+        "app.routes.warehouse.get_dispatch_history", fake_get_dispatch_history
+    )
+    return calls
+
+
+def test_dispatch_history_converts_offsets_to_utc(monkeypatch, client, auth_headers):
+    calls = capture_dispatch_history(monkeypatch)
+
+    response = client.get(
+        "/api/warehouse/dispatch?from=2025-07-01T02:00:00%2B02:00"
+        "&to=2025-07-02T00:00:00Z",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert calls == [(datetime(2025, 7, 1), datetime(2025, 7, 2))]
+
+
+def test_dispatch_history_accepts_an_aware_from_without_to(
+    monkeypatch, client, auth_headers
+):
+    calls = capture_dispatch_history(monkeypatch)
+
+    response = client.get(
+        "/api/warehouse/dispatch?from=2025-07-01T00:00:00%2B00:00",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    [(since, until)] = calls
+    assert since == datetime(2025, 7, 1)
+    assert until.tzinfo is None
+
+
+def test_dispatch_history_accepts_an_aware_to_without_from(
+    monkeypatch, client, auth_headers
+):
+    calls = capture_dispatch_history(monkeypatch)
+
+    response = client.get(
+        "/api/warehouse/dispatch?to=2025-07-31T00:00:00-05:00",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    [(since, until)] = calls
+    assert until == datetime(2025, 7, 31, 5)
+    assert since.tzinfo is None
+
+
+def test_ledger_as_of_converts_offsets_to_utc(monkeypatch, client, auth_headers):
+    calls = []
+
+    def fake_get_ledger_balances(as_of, **filters):
+        calls.append(as_of)
+        return Response("{}", status=200, mimetype="application/json")
+
+    monkeypatch.setattr(
+        "app.routes.warehouse.get_ledger_balances", fake_get_ledger_balances
+    )
+
+    response = client.get(
+        "/api/warehouse/ledger?as_of=2024-01-01T00:00:00%2B00:00",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert calls == [datetime(2024, 1, 1)]
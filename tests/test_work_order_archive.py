@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from app.models.work_order_model import archive_completed_work_orders
+from .conftest import needs_db, run_sql
+
+# Far enough back that only the order under test is old enough to archive
+ARCHIVE_AFTER_DAYS = 365 * 20
+
+
+def hot_rows(work_order_id):
+    return run_sql(
+        """
+        SELECT
+          (SELECT COUNT(*) FROM UnitStationStatus WHERE work_order_id = %(wo)s),
+          (SELECT COUNT(*) FROM StationWorkOrderParts WHERE work_order_id = %(wo)s),
+          (SELECT COUNT(*) FROM WorkOrderStationStatus WHERE work_order_id = %(wo)s),
+          (SELECT COUNT(*) FROM WorkOrderParts WHERE work_order_id = %(wo)s)
+        """,
+        {"wo": work_order_id},
+    )[0]
+
+
+def summary(client, work_order_id):
+    response = client.get("/api/workorders/")
+    assert response.status_code == 200
+    return [
+        wo
+        for wo in response.get_json()["work_orders"]
+        if wo["work_order_id"] == f"WO{work_order_id:07d}"
+    ]
+
+
+def complete(work_order_id, completed_at):
+    run_sql(
+        """
+        UPDATE WorkOrders SET is_completed = TRUE, completed_at = %s
+        WHERE work_order_id = %s
+        """,
+        (completed_at, work_order_id),
+    )
+
+
+@needs_db
+def test_open_orders_are_not_archived(work_order):
+    run_sql(
+        "UPDATE WorkOrders SET created_at = %s WHERE work_order_id = %s",
+        (datetime(2001, 1, 1), work_order),
+    )
+    assert archive_completed_work_orders(ARCHIVE_AFTER_DAYS, 1000) == []
+    assert all(hot_rows(work_order))
+
+
+@needs_db
+def test_archived_order_is_served_from_its_snapshot(client, work_order):
+    complete(work_order, datetime(2001, 1, 1))
+    before = client.get(f"/api/workorders/WO{work_order:07d}")
+    assert before.status_code == 200
+    [summary_before] = summary(client, work_order)
+
+    assert archive_completed_work_orders(ARCHIVE_AFTER_DAYS, 1000) == [work_order]
+
+    assert hot_rows(work_order) == (0, 0, 0, 0)
+    after = client.get(f"/api/workorders/WO{work_order:07d}")
+    assert after.status_code == 200
+    assert after.get_json() == before.get_json()
+    # The summary keeps listing it once, now from the archive branch.
+    assert summary(client, work_order) == [summary_before]
+
+    assert archive_completed_work_orders(ARCHIVE_AFTER_DAYS, 1000) == []
+
+
+@needs_db
+def test_recently_completed_order_is_kept(work_order):
+    complete(work_order, datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS - 1))
+    assert archive_completed_work_orders(ARCHIVE_AFTER_DAYS, 1000) == []
+    assert all(hot_rows(work_order))
+
+
+@needs_db
+def test_missing_work_order_is_not_found(client):
+    [(max_id,)] = run_sql("SELECT COALESCE(MAX(work_order_id), 0) FROM WorkOrders")
+    response = client.get(f"/api/workorders/WO{max_id + 1:07d}")
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Work order not found"}